@@ -4,6 +4,10 @@ from pathlib import Path
 from typing import Dict, List
 from .utils import run_cmd, ensure_dir
 from .config import Config
+try:
+    from orjson import loads as _json_loads  # faster, optional
+except ImportError:
+    _json_loads = json.loads
 
 STEM_KEYS = ["vocals","drums","bass","other"]
 CODE_MAP = {"V":"vocals","D":"drums","B":"bass","O":"other"}
@@ -21,7 +25,7 @@ def ffprobe_duration(path: Path, cfg: Config=None) -> float:
     p = run_cmd(["ffprobe","-v","error","-show_entries","format=duration",
                  "-of","json",str(path)], capture=True, cfg=cfg)
     if p.returncode!=0: raise RuntimeError(p.stderr)
-    j = json.loads(p.stdout)
+    j = _json_loads(p.stdout)
     return float(j["format"]["duration"])
 
 def extract_chunk(src: Path, dst: Path, start: float, dur: float, sr: int, cfg: Config):
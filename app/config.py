@@ -38,6 +38,9 @@ class Config:
 
     INCOMING = _env_clean("INCOMING", "/data/incoming")
     WORKING  = _env_clean("WORKING", "/data/working")
+    # RAM-backed scratch for queue-job intermediates (chunk/stem WAVs). Used only when
+    # it exists and has room for twice the job's estimated PCM; empty disables.
+    SCRATCH_DIR = _env_clean("SCRATCH_DIR", "/dev/shm")
     OUTPUT   = _env_clean("OUTPUT", "/data/output")
     # Final music library root (Artist/Album/Title.mp3). Default maps to /data/output in compose.
     MUSIC_LIBRARY = _env_clean("MUSIC_LIBRARY", "/data/music-library")
@@ -109,6 +112,8 @@ class Config:
     CPU_NICE = int(_env_clean("CPU_NICE", "0") or 0)
     # FFmpeg thread limit; if 0, ffmpeg decides. If unset, will fall back to CPU_MAX_THREADS.
     FFMPEG_THREADS = int(_env_clean("FFMPEG_THREADS", str(CPU_MAX_THREADS if CPU_MAX_THREADS>0 else 0)) or (CPU_MAX_THREADS if CPU_MAX_THREADS>0 else 0))
+    # Queue jobs: overlapping chunks extracted concurrently (one ffmpeg per chunk).
+    FFMPEG_PARALLEL = int(_env_clean("FFMPEG_PARALLEL", "2") or 2)
 
     # Demucs execution controls
     DEMUCS_DEVICE = _env_clean("DEMUCS_DEVICE", "cpu").lower()  # cpu|cuda
@@ -118,6 +123,18 @@ class Config:
     DEMUCS_CHUNK_TIMEOUT_SEC = int(_env_clean("DEMUCS_CHUNK_TIMEOUT_SEC", "3600") or 3600)
     # Maximum retry attempts for failed chunks
     DEMUCS_MAX_RETRIES = int(_env_clean("DEMUCS_MAX_RETRIES", "2") or 2)
+    # Run Demucs inside the runner process, loading the model once and reusing it
+    # across chunks. Falls back to the demucs CLI when torch/demucs are not importable.
+    DEMUCS_INPROCESS = env_bool("DEMUCS_INPROCESS", "false")
+    # In-process only: run the separation forward pass under torch.autocast
+    # (bfloat16 on CPU, float16 on CUDA). Fastest on CPUs with native BF16/AMX.
+    DEMUCS_AUTOCAST = env_bool("DEMUCS_AUTOCAST", "false")
+    # Queue jobs: how many chunks to separate concurrently. 1 keeps the sequential
+    # behaviour; 0 picks automatically (1 on CUDA, cores / DEMUCS_JOBS on CPU).
+    DEMUCS_PARALLEL_JOBS = int(_env_clean("DEMUCS_PARALLEL_JOBS", "1") or 1)
+    # Chunk merges and stem mixes: "auto" does them in memory with numpy when it is
+    # importable (soundfile optional); "ffmpeg" always uses ffmpeg filter graphs.
+    MIXER_BACKEND = _env_clean("MIXER_BACKEND", "auto").lower()
 
     # Album processing behavior
     # When true, treat any top-level directory placed directly in INCOMING as an album job.
@@ -130,6 +147,13 @@ class Config:
     # Use structured output path (Artist/Album/Title) for singles as well; false keeps legacy flat output for singles.
     STRUCTURED_OUTPUT_SINGLES = env_bool("STRUCTURED_OUTPUT_SINGLES", "false")
 
+    # Daemon mode: react to filesystem events in INCOMING (via watchdog) instead of
+    # rescanning the tree every poll cycle. Falls back to polling if watchdog is missing.
+    INCOMING_WATCH = env_bool("INCOMING_WATCH", "true")
+    # With INCOMING_WATCH on Linux, treat a file as finished as soon as its writer closes it
+    # (inotify IN_CLOSE_WRITE) or renames it into place, instead of waiting for it to settle.
+    INCOMING_CLOSE_WRITE = env_bool("INCOMING_CLOSE_WRITE", "true")
+
     # Staging behavior: when enabled, watcher moves inputs from INCOMING to STAGING before enqueue
     # to avoid rescans/archival while processing. Disabled by default to preserve legacy/tests.
     MOVE_TO_STAGING_ENABLED = env_bool("MOVE_TO_STAGING_ENABLED", "false")
@@ -141,6 +165,9 @@ class Config:
     QUEUE_YOUTUBE_AUDIO = _env_clean("QUEUE_YOUTUBE_AUDIO", "/queues/youtube_audio")
     QUEUE_YOUTUBE_VIDEO = _env_clean("QUEUE_YOUTUBE_VIDEO", "/queues/youtube_video")
     QUEUE_OTHER = _env_clean("QUEUE_OTHER", "/queues/other")
+    # Daemon mode: queue jobs in flight at once. Demucs stays capped at one job's worth
+    # of chunks across all of them; extraction, mixing and encoding overlap freely.
+    QUEUE_PARALLELISM = int(_env_clean("QUEUE_PARALLELISM", "1") or 1)
     # Output directory for processed jobs (contains manifest.json + artifacts)
     OUTPUTS_DIR = _env_clean("OUTPUTS_DIR", "/data/outputs")
 
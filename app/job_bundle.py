@@ -9,9 +9,18 @@ from dataclasses import dataclass, field, asdict
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 import json
+import os
 from datetime import datetime
 
 
+def _write_json_atomic(path: Path, data: Dict[str, Any]) -> None:
+    """Write JSON via a temp file and os.replace so readers never see a partial file."""
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
+
+
 @dataclass
 class ArtifactMetadata:
     """Describes a single produced file (audio, video, or stem)."""
@@ -101,8 +110,7 @@ class JobManifest:
         """Write manifest.json to output directory."""
         manifest_path = output_dir / "manifest.json"
         manifest_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(manifest_path, "w") as f:
-            json.dump(self.to_dict(), f, indent=2)
+        _write_json_atomic(manifest_path, self.to_dict())
         return manifest_path
     
     @staticmethod
@@ -176,7 +184,6 @@ class JobBundle:
         
         # Write job.json
         job_json_path = job_folder / "job.json"
-        with open(job_json_path, "w") as f:
-            json.dump(self.to_job_json(), f, indent=2)
+        _write_json_atomic(job_json_path, self.to_job_json())
         
         return job_folder
@@ -0,0 +1,144 @@
+"""
+In-process mixing of per-chunk Demucs stems.
+
+Crossfading chunks back together and summing stems into variants is plain
+elementwise float32 work, so with numpy it is done in memory instead of an
+ffmpeg decode/filter/encode round trip per merge. numpy is optional: every
+entry point returns None/False when it cannot handle the input (numpy
+missing, unreadable or mismatched WAVs) and callers fall back to ffmpeg.
+soundfile is used for reading when installed, so stems of any PCM subtype
+work; otherwise 16-bit WAVs are read with the wave module.
+"""
+
+import wave
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # mixing falls back to ffmpeg
+    np = None
+try:
+    import soundfile as sf
+except ImportError:
+    sf = None
+
+from .utils import ensure_dir
+
+
+def available() -> bool:
+    return np is not None
+
+
+def read_pcm(path: Path) -> Optional[Tuple[Any, int]]:
+    """Read a WAV as (frames x channels float32 in int16 scale, sample rate), or None."""
+    if np is None:
+        return None
+    if sf is not None:
+        try:
+            data, sr = sf.read(str(path), dtype="int16", always_2d=True)
+        except Exception:
+            return None
+        return data.astype(np.float32), int(sr)
+    try:
+        with wave.open(str(path), "rb") as w:
+            if w.getsampwidth() != 2:
+                return None
+            sr, channels = w.getframerate(), w.getnchannels()
+            raw = w.readframes(w.getnframes())
+    except (OSError, wave.Error, EOFError):
+        return None
+    return np.frombuffer(raw, dtype=np.int16).reshape(-1, channels).astype(np.float32), sr
+
+
+def crossfade_concat(arrays: List[Any], n: int) -> Any:
+    """
+    Join arrays end to end, blending the last/first n frames of each neighbour pair.
+
+    The shared span uses complementary sin^2/cos^2 windows, which sum to one, so
+    correlated audio (the same source rendered in both chunks) keeps its level.
+    """
+    out = [arrays[0]]
+    for cur in arrays[1:]:
+        prev = out[-1]
+        k = min(n, len(prev), len(cur))
+        if k > 0:
+            w = (np.sin(np.linspace(0.0, np.pi / 2, k, dtype=np.float32)) ** 2)[:, None]
+            blended = prev[-k:] * (1.0 - w) + cur[:k] * w
+            out[-1] = prev[:-k]
+            out.append(blended)
+            cur = cur[k:]
+        out.append(cur)
+    return np.concatenate(out)
+
+
+def merge_files(parts: List[Path], fade_sec: float) -> Optional[Tuple[Any, int]]:
+    """Read parts and crossfade them over fade_sec; None if any part is unreadable or formats differ."""
+    if np is None or not parts:
+        return None
+    arrays = []
+    fmt: Optional[Tuple[int, int]] = None
+    for part in parts:
+        pcm = read_pcm(part)
+        if pcm is None:
+            return None
+        data, sr = pcm
+        if fmt is not None and (sr, data.shape[1]) != fmt:
+            return None
+        fmt = (sr, data.shape[1])
+        arrays.append(data)
+    sr = fmt[0]
+    return crossfade_concat(arrays, int(round(max(0.0, fade_sec) * sr))), sr
+
+
+def to_pcm16(data: Any) -> bytes:
+    return np.clip(np.rint(data), -32768, 32767).astype(np.int16).tobytes()
+
+
+def write_wav(path: Path, data: Any, sr: int) -> None:
+    ensure_dir(path.parent)
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(data.shape[1])
+        w.setsampwidth(2)
+        w.setframerate(sr)
+        w.writeframes(to_pcm16(data))
+
+
+def render_variants(per_stem: Dict[str, List[Path]], wanted: Dict[str, Tuple[Tuple[str, ...], Path]],
+                    fade_sec: float) -> bool:
+    """
+    Write each wanted variant as the sum of its stems, each crossfade-merged from its chunks.
+
+    wanted maps variant name -> (stem names, output wav). Each stem is merged
+    once even when several variants use it. Returns False, writing nothing,
+    if the stems cannot be mixed here.
+    """
+    if np is None:
+        return False
+    merged: Dict[str, Any] = {}
+    fmt: Optional[Tuple[int, int]] = None
+    for stems, _ in wanted.values():
+        for stem in stems:
+            if stem in merged:
+                continue
+            result = merge_files(per_stem[stem], fade_sec)
+            if result is None:
+                return False
+            data, sr = result
+            if fmt is not None and (sr, data.shape[1]) != fmt:
+                return False
+            fmt = (sr, data.shape[1])
+            merged[stem] = data
+    if fmt is None:
+        return False
+    sr, channels = fmt
+    for stems, out_wav in wanted.values():
+        if len(stems) == 1:
+            write_wav(out_wav, merged[stems[0]], sr)
+            continue
+        # Straight sum (no 1/N normalisation): the stems add back up to the source level
+        acc = np.zeros((max(len(merged[s]) for s in stems), channels), dtype=np.float32)
+        for stem in stems:
+            acc[:len(merged[stem])] += merged[stem]
+        write_wav(out_wav, acc, sr)
+    return True
@@ -12,6 +12,7 @@ This consumer discovers, validates, and dispatches them.
 from pathlib import Path
 from typing import Optional, Dict, Any
 import json
+import os
 import time
 import shutil
 from datetime import datetime
@@ -43,8 +44,8 @@ class QueueConsumer:
         if job_folder.name.endswith(".tmp"):
             return False
         
-        job_json = job_folder / "job.json"
-        return job_json.exists() and job_json.is_file()
+        # is_file() is False for a missing path, so one stat covers both checks
+        return (job_folder / "job.json").is_file()
     
     def discover_jobs(self) -> Dict[str, list]:
         """
@@ -56,21 +57,29 @@ class QueueConsumer:
         discovered = {}
         
         for queue_type, queue_path in self.queue_folders.items():
-            jobs = []
+            found = []
             
-            if not queue_path.exists():
+            # Find all job_<id>/ folders (not .tmp). Names are checked before any
+            # stat, and DirEntry.is_dir() answers from the readdir d_type.
+            try:
+                with os.scandir(queue_path) as it:
+                    for entry in it:
+                        if not entry.name.startswith("job_") or not entry.is_dir():
+                            continue
+                        item = Path(entry.path)
+                        try:
+                            if self._is_job_ready(item):
+                                found.append((entry.stat().st_mtime, item))
+                        except FileNotFoundError:
+                            # Claimed or removed mid-scan; the rest of the queue still counts
+                            continue
+            except FileNotFoundError:
                 logger.warning(f"Queue folder does not exist: {queue_path}")
                 continue
             
-            # Find all job_<id>/ folders (not .tmp)
-            for item in queue_path.iterdir():
-                if item.is_dir() and item.name.startswith("job_"):
-                    if self._is_job_ready(item):
-                        jobs.append(item)
-            
             # Sort by mtime (oldest first) to process in order
-            jobs.sort(key=lambda p: p.stat().st_mtime)
-            discovered[queue_type] = jobs
+            found.sort(key=lambda t: t[0])
+            discovered[queue_type] = [item for _, item in found]
         
         return discovered
     
@@ -1,16 +1,26 @@
 from __future__ import annotations
 
+import asyncio
+import atexit
+import contextlib
+import errno
 import shutil
 import subprocess
 import sys
 import time
+import wave
 import os
+import platform
 import socket
 import signal
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from dataclasses import dataclass
+from functools import lru_cache
 import re
 from pathlib import Path
-from typing import List, Optional, Tuple, Dict, Any, cast
+from types import SimpleNamespace
+from typing import IO, Final, List, Optional, Tuple, Dict, Any, Union, cast
 
 from .config import Config
 try:
@@ -30,7 +40,8 @@ except ImportError:
     def extract_first_embedded_art(src_audio: Path, out_img: Path) -> Optional[Path]:
         del src_audio, out_img
         return None
-from .utils import ensure_dir, sanitize_filename
+from .utils import copy_file_fast, ensure_dir, link_or_copy, sanitize_filename
+from . import mixer
 import json
 
 # Queue-based pipeline modules (Phase 2 refactor)
@@ -44,9 +55,30 @@ except ImportError:
     JobManifest = None
     ArtifactMetadata = None
 
+# POSIX only; the singleton lock falls back to its file contents without it.
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # type: ignore
+
+# Optional filesystem events for INCOMING (daemon mode); polling is used without it.
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    FileSystemEventHandler = object  # type: ignore
+    Observer = None
+
 
 SUPPORTED_EXTS = {".mp3", ".wav", ".flac", ".m4a", ".aac", ".ogg", ".opus"}
+SUPPORTED_EXT_TUPLE: Final[Tuple[str, ...]] = tuple(sorted(SUPPORTED_EXTS))
+# Scratch file for cover art pulled out of a track's embedded tags
+_TMP_COVER_NAME: Final[str] = ".tmp_cover.jpg"
 
+# Working dirs created by process_one are named simple_<ts>; the cleanup sweep
+# compares a fixed-length slice against this prefix instead of calling startswith.
+_SIMPLE_PREFIX: Final[str] = "simple_"
+_SIMPLE_PREFIX_LEN: Final[int] = len(_SIMPLE_PREFIX)
 
 @dataclass
 class Job:
@@ -55,8 +87,30 @@ class Job:
     cover: Optional[Path]
 
 
-def _is_audio(p: Path) -> bool:
-    return p.is_file() and p.suffix.lower() in SUPPORTED_EXTS
+def _iter_audio_paths(root: Union[str, os.PathLike]):
+    """
+    Yield audio file paths (as str) under root (recursive) using scandir.
+
+    The extension is checked on the name before any stat, and DirEntry type
+    info avoids a stat per entry; symlinked directories are not descended.
+    """
+    stack = [os.fspath(root)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for e in it:
+                    if e.is_dir(follow_symlinks=False):
+                        stack.append(e.path)
+                    elif e.name.lower().endswith(SUPPORTED_EXT_TUPLE) and e.is_file():
+                        yield e.path
+        except OSError:
+            continue
+
+
+def _iter_audio(root: Path):
+    """Yield audio files under root (recursive) as Paths; see _iter_audio_paths."""
+    for path in _iter_audio_paths(root):
+        yield Path(path)
 
 
 def _run(cmd: List[str]) -> subprocess.CompletedProcess[str]:
@@ -89,7 +143,29 @@ def _run_with_timeout(cmd: List[str], timeout_sec: Optional[int] = None, descrip
 
 
 
+def _stat_key(p: Path) -> Optional[Tuple[int, int]]:
+    """(size, mtime_ns) used to key per-file probe caches; None if the file is gone."""
+    try:
+        st = p.stat()
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
 def _read_tags(p: Path) -> Dict[str, str]:
+    key = _stat_key(p)
+    if key is None:
+        return _read_tags_uncached(p)
+    return dict(_read_tags_cached(str(p), *key))
+
+
+@lru_cache(maxsize=4096)
+def _read_tags_cached(path_str: str, size: int, mtime_ns: int) -> Dict[str, str]:
+    del size, mtime_ns  # cache key only
+    return _read_tags_uncached(Path(path_str))
+
+
+def _read_tags_uncached(p: Path) -> Dict[str, str]:
     raw = cast(Dict[Any, Any], _meta.read_basic_tags(p))  # may contain non-str keys/values
     result: Dict[str, str] = {}
     for k, v in raw.items():
@@ -101,61 +177,134 @@ def _read_tags(p: Path) -> Dict[str, str]:
 
 
 def _ffprobe_tags(p: Path) -> Dict[str, str]:
+    key = _stat_key(p)
+    if key is None:
+        return _ffprobe_tags_uncached(p)
+    return dict(_ffprobe_tags_cached(str(p), *key))
+
+
+@lru_cache(maxsize=4096)
+def _ffprobe_tags_cached(path_str: str, size: int, mtime_ns: int) -> Dict[str, str]:
+    prefetched = _probe_prefetch.pop((path_str, size, mtime_ns), None)
+    if prefetched is not None:
+        return prefetched
+    return _ffprobe_tags_uncached(Path(path_str))
+
+
+_PROBE_TAG_KEYS: Final[Tuple[str, ...]] = ("artist", "album", "title")
+
+
+def _ffprobe_tags_cmd(p: Path) -> List[str]:
+    # Plain "TAG:key=value" lines are enough for three tags; no JSON to build or walk
+    return [
+        "ffprobe", "-v", "error",
+        "-show_entries", "format_tags=artist,album,title",
+        "-of", "default=nw=1:nk=0",
+        str(p),
+    ]
+
+
+def _parse_probe_tags(stdout: str) -> Dict[str, str]:
+    out: Dict[str, str] = {}
+    for line in stdout.splitlines():
+        k, sep, v = line.partition("=")
+        if not sep:
+            continue
+        k = k.removeprefix("TAG:").lower()
+        v = v.strip()
+        if k in _PROBE_TAG_KEYS and v and k not in out:
+            out[k] = v
+    return out
+
+
+def _ffprobe_tags_uncached(p: Path) -> Dict[str, str]:
     try:
-        cmd = [
-            "ffprobe", "-v", "error",
-            "-show_entries", "format_tags=artist,album,title",
-            "-of", "json",
-            str(p),
-        ]
-        proc = _run(cmd)
+        proc = _run(_ffprobe_tags_cmd(p))
         if proc.returncode != 0:
             return {}
-        data_any: Any = json.loads(proc.stdout or proc.stderr or "{}")
-        if not isinstance(data_any, dict):
-            return {}
-        data: Dict[str, Any] = cast(Dict[str, Any], data_any)
-        fmt_any: Any = data.get("format", {})
-        if not isinstance(fmt_any, dict):
-            return {}
-        fmt = cast(Dict[str, Any], fmt_any)
-        tag_any2: Any = fmt.get("tags", {})
-        if not isinstance(tag_any2, dict):
-            return {}
-        tag_any = cast(Dict[str, Any], tag_any2)
-        out: Dict[str, str] = {}
-        for k in ("artist", "album", "title"):
-            v = tag_any.get(k)
-            if isinstance(v, str) and v.strip():
-                out[k] = v.strip()
-        return out
-    except (json.JSONDecodeError, ValueError, TypeError, FileNotFoundError, OSError):
+        return _parse_probe_tags(proc.stdout)
+    except (ValueError, TypeError, FileNotFoundError, OSError):
+        return {}
+
+
+# ffprobe results gathered ahead of time for album tracks, keyed like the lru cache
+# and consumed by _ffprobe_tags_cached on first lookup.
+_probe_prefetch: Dict[Tuple[str, int, int], Dict[str, str]] = {}
+
+
+async def _run_async(cmd: List[str], timeout: Optional[float] = None) -> Tuple[int, str, str]:
+    """Async counterpart of _run: (returncode, stdout, stderr). Raises TimeoutError."""
+    proc = await asyncio.create_subprocess_exec(
+        *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        out, err = await asyncio.wait_for(proc.communicate(), timeout)
+    except asyncio.TimeoutError as e:
+        proc.kill()
+        await proc.wait()
+        raise TimeoutError(f"Command timed out after {timeout}s: {cmd[0]}") from e
+    return proc.returncode or 0, out.decode(errors="replace"), err.decode(errors="replace")
+
+
+async def _ffprobe_tags_async(p: Path) -> Dict[str, str]:
+    try:
+        rc, out, _ = await _run_async(_ffprobe_tags_cmd(p), timeout=60)
+    except (TimeoutError, OSError):
         return {}
+    return _parse_probe_tags(out) if rc == 0 else {}
+
+
+def _prefetch_album_tags(tracks: List[Path], album_root: Optional[Path] = None, concurrency: int = 8) -> None:
+    """
+    Probe an album's tracks concurrently so later _compute_tags calls find
+    ffprobe results ready. Tracks whose artist/album are already known from
+    embedded tags or the folder name are skipped, since _compute_tags never
+    probes those.
+    """
+    _probe_prefetch.clear()
+    todo: List[Tuple[Path, Tuple[str, int, int]]] = []
+    for t in tracks:
+        key = _stat_key(t)
+        if key is None:
+            continue
+        _, artist, album = _known_tags(t, album_root)
+        if artist and album:
+            continue
+        todo.append((t, (str(t), *key)))
+    if not todo:
+        return
+
+    async def probe_all() -> None:
+        sem = asyncio.Semaphore(concurrency)
+
+        async def one(t: Path, key: Tuple[str, int, int]) -> None:
+            async with sem:
+                _probe_prefetch[key] = await _ffprobe_tags_async(t)
+
+        await asyncio.gather(*(one(t, key) for t, key in todo))
+
+    asyncio.run(probe_all())
+
+
+_TRACKNUM_RE = re.compile(r"^\s*\d{1,3}\s*[-_. ]+\s*")
+_WS_RE = re.compile(r"\s+")
 
 
 def _strip_tracknum_from_title(name: str) -> str:
-    s = re.sub(r"^\s*\d{1,3}\s*[-_. ]+\s*", "", name).strip()
+    s = _TRACKNUM_RE.sub("", name).strip()
     # remove trailing/leading dashes/underscores and squeeze spaces
-    s = re.sub(r"\s+", " ", s)
+    s = _WS_RE.sub(" ", s)
     return s
 
 
-def _compute_tags(src: Path, album_root: Optional[Path]) -> Tuple[str, str, str]:
+def _known_tags(src: Path, album_root: Optional[Path]) -> Tuple[str, str, str]:
+    """(title, artist, album) from embedded tags and folder heuristics only; may be empty."""
     # Base from mutagen
     base = _read_tags(src)
     artist = (base.get("artist") or base.get("ARTIST") or "").strip()
     album = (base.get("album") or base.get("ALBUM") or "").strip()
     title = (base.get("title") or base.get("TITLE") or "").strip()
-    # Try ffprobe if missing
-    if not (artist and album and title):
-        probe = _ffprobe_tags(src)
-        artist = artist or probe.get("artist", "").strip()
-        album = album or probe.get("album", "").strip()
-        title = title or probe.get("title", "").strip()
-    # Filename-based title
-    if not title:
-        title = _strip_tracknum_from_title(src.stem)
-    # Album-folder heuristics
+    # Album-folder heuristics (before ffprobe: for album tracks they usually settle artist/album)
     if album_root and not (artist and album):
         folder = album_root.name.strip()
         # Support hyphen or en dash as separator
@@ -176,6 +325,21 @@ def _compute_tags(src: Path, album_root: Optional[Path]) -> Tuple[str, str, str]
                 album = album or src_parent
             else:
                 album = album or (folder if folder else "Unknown")
+    return title, artist, album
+
+
+def _compute_tags(src: Path, album_root: Optional[Path]) -> Tuple[str, str, str]:
+    title, artist, album = _known_tags(src, album_root)
+    # Try ffprobe only if artist/album are still missing; a missing title alone
+    # is covered by the filename
+    if not (artist and album):
+        probe = _ffprobe_tags(src)
+        artist = artist or probe.get("artist", "").strip()
+        album = album or probe.get("album", "").strip()
+        title = title or probe.get("title", "").strip()
+    # Filename-based title
+    if not title:
+        title = _strip_tracknum_from_title(src.stem)
     # Fallbacks
     artist = artist or "Unknown"
     album = album or "Unknown"
@@ -183,77 +347,252 @@ def _compute_tags(src: Path, album_root: Optional[Path]) -> Tuple[str, str, str]
     return title, artist, album
 
 
-def _mtime(path: Path) -> float:
+def _stat_st(path: Path) -> Tuple[int, float]:
+    """(size, mtime) from a single stat; (0, now) if the file is gone."""
     try:
-        return path.stat().st_mtime
+        st = path.stat()
     except FileNotFoundError:
-        return time.time()
+        return 0, time.time()
+    return st.st_size, st.st_mtime
+
+
+def _mtime(path: Path) -> float:
+    return _stat_st(path)[1]
 
 
 def _file_size(path: Path) -> int:
     """Get file size, return 0 if file doesn't exist."""
-    try:
-        return path.stat().st_size
-    except FileNotFoundError:
-        return 0
+    return _stat_st(path)[0]
+
 
+# Files seen while still settling: path -> (size, mtime, first_seen). Lets the
+# stability check compare across poll cycles instead of sleeping inline.
+_stability_cache: Dict[str, Tuple[int, float, float]] = {}
 
-def _is_file_stable(path: Path, stability_seconds: float = 2.0) -> bool:
+
+def _is_file_stable(path: Union[str, os.PathLike], stability_seconds: float = 2.0) -> bool:
     """
     Check if a file has been stable (unchanged size and mtime) for the specified duration.
     This prevents picking up files that are still being written (e.g., during download/conversion).
+
+    Never blocks: a recently modified file is remembered on first sight and
+    reported stable on a later scan once it has stayed unchanged long enough.
     """
+    key = os.fspath(path)
     try:
-        initial_size = _file_size(path)
-        initial_mtime = _mtime(path)
-        
-        # Check how old the file is - if recently modified, wait for stability
-        age = time.time() - initial_mtime
-        if age < stability_seconds:
-            # File was modified too recently, wait and check again
-            time.sleep(stability_seconds)
-            
-            # Re-check if file still exists and compare
-            if not path.exists():
-                return False
-            
-            new_size = _file_size(path)
-            new_mtime = _mtime(path)
-            
-            # If size or mtime changed, file is still being written
-            if new_size != initial_size or new_mtime != initial_mtime:
-                return False
-        
-        return True
+        st = os.stat(key)
     except (OSError, IOError):
+        _stability_cache.pop(key, None)
         return False
+    now = time.time()
+    if now - st.st_mtime >= stability_seconds:
+        _stability_cache.pop(key, None)
+        return True
+    watcher = _incoming_watcher
+    if watcher is not None and watcher.closed_unchanged(key, st):
+        # The writer closed (or renamed into place) this exact size/mtime: done, no need to wait
+        _stability_cache.pop(key, None)
+        return True
+    prev = _stability_cache.get(key)
+    if prev is not None and prev[0] == st.st_size and prev[1] == st.st_mtime:
+        if now - prev[2] >= stability_seconds:
+            _stability_cache.pop(key, None)
+            return True
+        return False
+    _stability_cache[key] = (st.st_size, st.st_mtime, now)
+    return False
+
+
+class _IncomingWatcher(FileSystemEventHandler):
+    """
+    Flags INCOMING as dirty on any filesystem event so _pick_next can skip
+    rescanning a tree that has not changed since the last empty scan.
+
+    A scan that only found files still settling marks a rescan as pending
+    rather than dirty: the next cycle scans again, but wait() keeps sleeping
+    through the writer's own modify events (which cannot make the file settle
+    sooner) and ends early only when a file is closed or renamed into place.
+    """
+
+    _CLOSED_MAX = 10000
+
+    def __init__(self, incoming: Path, close_write: bool = False):
+        super().__init__()
+        self._dirty = threading.Event()
+        self._dirty.set()  # cold start: always scan once
+        self._pending = False
+        # Set by close/rename events: the only ones that can end a settle early
+        self._ready = threading.Event()
+        # path -> (size, mtime) when its writer closed it (inotify IN_CLOSE_WRITE) or
+        # renamed it into place; lets _is_file_stable skip the settle window
+        self._close_write = close_write
+        self._closed: Dict[str, Tuple[int, float]] = {}
+        self._observer = Observer()
+        self._observer.schedule(self, str(incoming), recursive=True)
+        self._observer.daemon = True
+        self._observer.start()
+
+    def on_any_event(self, event) -> None:
+        self._dirty.set()
+
+    def _record_closed(self, path: str) -> None:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return
+        if len(self._closed) >= self._CLOSED_MAX:
+            self._closed.clear()
+        self._closed[str(Path(path))] = (st.st_size, st.st_mtime)
+
+    def on_closed(self, event) -> None:
+        if self._close_write and not event.is_directory:
+            self._record_closed(event.src_path)
+        self._ready.set()
+
+    def on_moved(self, event) -> None:
+        if self._close_write and not event.is_directory:
+            self._closed.pop(str(Path(event.src_path)), None)
+            self._record_closed(event.dest_path)
+        self._ready.set()
+
+    def on_deleted(self, event) -> None:
+        self._closed.pop(str(Path(event.src_path)), None)
+
+    def closed_unchanged(self, key: str, st: os.stat_result) -> bool:
+        """True if key was closed after writing and still has the size/mtime seen then."""
+        return self._closed.get(key) == (st.st_size, st.st_mtime)
+
+    def mark_dirty(self) -> None:
+        self._dirty.set()
+
+    def mark_pending(self) -> None:
+        """Rescan on the next cycle, without waking wait() early."""
+        self._pending = True
+
+    def consume(self) -> bool:
+        """Return True (and reset) if anything changed or a rescan is pending since the last call."""
+        self._ready.clear()
+        if not self._dirty.is_set() and not self._pending:
+            return False
+        self._dirty.clear()
+        self._pending = False
+        return True
+
+    def wait(self, timeout: float) -> bool:
+        """Block until an event arrives (a close/rename while a rescan is pending) or timeout elapses."""
+        if self._pending:
+            return self._ready.wait(timeout)
+        return self._dirty.wait(timeout)
+
+    def stop(self) -> None:
+        self._observer.stop()
+        self._observer.join(timeout=5)
+
+
+# Set by main() in daemon mode when watchdog is available.
+_incoming_watcher: Optional[_IncomingWatcher] = None
+# True when the last scan saw audio that was not yet stable and must be revisited.
+_scan_pending = False
 
 
 def _scan_candidates(incoming: Path) -> Tuple[List[Path], List[Path]]:
     # lone files in incoming root, and album roots (dirs directly under incoming that contain any audio)
     # Only include files that have been stable (not being written to) for at least 2 seconds
+    global _scan_pending
     lone: List[Path] = []
     album_roots: List[Path] = []
+    pending = False
     if not incoming.exists():
+        _scan_pending = False
         return lone, album_roots
-    # lone files (non-recursive) - only include stable files
-    for p in incoming.iterdir():
-        if p.is_file() and _is_audio(p) and _is_file_stable(p):
-            lone.append(p)
-    # album roots (top-level dirs with audio inside) - only include if all audio files are stable
-    for d in incoming.iterdir():
-        if d.is_dir():
-            audio_files = [x for x in d.rglob("*") if _is_audio(x)]
-            if audio_files and all(_is_file_stable(f) for f in audio_files):
-                album_roots.append(d)
+    # One scandir pass over the incoming root: DirEntry carries the entry type,
+    # so lone files and album dirs are told apart without a stat per entry
+    try:
+        with os.scandir(incoming) as it:
+            entries = list(it)
+    except OSError:
+        entries = []
+    album_dirs: List[Path] = []
+    for e in entries:
+        try:
+            if e.is_dir():
+                album_dirs.append(Path(e.path))
+            elif e.name.lower().endswith(SUPPORTED_EXT_TUPLE) and e.is_file():
+                # lone files (non-recursive) - only include stable files
+                if _is_file_stable(e.path):
+                    lone.append(Path(e.path))
+                else:
+                    pending = True
+        except OSError:
+            continue
+    # album roots (top-level dirs with audio inside) - only include if all audio files are stable.
+    # Walking and stat'ing each album is IO-bound, so several albums are checked at once.
+    if len(album_dirs) > 1:
+        states = list(_scan_executor().map(_album_state, album_dirs))
+    else:
+        states = [_album_state(d) for d in album_dirs]
+    for d, state in zip(album_dirs, states):
+        if state is True:
+            album_roots.append(d)
+        elif state is False:
+            pending = True
+    _scan_pending = pending
     return lone, album_roots
 
 
+def _album_state(album_dir: Path) -> Optional[bool]:
+    """True if every track under album_dir is stable, False if some are not, None if it has no audio."""
+    # Plain strings: no Path is built per track just to stat it
+    audio_files = list(_iter_audio_paths(album_dir))
+    if not audio_files:
+        return None
+    return all(_is_file_stable(f) for f in audio_files)
+
+
+_scan_pool: Optional[ThreadPoolExecutor] = None
+_scan_pool_lock = threading.Lock()
+
+
+def _scan_executor() -> ThreadPoolExecutor:
+    """Return the pool used to check album dirs in parallel, creating it on first use."""
+    global _scan_pool
+    with _scan_pool_lock:
+        if _scan_pool is None:
+            _scan_pool = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1),
+                                            thread_name_prefix="scan")
+    return _scan_pool
+
+
 # Public wrapper for tests and tooling
 def scan_incoming_candidates(incoming: Path) -> Tuple[List[Path], List[Path]]:
     return _scan_candidates(incoming)
 
 
+# Tracks of the album named in the lock file, admitted once per lock:
+# album root -> (lock mtime, {track: mtime}). Processed tracks are deleted from
+# disk, so the next pick is the oldest cached track that still exists.
+_active_album_cache: Dict[str, Tuple[float, Dict[Path, float]]] = {}
+
+
+def _next_album_track(album_root: Path, lock_mtime: float) -> Optional[Path]:
+    """Oldest remaining track of the active album; rescans only on a new lock or when exhausted."""
+    key = str(album_root)
+    cached = _active_album_cache.get(key)
+    if cached is not None and cached[0] == lock_mtime:
+        tracks = cached[1]
+        while tracks:
+            track = min(tracks, key=lambda p: (tracks[p], str(p)))
+            if track.exists():
+                return track
+            del tracks[track]
+    _active_album_cache.clear()
+    tracks = {p: _mtime(p) for p in _iter_audio(album_root)}
+    if not tracks:
+        return None
+    _active_album_cache[key] = (lock_mtime, tracks)
+    return min(tracks, key=lambda p: (tracks[p], str(p)))
+
+
 def _pick_next(incoming: Path, album_lock: Path) -> Optional[Job]:
     # If an album is active, keep processing it sequentially until finished
     if album_lock.exists():
@@ -262,12 +601,11 @@ def _pick_next(incoming: Path, album_lock: Path) -> Optional[Job]:
             if album_path_str:
                 album_root = Path(album_path_str)
                 if album_root.exists():
-                    tracks = sorted([p for p in album_root.rglob("*") if _is_audio(p)], key=str)
-                    if tracks:
-                        track = min(tracks, key=_mtime)
+                    track = _next_album_track(album_root, album_lock.stat().st_mtime)
+                    if track is not None:
                         cover = find_album_art_in_dir(album_root) or None
                         if cover is None:
-                            cover = extract_first_embedded_art(track, incoming / ".tmp_cover.jpg")
+                            cover = extract_first_embedded_art(track, incoming / _TMP_COVER_NAME)
                         return Job(src=track, album_root=album_root, cover=cover)
                 # Stale lock (album gone or empty). Remove and proceed to normal scan.
                 try:
@@ -277,22 +615,29 @@ def _pick_next(incoming: Path, album_lock: Path) -> Optional[Job]:
         except OSError:
             pass
 
+    watcher = _incoming_watcher
+    if watcher is not None and not watcher.consume():
+        return None  # nothing changed since the last empty scan
     lone, albums = _scan_candidates(incoming)
     if not lone and not albums:
+        if watcher is not None and _scan_pending:
+            watcher.mark_pending()  # files still settling; look again next cycle
         return None
-    oldest_lone: Optional[Path] = min(lone, key=_mtime) if lone else None
-    oldest_album: Optional[Path] = min(albums, key=_mtime) if albums else None
+    # stat each candidate once; the winners' mtimes are reused for the comparison below
+    mtimes: Dict[Path, float] = {p: _mtime(p) for p in (*lone, *albums)}
+    oldest_lone: Optional[Path] = min(lone, key=mtimes.__getitem__) if lone else None
+    oldest_album: Optional[Path] = min(albums, key=mtimes.__getitem__) if albums else None
     # choose older between oldest lone file and oldest album dir
     pick_album = False
     if oldest_lone and oldest_album:
-        pick_album = _mtime(oldest_album) <= _mtime(oldest_lone)
+        pick_album = mtimes[oldest_album] <= mtimes[oldest_lone]
     elif oldest_album and not oldest_lone:
         pick_album = True
     # when album picked, select next track to process: by track number if available, else natural sort order
     if pick_album:
         # sort candidates inside album
         assert oldest_album is not None
-        tracks = sorted([p for p in oldest_album.rglob("*") if _is_audio(p)], key=str)
+        tracks = sorted(_iter_audio(oldest_album), key=str)
         if not tracks:
             return None
         # choose oldest track by mtime to be robust and preserve sequential-ish order
@@ -300,7 +645,7 @@ def _pick_next(incoming: Path, album_lock: Path) -> Optional[Job]:
         cover = find_album_art_in_dir(oldest_album) or None
         if cover is None:
             # optionally try embedded art from first track
-            cover = extract_first_embedded_art(track, incoming / ".tmp_cover.jpg")
+            cover = extract_first_embedded_art(track, incoming / _TMP_COVER_NAME)
         return Job(src=track, album_root=oldest_album, cover=cover)
     else:
         assert oldest_lone is not None
@@ -322,6 +667,19 @@ def _chunk_plan_seconds(total_sec: float, chunk_sec: int = 120, overlap_sec: flo
 
 
 def _ffprobe_duration_sec(p: Path) -> float:
+    key = _stat_key(p)
+    if key is None:
+        return _ffprobe_duration_uncached(p)
+    return _ffprobe_duration_cached(str(p), *key)
+
+
+@lru_cache(maxsize=4096)
+def _ffprobe_duration_cached(path_str: str, size: int, mtime_ns: int) -> float:
+    del size, mtime_ns  # cache key only
+    return _ffprobe_duration_uncached(Path(path_str))
+
+
+def _ffprobe_duration_uncached(p: Path) -> float:
     from .audio import ffprobe_duration
     cfg = Config()
     return ffprobe_duration(p, cfg)
@@ -343,8 +701,242 @@ def _ffmpeg_extract(src: Path, dst: Path, start: float, dur: float, sr: int, thr
         raise RuntimeError(p.stderr or p.stdout)
 
 
-def _demucs_no_vocals(chunk_wav: Path, out_dir: Path, model: str, device: str = "cpu", jobs: int = 1, 
-                      chunk_index: int = 0, total_chunks: int = 1, timeout_sec: int = 3600) -> Path:
+@dataclass
+class _PcmChunk:
+    """Decoded s16le chunk held in memory; only written to `path` if a file is needed."""
+    path: Path
+    data: bytes
+    sample_rate: int
+    channels: int = 2
+
+    @property
+    def name(self) -> str:
+        return self.path.name
+
+    @property
+    def stem(self) -> str:
+        return self.path.stem
+
+    def __str__(self) -> str:
+        return str(self.path)
+
+    def materialize(self) -> Path:
+        """Write the PCM out as a WAV (for the demucs CLI fallback) and return its path."""
+        if not self.path.exists():
+            ensure_dir(self.path.parent)
+            with wave.open(str(self.path), "wb") as w:
+                w.setnchannels(self.channels)
+                w.setsampwidth(2)
+                w.setframerate(self.sample_rate)
+                w.writeframes(self.data)
+        return self.path
+
+
+def _ffmpeg_read_pcm(src: Path, dst: Path, start: float, dur: float, sr: int, threads: int) -> _PcmChunk:
+    """Decode a slice of `src` to stereo s16le on ffmpeg's stdout instead of a chunk WAV."""
+    cmd = [
+        "ffmpeg", "-nostdin",
+        "-ss", f"{start:.3f}", "-t", f"{dur:.3f}",
+        "-i", str(src),
+        "-ac", "2", "-ar", str(sr), "-f", "s16le",
+    ]
+    if threads and threads > 0:
+        cmd += ["-threads", str(threads)]
+    cmd += ["-"]
+    p = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=False)
+    if p.returncode != 0:
+        raise RuntimeError(p.stderr.decode(errors="replace"))
+    return _PcmChunk(dst, p.stdout, sr)
+
+
+def _ffmpeg_segment(src: Path, work: Path, chunk_sec: int, sr: int, threads: int) -> List[Path]:
+    """
+    Split src into back-to-back chunk_%03d.wav files with one ffmpeg run (segment muxer).
+
+    Only valid for zero overlap; the segment muxer cannot emit overlapping slices.
+    """
+    ensure_dir(work)
+    cmd = [
+        "ffmpeg", "-y", "-nostdin",
+        "-i", str(src),
+        "-f", "segment", "-segment_time", str(chunk_sec), "-reset_timestamps", "1",
+        "-c:a", "pcm_s16le", "-ar", str(sr),
+    ]
+    if threads and threads > 0:
+        cmd += ["-threads", str(threads)]
+    cmd += [str(work / "chunk_%03d.wav")]
+    p = _run(cmd)
+    if p.returncode != 0:
+        raise RuntimeError(p.stderr or p.stdout)
+    chunks = sorted(work.glob("chunk_*.wav"))
+    if not chunks:
+        raise RuntimeError(f"ffmpeg segment produced no chunks for {src.name}")
+    return chunks
+
+
+def _ffmpeg_extract_all(src: Path, work: Path, plan: List[Tuple[float, float, float, float]],
+                        sr: int, threads: int, workers: int = 2) -> List[Path]:
+    """
+    Extract every chunk of plan to work/chunk_%03d.wav, running up to `workers` ffmpeg at once.
+
+    With zero overlap a single segmenting ffmpeg run reads the source once
+    instead; it falls back to per-chunk extraction if segmenting fails.
+    """
+    if len(plan) > 1 and all(head == 0 and tail == 0 for _, _, head, tail in plan):
+        try:
+            return _ffmpeg_segment(src, work, 120, sr, threads)
+        except RuntimeError as e:
+            print(f"[simple] Segmenting failed ({e}); extracting chunks individually")
+            for stale in work.glob("chunk_*.wav"):
+                stale.unlink(missing_ok=True)
+    ensure_dir(work)
+    paths = [work / f"chunk_{i:03d}.wav" for i in range(len(plan))]
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(plan))), thread_name_prefix="extract") as ex:
+        futures = [ex.submit(_ffmpeg_extract, src, paths[i], start, dur, sr, threads)
+                   for i, (start, dur, _, _) in enumerate(plan)]
+        for f in futures:
+            f.result()
+    return paths
+
+
+def _iter_extracted_chunks(src: Path, work: Path, plan: List[Tuple[float, float, float, float]],
+                           sr: int, threads: int, lookahead: int = 2, pcm: bool = False):
+    """
+    Yield (index, chunk_path) in plan order, extracting up to `lookahead` chunks ahead.
+
+    Extraction is ffmpeg/disk bound while Demucs is compute bound, so pulling the
+    next chunks out of the source while the caller separates the current one
+    overlaps the two stages. The lookahead bounds how many chunk WAVs sit on disk.
+    With pcm=True chunks are decoded to memory and yielded as _PcmChunk instead.
+    """
+    total = len(plan)
+    paths = [work / f"chunk_{i:03d}.wav" for i in range(total)]
+    ex = ThreadPoolExecutor(max_workers=max(1, lookahead), thread_name_prefix="extract")
+    futures: Dict[int, Any] = {}
+
+    def submit(i: int) -> None:
+        start, dur, _, _ = plan[i]
+        print(f"[simple] [{i+1}/{total}] Extracting chunk at {start:.1f}s, duration {dur:.1f}s")
+        futures[i] = ex.submit(_ffmpeg_read_pcm if pcm else _ffmpeg_extract,
+                               src, paths[i], start, dur, sr, threads)
+
+    try:
+        for i in range(min(lookahead, total)):
+            submit(i)
+        for i in range(total):
+            chunk = futures.pop(i).result()
+            if i + lookahead < total:
+                submit(i + lookahead)
+            yield i, (chunk if pcm else paths[i])
+    finally:
+        ex.shutdown(wait=True, cancel_futures=True)
+
+
+# Loaded Demucs models keyed by (model name, device); populated on first in-process use.
+_demucs_models: Dict[Tuple[str, str], Any] = {}
+_demucs_models_lock = threading.Lock()
+
+
+def _get_demucs_model(model: str, device: str) -> Any:
+    """Return a cached, eval-mode Demucs model. Raises ImportError if demucs/torch are missing."""
+    key = (model, device)
+    with _demucs_models_lock:
+        m = _demucs_models.get(key)
+        if m is None:
+            from demucs.pretrained import get_model  # heavy import, deferred
+            print(f"[simple] Loading Demucs model {model} on {device}")
+            m = get_model(model)
+            m.to(device).eval()
+            import torch
+            # CPU_MAX_THREADS only reaches child processes via env; apply it here too
+            if Config.CPU_MAX_THREADS > 0:
+                torch.set_num_threads(Config.CPU_MAX_THREADS)
+            _demucs_models[key] = m
+        return m
+
+
+def _demucs_separate_inprocess(chunk_wav: Union[Path, _PcmChunk], model: str, device: str = "cpu",
+                               jobs: int = 1, autocast: bool = False) -> Tuple[Any, Any]:
+    """
+    Separate a chunk with the cached Demucs model; returns (model, sources tensor on CPU).
+
+    In-memory PCM chunks are fed to the model directly without a chunk WAV round
+    trip. With autocast the forward pass runs in bfloat16 on CPU / float16 on CUDA.
+    """
+    import torch
+    import torchaudio
+    from demucs.apply import apply_model
+    from demucs.audio import convert_audio
+
+    m = _get_demucs_model(model, device)
+    if isinstance(chunk_wav, _PcmChunk):
+        import numpy as np
+        samples = np.frombuffer(chunk_wav.data, dtype=np.int16).reshape(-1, chunk_wav.channels)
+        wav = torch.from_numpy(samples.T.astype(np.float32) / 32768.0)
+        sr = chunk_wav.sample_rate
+    else:
+        wav, sr = torchaudio.load(str(chunk_wav))
+    wav = convert_audio(wav, sr, m.samplerate, m.audio_channels)
+    # Same per-track normalisation the CLI applies
+    ref = wav.mean(0)
+    mean, std = ref.mean(), ref.std() + 1e-8
+    mix = ((wav - mean) / std).unsqueeze(0).to(device)
+    device_type = "cuda" if device.startswith("cuda") else "cpu"
+    if autocast:
+        # Also let float32 matmuls use reduced-precision kernels. This is process-wide,
+        # so it is only switched on when reduced precision was asked for.
+        torch.set_float32_matmul_precision("medium")
+    precision = torch.autocast(device_type=device_type,
+                               dtype=torch.float16 if device_type == "cuda" else torch.bfloat16,
+                               enabled=autocast)
+    with torch.inference_mode(), precision:
+        sources = apply_model(m, mix, split=True, overlap=0.25, shifts=0,
+                              num_workers=max(0, int(jobs) - 1) if device == "cpu" else 0)[0]
+    return m, (sources.float() * std + mean).cpu()
+
+
+def _save_stem_wav(dst: Path, audio: Any, samplerate: int) -> None:
+    import torchaudio
+    # 16-bit PCM like the CLI's default output, so the in-memory mixers can read it
+    torchaudio.save(str(dst), audio.clamp(-1.0, 1.0), samplerate, encoding="PCM_S", bits_per_sample=16)
+
+
+def _demucs_no_vocals_inprocess(chunk_wav: Union[Path, _PcmChunk], out_dir: Path, model: str,
+                                device: str = "cpu", jobs: int = 1, autocast: bool = False) -> Path:
+    """
+    Separate a chunk with a preloaded Demucs model and write the accompaniment.
+
+    Output lands at out_dir/<model>/<chunk stem>/no_vocals.wav, the same layout the
+    demucs CLI produces with --two-stems vocals.
+    """
+    m, sources = _demucs_separate_inprocess(chunk_wav, model, device, jobs, autocast)
+    keep = [k for k, name in enumerate(m.sources) if name != "vocals"]
+    dst_dir = out_dir / model / chunk_wav.stem
+    ensure_dir(dst_dir)
+    dst = dst_dir / "no_vocals.wav"
+    _save_stem_wav(dst, sources[keep].sum(0), m.samplerate)
+    return dst
+
+
+def _demucs_full_stems_inprocess(chunk_wav: Path, out_dir: Path, model: str, device: str = "cpu",
+                                 jobs: int = 1, autocast: bool = False) -> Path:
+    """
+    Separate a chunk with a preloaded Demucs model and write every stem.
+
+    Output lands at out_dir/<model>/<chunk stem>/{vocals,drums,bass,other}.wav,
+    the layout of a plain demucs CLI run; returns that directory.
+    """
+    m, sources = _demucs_separate_inprocess(chunk_wav, model, device, jobs, autocast)
+    dst_dir = out_dir / model / chunk_wav.stem
+    ensure_dir(dst_dir)
+    for k, name in enumerate(m.sources):
+        _save_stem_wav(dst_dir / f"{name}.wav", sources[k], m.samplerate)
+    return dst_dir
+
+
+def _demucs_no_vocals(chunk_wav: Union[Path, _PcmChunk], out_dir: Path, model: str, device: str = "cpu", jobs: int = 1, 
+                      chunk_index: int = 0, total_chunks: int = 1, timeout_sec: int = 3600,
+                      inprocess: bool = False, autocast: bool = False) -> Path:
     """
     Run Demucs on a chunk with timeout protection.
     
@@ -357,6 +949,8 @@ def _demucs_no_vocals(chunk_wav: Path, out_dir: Path, model: str, device: str =
         chunk_index: Current chunk index for progress reporting
         total_chunks: Total number of chunks for progress reporting
         timeout_sec: Timeout in seconds (default 1 hour per chunk)
+        inprocess: Use the cached in-process model instead of the CLI (timeout not enforced)
+        autocast: Run the in-process forward pass in reduced precision
     
     Returns:
         Path to the instrumental/no_vocals output file
@@ -373,6 +967,19 @@ def _demucs_no_vocals(chunk_wav: Path, out_dir: Path, model: str, device: str =
     
     print(f"[simple] {progress} Processing chunk: {chunk_name}")
     start_time = time.time()
+
+    if inprocess:
+        try:
+            acc = _demucs_no_vocals_inprocess(chunk_wav, out_dir, model, device, jobs, autocast)
+        except ImportError as e:
+            print(f"[simple] {progress} In-process Demucs unavailable ({e}); using CLI")
+        else:
+            elapsed = time.time() - start_time
+            print(f"[simple] {progress} Completed in {elapsed:.1f}s (~{elapsed/60:.1f} min)")
+            return acc
+
+    if isinstance(chunk_wav, _PcmChunk):
+        chunk_wav = chunk_wav.materialize()
     
     # Use two-stems=vocals so we can take the accompaniment quickly
     cmd = [
@@ -436,8 +1043,49 @@ def _demucs_no_vocals(chunk_wav: Path, out_dir: Path, model: str, device: str =
     raise RuntimeError(f"Demucs output not found for {chunk_name} in {out_dir}")
 
 
+def _demucs_no_vocals_batch(chunks: List[Path], out_dir: Path, model: str, device: str = "cpu",
+                            jobs: int = 1, timeout_sec: int = 3600) -> List[Path]:
+    """
+    Run a single demucs CLI invocation over all chunks so the model loads once.
+
+    Returns the accompaniment paths in chunk order. Raises TimeoutError/RuntimeError
+    if the run fails or any chunk's output is missing; callers fall back to the
+    per-chunk path.
+    """
+    ensure_dir(out_dir)
+    print(f"[simple] Running Demucs once over {len(chunks)} chunks (timeout: {timeout_sec}s)")
+    start_time = time.time()
+    cmd = [
+        "demucs", "-n", model,
+        "--two-stems", "vocals",
+        "-o", str(out_dir),
+        "--device", device,
+        "--jobs", str(max(1, int(jobs))),
+        *[str(c) for c in chunks],
+    ]
+    p = _run_with_timeout(cmd, timeout_sec=timeout_sec, description=f"Demucs batch of {len(chunks)} chunks")
+    if p.returncode != 0:
+        error_msg = (p.stderr or p.stdout or "Unknown error").strip()
+        raise RuntimeError(f"Demucs batch failed: {error_msg}")
+
+    candidates = ("no_vocals.wav", "other.wav", "accompaniment.wav")
+    results: List[Path] = []
+    for c in chunks:
+        for base in (out_dir / model / c.stem, out_dir / c.stem):
+            found = next((base / n for n in candidates if (base / n).exists()), None)
+            if found is not None:
+                results.append(found)
+                break
+        else:
+            raise RuntimeError(f"Demucs output not found for {c.name} in {out_dir}")
+    elapsed = time.time() - start_time
+    print(f"[simple] Demucs batch completed in {elapsed:.1f}s (~{elapsed/60:.1f} min)")
+    return results
+
+
 def _demucs_full_stems(chunk_wav: Path, out_dir: Path, model: str, device: str = "cpu", jobs: int = 1,
-                       chunk_index: int = 0, total_chunks: int = 1, timeout_sec: int = 3600) -> Path:
+                       chunk_index: int = 0, total_chunks: int = 1, timeout_sec: int = 3600,
+                       inprocess: bool = False, autocast: bool = False) -> Path:
     """
     Run Demucs on a chunk to extract all stems (vocals, drums, bass, other).
     Returns the demucs output directory containing all stems.
@@ -451,6 +1099,8 @@ def _demucs_full_stems(chunk_wav: Path, out_dir: Path, model: str, device: str =
         chunk_index: Current chunk index for progress reporting
         total_chunks: Total number of chunks
         timeout_sec: Timeout in seconds
+        inprocess: Use the cached in-process model instead of the CLI (timeout not enforced)
+        autocast: Run the in-process forward pass in reduced precision
     
     Returns:
         Path to the demucs output directory containing all stems
@@ -467,6 +1117,16 @@ def _demucs_full_stems(chunk_wav: Path, out_dir: Path, model: str, device: str =
     print(f"[simple] {progress} Extracting stems from: {chunk_name}")
     start_time = time.time()
     
+    if inprocess:
+        try:
+            stems_dir = _demucs_full_stems_inprocess(chunk_wav, out_dir, model, device, jobs, autocast)
+        except ImportError as e:
+            print(f"[simple] {progress} In-process Demucs unavailable ({e}); using CLI")
+        else:
+            elapsed = time.time() - start_time
+            print(f"[simple] {progress} Completed in {elapsed:.1f}s (~{elapsed/60:.1f} min)")
+            return stems_dir
+    
     cmd = [
         "demucs", "-n", model,
         "-o", str(out_dir),
@@ -519,14 +1179,54 @@ def _demucs_full_stems(chunk_wav: Path, out_dir: Path, model: str, device: str =
 
 
 
-def _concat_with_crossfades(parts: List[Path], out_wav: Path, crossfade_ms: int, threads: int):
+# Linux caps a single argv string at 128 KiB (MAX_ARG_STRLEN); stay well below it.
+_MAX_FILTER_GRAPH_LEN: Final[int] = 64 * 1024
+
+
+def _concat_with_crossfades(parts: List[Path], out_wav: Path, crossfade_ms: int, threads: int,
+                            consume: bool = False):
+    """Join parts into out_wav. consume=True lets a single part be moved rather than copied."""
     ensure_dir(out_wav.parent)
     if len(parts) == 1:
-        shutil.copy2(parts[0], out_wav)
+        if consume:
+            # Part is scratch in the same work dir: a rename instead of a full copy
+            os.replace(parts[0], out_wav)
+        else:
+            copy_file_fast(parts[0], out_wav)
         return
+    # One ffmpeg run chaining every acrossfade, so the output is written once
+    # instead of re-encoding a growing intermediate per pair.
+    cf_s = max(0, crossfade_ms) / 1000.0
+    links: List[str] = []
+    prev = "0"
+    for i in range(1, len(parts)):
+        links.append(f"[{prev}][{i}]acrossfade=d={cf_s:.3f}[a{i}]")
+        prev = f"a{i}"
+    graph = ";".join(links)
+    if len(graph) <= _MAX_FILTER_GRAPH_LEN:
+        cmd = ["ffmpeg", "-y"]
+        for part in parts:
+            cmd += ["-i", str(part)]
+        cmd += ["-filter_complex", graph, "-map", f"[{prev}]"]
+        if threads and threads > 0:
+            cmd += ["-threads", str(threads)]
+        cmd += [str(out_wav)]
+        try:
+            p = _run(cmd)
+        except OSError as e:
+            if e.errno != errno.E2BIG:
+                raise
+            print(f"[simple] Crossfade graph too large ({e}); falling back to pairwise")
+        else:
+            if p.returncode != 0:
+                raise RuntimeError(p.stderr or p.stdout)
+            return
+    _concat_with_crossfades_pairwise(parts, out_wav, cf_s, threads)
+
+
+def _concat_with_crossfades_pairwise(parts: List[Path], out_wav: Path, cf_s: float, threads: int):
     # iteratively acrossfade pairwise
     tmp = parts[0]
-    cf_s = max(0, crossfade_ms) / 1000.0
     for i in range(1, len(parts)):
         nxt = parts[i]
         tmp_out = out_wav.parent / f"_xf_{i}.wav"
@@ -545,17 +1245,46 @@ def _concat_with_crossfades(parts: List[Path], out_wav: Path, crossfade_ms: int,
     tmp.rename(out_wav)
 
 
-def _encode_and_tag(final_wav: Path, dst_mp3: Path, comment_str: str, cover: Optional[Path], threads: int,
-                    title: str, artist: str, album: str):
+def _overlap_add_stems(parts: List[Path], overlap_sec: float, name: Path) -> Optional[_PcmChunk]:
+    """
+    Join per-chunk stems in memory, crossfading the region adjacent chunks share.
+
+    Chunks from _chunk_plan_seconds overlap by 2 * overlap_sec of source audio;
+    that shared span is blended with complementary sin^2/cos^2 windows. Returns
+    None (caller uses the ffmpeg crossfade) if numpy is missing or the stems
+    cannot be read with a common format.
+    """
+    merged = mixer.merge_files(parts, 2 * max(0.0, overlap_sec))
+    if merged is None:
+        return None
+    data, sr = merged
+    return _PcmChunk(name, mixer.to_pcm16(data), sr, data.shape[1])
+
+
+def _use_mixer(cfg: Config) -> bool:
+    """True when chunk merges and stem mixes should run in-process (MIXER_BACKEND)."""
+    return cfg.MIXER_BACKEND != "ffmpeg" and mixer.available()
+
+
+def _encode_and_tag(final_wav: Union[Path, _PcmChunk], dst_mp3: Path, comment_str: str, cover: Optional[Path],
+                    threads: int, title: str, artist: str, album: str, cfg: Optional[Config] = None):
     # sanitize for path (POSIX keeps ':' and quotes; sanitize_filename is POSIX-aware)
     fn_artist = sanitize_filename(artist)
     fn_album = sanitize_filename(album)
     fn_title = sanitize_filename(title)
     ensure_dir(dst_mp3.parent)
-    # Determine MP3 encoding mode from config
-    cfg = Config()
+    # Determine MP3 encoding mode from the caller's config
+    if cfg is None:
+        cfg = Config()
     # 1) Inputs first
-    cmd = ["ffmpeg", "-y", "-i", str(final_wav)]
+    stdin_pcm: Optional[bytes] = None
+    if isinstance(final_wav, _PcmChunk):
+        # Merged audio is still in memory: stream it to the encoder on stdin
+        stdin_pcm = final_wav.data
+        cmd = ["ffmpeg", "-y", "-f", "s16le", "-ar", str(final_wav.sample_rate),
+               "-ac", str(final_wav.channels), "-i", "pipe:0"]
+    else:
+        cmd = ["ffmpeg", "-y", "-i", str(final_wav)]
     if cover and cover.exists():
         cmd += ["-i", str(cover)]
     # 2) Mapping
@@ -577,21 +1306,61 @@ def _encode_and_tag(final_wav: Path, dst_mp3: Path, comment_str: str, cover: Opt
         cmd += ["-q:a", "0"]
     cmd += [
         "-id3v2_version", "3",
+        # Intermediate WAV carries nothing worth copying; only write our own tags
+        "-map_metadata", "-1",
         "-metadata", f"artist={artist}",
         "-metadata", f"album={album}",
         "-metadata", f"title={title}",
         "-metadata", f"comment={comment_str}",
     ]
-    if threads and threads > 0:
-        cmd += ["-threads", str(threads)]
+    # 0 lets ffmpeg pick; an explicit FFMPEG_THREADS/CPU cap still wins
+    cmd += ["-threads", str(threads if threads and threads > 0 else 0)]
     cmd += [str(dst_mp3)]
-    p = _run(cmd)
-    if p.returncode != 0:
-        raise RuntimeError(p.stderr or p.stdout)
+    if stdin_pcm is not None:
+        pb = subprocess.run(cmd, input=stdin_pcm, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=False)
+        if pb.returncode != 0:
+            raise RuntimeError((pb.stderr or pb.stdout).decode(errors="replace"))
+    else:
+        p = _run(cmd)
+        if p.returncode != 0:
+            raise RuntimeError(p.stderr or p.stdout)
     # return paths and tag set
     return fn_artist, fn_album, fn_title
 
 
+# Long-lived, line-buffered handle on LOG_DIR/simple_runner.jsonl: (path, handle)
+_event_log: Optional[Tuple[str, IO[str]]] = None
+_event_log_lock = threading.Lock()
+
+
+def _log_event(cfg: Config, evt: Dict[str, Any]) -> None:
+    """Append one JSON line to the runner's event log, reusing the open handle."""
+    global _event_log
+    path = os.path.join(cfg.LOG_DIR, "simple_runner.jsonl")
+    line = json.dumps(evt) + "\n"
+    with _event_log_lock:
+        if _event_log is None or _event_log[0] != path:
+            if _event_log is not None:
+                _event_log[1].close()
+                _event_log = None
+            ensure_dir(Path(cfg.LOG_DIR))
+            _event_log = (path, open(path, "a", buffering=1))
+        _event_log[1].write(line)
+
+
+@atexit.register
+def _close_event_log() -> None:
+    """Close the event log handle so its fd is released deterministically at exit."""
+    global _event_log
+    with _event_log_lock:
+        if _event_log is not None:
+            try:
+                _event_log[1].close()
+            except OSError:
+                pass
+            _event_log = None
+
+
 def process_one(cfg: Config) -> bool:
     incoming = Path(cfg.INCOMING)
     music = Path(cfg.MUSIC_LIBRARY)
@@ -607,6 +1376,10 @@ def process_one(cfg: Config) -> bool:
     src = job.src
     print(f"[simple] processing: {src}")
     print(f"[simple] ============================================")
+    if job.album_root is not None and not album_lock.exists():
+        # First track of a new album: probe the rest concurrently while this one separates
+        threading.Thread(target=_prefetch_album_tags, args=(list(_iter_audio(job.album_root)), job.album_root),
+                         name="tag-prefetch", daemon=True).start()
     
     overall_start = time.time()
     work = Path(cfg.WORKING) / f"simple_{int(time.time())}"
@@ -630,7 +1403,6 @@ def process_one(cfg: Config) -> bool:
             print(f"[simple] skipped corrupt input (failed to move): {src} ({e})")
         # Log structured event
         try:
-            log_dir = Path(cfg.LOG_DIR); ensure_dir(log_dir)
             evt: Dict[str, Any] = {
                 "event": "skipped_corrupt",
                 "source": str(src),
@@ -639,7 +1411,7 @@ def process_one(cfg: Config) -> bool:
                 "corrupt_dest": cfg.CORRUPT_DEST,
                 "timestamp": int(time.time()),
             }
-            (log_dir / "simple_runner.jsonl").open("a").write(json.dumps(evt) + "\n")
+            _log_event(cfg, evt)
         except Exception:
             pass
         # best-effort: remove work dir if created
@@ -649,27 +1421,51 @@ def process_one(cfg: Config) -> bool:
             pass
         return True
     plan = _chunk_plan_seconds(duration, chunk_sec=120, overlap_sec=cfg.CHUNK_OVERLAP_SEC)
-    chunks: List[Path] = []
+    n_chunks = len(plan)
     
     print(f"[simple] Audio duration: {duration:.1f}s (~{duration/60:.1f} min)")
-    print(f"[simple] Creating {len(plan)} chunks with {cfg.CHUNK_OVERLAP_SEC}s overlap")
-    
-    for i, (start, dur, _, _) in enumerate(plan):
-        cpath = work / f"chunk_{i:03d}.wav"
-        print(f"[simple] [{i+1}/{len(plan)}] Extracting chunk at {start:.1f}s, duration {dur:.1f}s")
-        _ffmpeg_extract(src, cpath, start, dur, cfg.SAMPLE_RATE, cfg.FFMPEG_THREADS)
-        chunks.append(cpath)
+    print(f"[simple] Creating {n_chunks} chunks with {cfg.CHUNK_OVERLAP_SEC}s overlap")
 
     # 2) demucs for each chunk to get accompaniment (no vocals)
+    # Chunks are extracted in the background while earlier ones are separated.
     # Add retry logic and timeout for each chunk
     stems: List[Path] = []
     max_retries = cfg.DEMUCS_MAX_RETRIES
     # Use configured timeout, or calculate based on chunk duration
     chunk_timeout_sec = cfg.DEMUCS_CHUNK_TIMEOUT_SEC if cfg.DEMUCS_CHUNK_TIMEOUT_SEC > 0 else max(600, int(120 * 5))
     
-    print(f"[simple] Processing {len(chunks)} chunks with Demucs (timeout: {chunk_timeout_sec}s per chunk, max retries: {max_retries})")
+    print(f"[simple] Processing {n_chunks} chunks with Demucs (timeout: {chunk_timeout_sec}s per chunk, max retries: {max_retries})")
     
-    for i, c in enumerate(chunks):
+    # In-process Demucs takes decoded PCM straight from ffmpeg's stdout.
+    chunk_iter = _iter_extracted_chunks(src, work, plan, cfg.SAMPLE_RATE, cfg.FFMPEG_THREADS,
+                                        pcm=cfg.DEMUCS_INPROCESS)
+    if not cfg.DEMUCS_INPROCESS and n_chunks > 1:
+        # CLI mode: one demucs run over every chunk amortises the model load.
+        # On any failure fall through to the per-chunk loop with retries.
+        chunks: List[Path] = []
+        if cfg.CHUNK_OVERLAP_SEC <= 0:
+            # No overlap to honour: a single segmenting ffmpeg run replaces N seek+extract runs
+            try:
+                chunks = _ffmpeg_segment(src, work, 120, cfg.SAMPLE_RATE, cfg.FFMPEG_THREADS)
+                n_chunks = len(chunks)
+            except RuntimeError as e:
+                print(f"[simple] Segmenting failed ({e}); extracting chunks individually")
+                for stale in work.glob("chunk_*.wav"):
+                    stale.unlink(missing_ok=True)
+        if not chunks:
+            chunks = [c for _, c in chunk_iter]
+        batch_dir = work / "demucs_batch"
+        try:
+            stems = _demucs_no_vocals_batch(
+                chunks, batch_dir, cfg.MODEL, cfg.DEMUCS_DEVICE, cfg.DEMUCS_JOBS,
+                timeout_sec=chunk_timeout_sec * n_chunks,
+            )
+        except (TimeoutError, RuntimeError, OSError) as e:
+            print(f"[simple] Demucs batch failed ({e}); processing chunks individually")
+            stems = []
+            _discard_dir(batch_dir, work)
+        chunk_iter = iter(()) if stems else ((i, c) for i, c in enumerate(chunks))
+    for i, c in chunk_iter:
         out_dir = work / f"demucs_{i:03d}"
         retry_count = 0
         success = False
@@ -678,29 +1474,26 @@ def process_one(cfg: Config) -> bool:
         while retry_count <= max_retries and not success:
             try:
                 if retry_count > 0:
-                    print(f"[simple] [{i+1}/{len(chunks)}] Retry {retry_count}/{max_retries} for {c.name}")
-                    # Clean up failed output directory before retry
-                    if out_dir.exists():
-                        try:
-                            shutil.rmtree(out_dir)
-                        except Exception as e:
-                            print(f"[simple] Warning: Could not clean {out_dir}: {e}")
+                    print(f"[simple] [{i+1}/{n_chunks}] Retry {retry_count}/{max_retries} for {c.name}")
+                    # Move the failed output aside; it is deleted while the retry runs
+                    _discard_dir(out_dir, work)
                 
                 acc = _demucs_no_vocals(
                     c, out_dir, cfg.MODEL, cfg.DEMUCS_DEVICE, cfg.DEMUCS_JOBS,
-                    chunk_index=i, total_chunks=len(chunks), timeout_sec=chunk_timeout_sec
+                    chunk_index=i, total_chunks=n_chunks, timeout_sec=chunk_timeout_sec,
+                    inprocess=cfg.DEMUCS_INPROCESS, autocast=cfg.DEMUCS_AUTOCAST,
                 )
                 stems.append(acc)
                 success = True
                 
             except TimeoutError as e:
                 last_error = e
-                print(f"[simple] [{i+1}/{len(chunks)}] Chunk {c.name} timed out")
+                print(f"[simple] [{i+1}/{n_chunks}] Chunk {c.name} timed out")
                 retry_count += 1
                 
             except Exception as e:
                 last_error = e
-                print(f"[simple] [{i+1}/{len(chunks)}] Chunk {c.name} failed: {e}")
+                print(f"[simple] [{i+1}/{n_chunks}] Chunk {c.name} failed: {e}")
                 retry_count += 1
         
         if not success:
@@ -710,7 +1503,6 @@ def process_one(cfg: Config) -> bool:
             
             # Log the failure
             try:
-                log_dir = Path(cfg.LOG_DIR); ensure_dir(log_dir)
                 evt: Dict[str, Any] = {
                     "event": "chunk_processing_failed",
                     "source": str(src),
@@ -720,10 +1512,13 @@ def process_one(cfg: Config) -> bool:
                     "retries": retry_count,
                     "timestamp": int(time.time()),
                 }
-                (log_dir / "simple_runner.jsonl").open("a").write(json.dumps(evt) + "\n")
+                _log_event(cfg, evt)
             except Exception:
                 pass
             
+            # Stop background extraction before removing the work dir
+            chunk_iter.close()
+
             # Clean up and abort processing this file
             try:
                 shutil.rmtree(work)
@@ -732,11 +1527,16 @@ def process_one(cfg: Config) -> bool:
             
             raise RuntimeError(error_msg)
 
-    # 3) concat with crossfades
-    final_wav = work / "instrumental.wav"
-    print(f"[simple] Merging {len(stems)} stems with crossfades ({cfg.CROSSFADE_MS}ms)")
-    _concat_with_crossfades(stems, final_wav, cfg.CROSSFADE_MS, cfg.FFMPEG_THREADS)
-    print(f"[simple] Crossfade merge complete")
+    # 3) concat with crossfades: overlap-add in memory when possible, else ffmpeg
+    final_wav: Union[Path, _PcmChunk] = work / "instrumental.wav"
+    merged = _overlap_add_stems(stems, cfg.CHUNK_OVERLAP_SEC, final_wav) if len(stems) > 1 and _use_mixer(cfg) else None
+    if merged is not None:
+        print(f"[simple] Merged {len(stems)} stems in memory ({cfg.CHUNK_OVERLAP_SEC * 2:.1f}s overlap-add)")
+        final_wav = merged
+    else:
+        print(f"[simple] Merging {len(stems)} stems with crossfades ({cfg.CROSSFADE_MS}ms)")
+        _concat_with_crossfades(stems, final_wav, cfg.CROSSFADE_MS, cfg.FFMPEG_THREADS, consume=True)
+        print(f"[simple] Crossfade merge complete")
 
     # 4) encode to MP3, tag, embed cover, and move to /music-library/Artist/Album/Title.mp3
     comment = "[INST_DBO__model-htdemucs__sr-44100__bit-16]"
@@ -755,7 +1555,7 @@ def process_one(cfg: Config) -> bool:
     print(f"[simple] Encoding to MP3 ({cfg.MP3_ENCODING.upper()}) and tagging")
     print(f"[simple] Output: {dst.relative_to(music) if dst.is_relative_to(music) else dst}")
     
-    _encode_and_tag(final_wav, dst, comment, cover, cfg.FFMPEG_THREADS, title, artist, album)
+    _encode_and_tag(final_wav, dst, comment, cover, cfg.FFMPEG_THREADS, title, artist, album, cfg)
 
     # mark album active if this job is part of an album
     if job.album_root is not None and not album_lock.exists():
@@ -771,7 +1571,7 @@ def process_one(cfg: Config) -> bool:
         pass
     # 6) if album: if no audio files remain under album_root, remove album root (even if non-audio remains)
     if job.album_root is not None:
-        remaining_audio = any(_is_audio(x) for x in job.album_root.rglob("*"))
+        remaining_audio = next(_iter_audio_paths(job.album_root), None) is not None
         if not remaining_audio:
             try:
                 shutil.rmtree(job.album_root)
@@ -799,7 +1599,7 @@ def process_one(cfg: Config) -> bool:
         "artist": artist,
         "album": album,
         "title": title,
-        "encoding": Config().MP3_ENCODING,
+        "encoding": cfg.MP3_ENCODING,
         "chunk_count": len(stems),
         "crossfade_ms": cfg.CROSSFADE_MS,
         "overlap_sec": cfg.CHUNK_OVERLAP_SEC,
@@ -811,9 +1611,7 @@ def process_one(cfg: Config) -> bool:
         "timestamp": int(time.time()),
     }
     try:
-        log_dir = Path(cfg.LOG_DIR)
-        ensure_dir(log_dir)
-        (log_dir / "simple_runner.jsonl").open("a").write(json.dumps(log) + "\n")
+        _log_event(cfg, log)
     except OSError:
         pass
     
@@ -826,74 +1624,134 @@ def process_one(cfg: Config) -> bool:
     return True
 
 
-def process_one_queue(cfg: Config) -> bool:
-    """
-    Queue-based job processor (Phase 2 refactor).
-    
-    Discovers jobs from queue folders, processes them, generates manifests,
-    and archives the job bundles.
-    """
+@dataclass
+class _QueueJob:
+    queue_type: str
+    bundle: Any
+    working_job: Path
+
+
+# Queue types in the order jobs are taken from them
+_QUEUE_PRIORITY: Final[Tuple[str, ...]] = ("youtube_audio", "other", "youtube_video")
+
+
+def _queue_consumer(cfg: Config) -> Optional[Any]:
     if not QueueConsumer or not ManifestGenerator:
         print("[simple-queue] Queue modules not available; skipping queue processing")
-        return False
-    
-    # Initialize queue consumer
-    queue_folders = {
+        return None
+    return QueueConsumer({
         "youtube_audio": Path(cfg.QUEUE_YOUTUBE_AUDIO),
         "youtube_video": Path(cfg.QUEUE_YOUTUBE_VIDEO),
         "other": Path(cfg.QUEUE_OTHER),
-    }
-    consumer = QueueConsumer(queue_folders)
-    
-    # Discover available jobs
+    })
+
+
+def _claim_next_queue_job(cfg: Config, consumer: Any) -> Optional[_QueueJob]:
+    """
+    Claim the oldest job of the highest-priority non-empty queue into WORKING.
+
+    Bundles that fail to load are archived to fail and skipped. Returns None
+    when nothing is claimable.
+    """
     discovered = consumer.discover_jobs()
-    if not any(discovered.values()):
-        return False  # No jobs available
-    
     # Process in priority order: youtube_audio > other > youtube_video
-    for queue_type in ["youtube_audio", "other", "youtube_video"]:
-        jobs = discovered.get(queue_type, [])
-        if not jobs:
-            continue
-        
-        job_folder = jobs[0]  # Pick oldest
-        print(f"[simple-queue] Discovered {queue_type} job: {job_folder.name}")
-        
-        # Load job bundle
-        bundle = consumer.load_job_bundle(job_folder)
-        if not bundle:
-            print(f"[simple-queue] Failed to load bundle from {job_folder}; archiving to fail")
-            consumer.archive_job(job_folder, Path(cfg.ARCHIVE_DIR), "fail")
-            return True
-        
-        # Claim job (move to working folder)
-        working_dir = Path(cfg.WORKING)
-        working_job = consumer.claim_job(job_folder, working_dir)
-        if not working_job:
-            print(f"[simple-queue] Failed to claim job {job_folder.name}")
-            return False
-        
-        # Process the job based on queue type
+    for queue_type in _QUEUE_PRIORITY:
+        for job_folder in discovered.get(queue_type, []):
+            print(f"[simple-queue] Discovered {queue_type} job: {job_folder.name}")
+            
+            # Load job bundle
+            bundle = consumer.load_job_bundle(job_folder)
+            if not bundle:
+                print(f"[simple-queue] Failed to load bundle from {job_folder}; archiving to fail")
+                consumer.archive_job(job_folder, Path(cfg.ARCHIVE_DIR), "fail")
+                continue
+            
+            # Claim job (move to working folder)
+            working_job = consumer.claim_job(job_folder, Path(cfg.WORKING))
+            if not working_job:
+                print(f"[simple-queue] Failed to claim job {job_folder.name}")
+                return None
+            return _QueueJob(queue_type, bundle, working_job)
+    return None
+
+
+def _run_queue_job(cfg: Config, consumer: Any, job: _QueueJob) -> bool:
+    """Process a claimed job by queue type, then archive its bundle as success/fail."""
+    success = False
+    try:
+        if job.queue_type == "youtube_video":
+            # Just validate and archive video (no processing)
+            success = _process_queue_video_job(job.bundle, job.working_job, cfg)
+        else:
+            # Process audio (with variants if requested)
+            success = _process_queue_audio_job(job.bundle, job.working_job, cfg)
+    
+    except Exception as e:
+        print(f"[simple-queue] Processing failed: {e}")
         success = False
-        try:
-            if queue_type == "youtube_video":
-                # Just validate and archive video (no processing)
-                success = _process_queue_video_job(bundle, working_job, cfg)
-            else:
-                # Process audio (with variants if requested)
-                success = _process_queue_audio_job(bundle, working_job, cfg)
-        
-        except Exception as e:
-            print(f"[simple-queue] Processing failed: {e}")
-            success = False
-        
-        # Archive the job bundle
-        archive_status = "success" if success else "fail"
-        consumer.archive_job(working_job, Path(cfg.ARCHIVE_DIR), archive_status)
-        
-        return success
     
-    return False
+    # Archive the job bundle
+    archive_status = "success" if success else "fail"
+    consumer.archive_job(job.working_job, Path(cfg.ARCHIVE_DIR), archive_status)
+    
+    return success
+
+
+def process_one_queue(cfg: Config) -> bool:
+    """
+    Queue-based job processor (Phase 2 refactor).
+    
+    Discovers jobs from queue folders, processes them, generates manifests,
+    and archives the job bundles.
+    """
+    consumer = _queue_consumer(cfg)
+    if consumer is None:
+        return False
+    job = _claim_next_queue_job(cfg, consumer)
+    if job is None:
+        return False  # No jobs available
+    return _run_queue_job(cfg, consumer, job)
+
+
+def _run_queue_daemon(cfg: Config, parallelism: int, min_interval: float, max_interval: float) -> None:
+    """
+    Daemon loop keeping up to `parallelism` queue jobs in flight.
+
+    Jobs are claimed as soon as a slot frees up. Demucs calls from all jobs
+    share one gate sized like a single job's chunk parallelism, so the
+    separation load matches a serial run while one job's ffmpeg work
+    overlaps another's separation.
+    """
+    global _demucs_gate
+    consumer = _queue_consumer(cfg)
+    if consumer is None:
+        return
+    _demucs_gate = threading.BoundedSemaphore(_demucs_parallel_workers(cfg))
+    print(f"[simple-queue] Running up to {parallelism} queue jobs concurrently")
+    interval = min_interval
+    inflight: set = set()
+    try:
+        with ThreadPoolExecutor(max_workers=parallelism, thread_name_prefix="queue-job") as ex:
+            while True:
+                while len(inflight) < parallelism:
+                    job = _claim_next_queue_job(cfg, consumer)
+                    if job is None:
+                        break
+                    inflight.add(ex.submit(_run_queue_job, cfg, consumer, job))
+                if not inflight:
+                    time.sleep(interval)
+                    interval = min(interval * 2, max_interval)
+                    continue
+                interval = min_interval
+                # With a free slot, look for new jobs again after a short wait
+                timeout = min_interval if len(inflight) < parallelism else None
+                done, pending = wait(inflight, timeout=timeout, return_when=FIRST_COMPLETED)
+                for f in done:
+                    if f.exception() is not None:
+                        print(f"[simple-queue] Job worker crashed: {f.exception()}")
+                inflight = set(pending)
+    finally:
+        _demucs_gate = None
 
 
 def _process_queue_video_job(bundle, working_job: Path, cfg: Config) -> bool:
@@ -911,7 +1769,7 @@ def _process_queue_video_job(bundle, working_job: Path, cfg: Config) -> bool:
     # Copy video file if present
     if bundle.video_path and bundle.video_path.exists():
         dest_video = files_dir / bundle.video_path.name
-        shutil.copy2(bundle.video_path, dest_video)
+        copy_file_fast(bundle.video_path, dest_video)
         print(f"[simple-queue] Archived video: {dest_video}")
         
         # Generate manifest
@@ -939,6 +1797,196 @@ def _process_queue_video_job(bundle, working_job: Path, cfg: Config) -> bool:
     return True
 
 
+def _render_stem_variants(per_stem: Dict[str, List[Path]], wanted: Dict[str, Tuple[Tuple[str, ...], Path]],
+                          crossfade_ms: int, threads: int) -> None:
+    """
+    Crossfade each stem's chunks and sum them into every wanted variant in one ffmpeg run.
+
+    Every chunk file is decoded once: stems used by several variants are fanned
+    out with asplit, and no per-stem merged WAVs are written. Stems are summed
+    with amix normalize=0 so the variant keeps the stems' original level.
+    Raises RuntimeError if ffmpeg fails or the graph would be too large.
+    """
+    cf_s = max(0, crossfade_ms) / 1000.0
+    # A variant that is one stem from one chunk is that chunk's file: link it
+    # outside the graph instead of decoding and re-encoding it
+    wanted = dict(wanted)
+    for name, (stems, out_wav) in list(wanted.items()):
+        if len(stems) == 1 and len(per_stem[stems[0]]) == 1:
+            ensure_dir(out_wav.parent)
+            link_or_copy(per_stem[stems[0]][0], out_wav)
+            del wanted[name]
+    if not wanted:
+        return
+    uses: Dict[str, int] = {}
+    for stems, _ in wanted.values():
+        for stem in stems:
+            uses[stem] = uses.get(stem, 0) + 1
+    cmd = ["ffmpeg", "-y"]
+    links: List[str] = []
+    taps: Dict[str, List[str]] = {}
+    idx = 0
+    for stem, n_uses in uses.items():
+        parts = per_stem[stem]
+        first = idx
+        for part in parts:
+            cmd += ["-i", str(part)]
+        idx += len(parts)
+        label = f"[{first}:a]"
+        for j in range(1, len(parts)):
+            out = f"[{stem}{j}]"
+            links.append(f"{label}[{first + j}:a]acrossfade=d={cf_s:.3f}{out}")
+            label = out
+        if n_uses > 1:
+            taps[stem] = [f"[{stem}_s{k}]" for k in range(n_uses)]
+            links.append(f"{label}asplit={n_uses}{''.join(taps[stem])}")
+        else:
+            taps[stem] = [label]
+    outputs: List[str] = []
+    for name, (stems, out_wav) in wanted.items():
+        ins = [taps[stem].pop() for stem in stems]
+        if len(ins) == 1:
+            links.append(f"{ins[0]}anull[v_{name}]")
+        else:
+            links.append(f"{''.join(ins)}amix=inputs={len(ins)}:duration=longest:normalize=0[v_{name}]")
+        ensure_dir(out_wav.parent)
+        outputs += ["-map", f"[v_{name}]", "-c:a", "pcm_s16le", str(out_wav)]
+    graph = ";".join(links)
+    if len(graph) > _MAX_FILTER_GRAPH_LEN:
+        raise RuntimeError(f"variant filter graph too large ({len(graph)} chars)")
+    cmd += ["-filter_complex", graph]
+    if threads and threads > 0:
+        cmd += ["-threads", str(threads)]
+    cmd += outputs
+    p = _run(cmd)
+    if p.returncode != 0:
+        raise RuntimeError(p.stderr or p.stdout)
+
+
+def _render_stem_variants_separately(per_stem: Dict[str, List[Path]],
+                                     wanted: Dict[str, Tuple[Tuple[str, ...], Path]],
+                                     work: Path, cfg: Config) -> None:
+    """Fallback for _render_stem_variants: merge each stem to a WAV, then mix the variants."""
+    from .variant_generator import StemMixer, VariantGenerator
+    merged: Dict[str, Path] = {}
+    for stems, _ in wanted.values():
+        for stem in stems:
+            if stem in merged:
+                continue
+            if len(per_stem[stem]) == 1:
+                # Single chunk: the chunk's stem file already is the merged stem
+                merged[stem] = per_stem[stem][0]
+            else:
+                merged[stem] = work / f"{stem}_merged.wav"
+                _concat_with_crossfades(per_stem[stem], merged[stem], cfg.CROSSFADE_MS, cfg.FFMPEG_THREADS)
+    known = {name: out for name, (stems, out) in wanted.items()
+             if VariantGenerator.VARIANT_STEMS.get(name) == stems}
+    # All standard variants from one ffmpeg decode of the merged stems; anything
+    # it could not produce (or a non-standard variant) is mixed on its own below
+    done = VariantGenerator.generate_all(merged, known, cfg.FFMPEG_THREADS) if known else {}
+    for name, (stems, out_wav) in wanted.items():
+        if done.get(name):
+            continue
+        if name in known:
+            print(f"[simple-queue] Shared variant render missed {name}; mixing it separately")
+        try:
+            # One stem is hardlinked (or copied) rather than mixed
+            StemMixer.mix_stems({stem: merged[stem] for stem in stems}, out_wav, cfg.FFMPEG_THREADS,
+                                 cfg.SAMPLE_RATE)
+        except Exception as e:
+            print(f"[simple-queue] Failed to generate {name}: {e}")
+
+
+def _demucs_parallel_workers(cfg: Config) -> int:
+    """Concurrent Demucs chunks: DEMUCS_PARALLEL_JOBS, or with 0 one on CUDA / cores per DEMUCS_JOBS on CPU."""
+    n = cfg.DEMUCS_PARALLEL_JOBS
+    if n > 0:
+        return n
+    if cfg.DEMUCS_DEVICE.startswith("cuda"):
+        return 1
+    return max(1, (os.cpu_count() or 1) // max(1, cfg.DEMUCS_JOBS))
+
+
+# Caps concurrent Demucs runs across queue jobs when several are in flight
+# (set by _run_queue_daemon); None means no cross-job limit.
+_demucs_gate: Optional[threading.BoundedSemaphore] = None
+
+
+def _demucs_chunk_with_retry(i: int, c: Path, out_dir: Path, cfg: Config, total: int, timeout_sec: int,
+                             full_stems: bool = False) -> Path:
+    """
+    Separate one chunk, retrying up to DEMUCS_MAX_RETRIES times.
+
+    Returns the stems directory (full_stems) or the accompaniment file.
+    Raises RuntimeError once retries are exhausted.
+    """
+    last_error: Optional[Exception] = None
+    for attempt in range(cfg.DEMUCS_MAX_RETRIES + 1):
+        if attempt > 0:
+            _discard_dir(out_dir, out_dir.parent)  # out_dir is <job work dir>/demucs_NNN
+        try:
+            with _demucs_gate or contextlib.nullcontext():
+                if full_stems:
+                    return _demucs_full_stems(
+                        c, out_dir, cfg.MODEL, cfg.DEMUCS_DEVICE, cfg.DEMUCS_JOBS,
+                        chunk_index=i, total_chunks=total, timeout_sec=timeout_sec,
+                        inprocess=cfg.DEMUCS_INPROCESS, autocast=cfg.DEMUCS_AUTOCAST,
+                    )
+                return _demucs_no_vocals(
+                    c, out_dir, cfg.MODEL, cfg.DEMUCS_DEVICE, cfg.DEMUCS_JOBS,
+                    chunk_index=i, total_chunks=total, timeout_sec=timeout_sec,
+                    inprocess=cfg.DEMUCS_INPROCESS, autocast=cfg.DEMUCS_AUTOCAST,
+                )
+        except TimeoutError as e:
+            last_error = e
+            print(f"[simple-queue] Chunk {i} timed out (retry {attempt})")
+        except Exception as e:
+            last_error = e
+            print(f"[simple-queue] Chunk {i} failed: {e} (retry {attempt})")
+    what = "extract stems from" if full_stems else "process"
+    raise RuntimeError(f"Failed to {what} chunk {i}: {last_error}")
+
+
+def _run_chunks_parallel(fn, chunks: List[Path], workers: int) -> List[Any]:
+    """Apply fn(i, chunk) to every chunk on up to `workers` threads; results keep chunk order."""
+    if workers <= 1 or len(chunks) <= 1:
+        return [fn(i, c) for i, c in enumerate(chunks)]
+    ex = ThreadPoolExecutor(max_workers=min(workers, len(chunks)), thread_name_prefix="demucs")
+    try:
+        return list(ex.map(fn, range(len(chunks)), chunks))
+    finally:
+        ex.shutdown(wait=True, cancel_futures=True)
+
+
+def _queue_work_dir(cfg: Config, job_id: str, est_bytes: int) -> Tuple[Path, bool]:
+    """
+    Working dir for a queue job: (path, on_scratch).
+
+    Prefers cfg.SCRATCH_DIR (tmpfs) so chunk and stem WAVs never touch disk,
+    but only when it has at least twice est_bytes free; otherwise cfg.WORKING.
+    """
+    name = f"queue_{job_id}"
+    scratch = cfg.SCRATCH_DIR
+    if scratch and os.path.isdir(scratch) and os.access(scratch, os.W_OK):
+        try:
+            free = shutil.disk_usage(scratch).free
+        except OSError:
+            free = 0
+        if free >= 2 * est_bytes:
+            return Path(scratch) / name, True
+        print(f"[simple-queue] Scratch {scratch} too small ({free >> 20} MiB free, "
+              f"need {(2 * est_bytes) >> 20} MiB); using {cfg.WORKING}")
+    return Path(cfg.WORKING) / name, False
+
+
+# Queue variant -> (artifact label, filename suffix after "Artist - Title")
+_VARIANT_NAMING: Final[Dict[str, Tuple[str, str]]] = {
+    "instrumental": ("Instrumental", ""),
+    "no_drums": ("Instrumental (no drums)", " (no drums)"),
+    "drums_only": ("Drums only", " (drums only)"),
+}
+
+
 def _process_queue_audio_job(bundle, working_job: Path, cfg: Config) -> bool:
     """
     Process a queue-based audio job (YouTube audio or other sources).
@@ -946,7 +1994,7 @@ def _process_queue_audio_job(bundle, working_job: Path, cfg: Config) -> bool:
     Generates variants: instrumental, no_drums (optional), drums_only (optional)
     """
     # Import variant generator here to avoid circular imports
-    from .variant_generator import VariantGenerator, StemMixer
+    from .variant_generator import StemMixer
     
     if not bundle.audio_path or not bundle.audio_path.exists():
         print(f"[simple-queue] Audio file not found: {bundle.audio_path}")
@@ -960,6 +2008,8 @@ def _process_queue_audio_job(bundle, working_job: Path, cfg: Config) -> bool:
     print(f"[simple-queue] Processing {bundle.source_type} audio: {bundle.title}")
     print(f"[simple-queue] Variant generation: no_drums={cfg.GENERATE_NO_DRUMS_VARIANT}, drums_only={cfg.GENERATE_DRUMS_ONLY_VARIANT}")
     
+    work: Optional[Path] = None
+    on_scratch = False
     try:
         # Run the same processing pipeline as legacy process_one
         # but on the audio file from the bundle
@@ -967,192 +2017,103 @@ def _process_queue_audio_job(bundle, working_job: Path, cfg: Config) -> bool:
         duration = _ffprobe_duration_sec(src)
         plan = _chunk_plan_seconds(duration, chunk_sec=120, overlap_sec=cfg.CHUNK_OVERLAP_SEC)
         
-        work = Path(cfg.WORKING) / f"queue_{bundle.job_id}"
+        # Decide if we need full stems (for variants) or just instrumental
+        need_full_stems = cfg.GENERATE_NO_DRUMS_VARIANT or cfg.GENERATE_DRUMS_ONLY_VARIANT or cfg.PRESERVE_STEMS
+        # Chunks + Demucs outputs (4 stems, or vocals/no_vocals) + variant WAVs, as s16 stereo PCM
+        pcm_bytes = int(duration * cfg.SAMPLE_RATE * 4)
+        work, on_scratch = _queue_work_dir(cfg, bundle.job_id, pcm_bytes * (8 if need_full_stems else 4))
         ensure_dir(work)
         
         print(f"[simple-queue] Audio duration: {duration:.1f}s")
         print(f"[simple-queue] Creating {len(plan)} chunks")
         
-        # Extract chunks
-        chunks: List[Path] = []
-        for i, (start, dur, _, _) in enumerate(plan):
-            cpath = work / f"chunk_{i:03d}.wav"
-            _ffmpeg_extract(src, cpath, start, dur, cfg.SAMPLE_RATE, cfg.FFMPEG_THREADS)
-            chunks.append(cpath)
+        # Extract chunks (one segmenting pass, or concurrent per-chunk runs when they overlap)
+        chunks = _ffmpeg_extract_all(src, work, plan, cfg.SAMPLE_RATE, cfg.FFMPEG_THREADS,
+                                     workers=cfg.FFMPEG_PARALLEL)
         
-        # Decide if we need full stems (for variants) or just instrumental
-        need_full_stems = cfg.GENERATE_NO_DRUMS_VARIANT or cfg.GENERATE_DRUMS_ONLY_VARIANT or cfg.PRESERVE_STEMS
-        max_retries = cfg.DEMUCS_MAX_RETRIES
         chunk_timeout_sec = cfg.DEMUCS_CHUNK_TIMEOUT_SEC if cfg.DEMUCS_CHUNK_TIMEOUT_SEC > 0 else max(600, int(120 * 5))
+        workers = _demucs_parallel_workers(cfg)
+        if workers > 1:
+            print(f"[simple-queue] Running up to {workers} Demucs chunks in parallel")
         
         if need_full_stems:
             print(f"[simple-queue] Using full stem extraction for variant generation")
             # Extract all stems and store them per chunk
-            all_stems = {}  # chunk_index -> {stem_name -> Path}
-            
-            for i, c in enumerate(chunks):
-                out_dir = work / f"demucs_stems_{i:03d}"
-                retry_count = 0
-                success = False
-                last_error = None
-                
-                while retry_count <= max_retries and not success:
-                    try:
-                        if retry_count > 0:
-                            if out_dir.exists():
-                                try:
-                                    shutil.rmtree(out_dir)
-                                except Exception:
-                                    pass
-                        
-                        stems_dir = _demucs_full_stems(
-                            c, out_dir, cfg.MODEL, cfg.DEMUCS_DEVICE, cfg.DEMUCS_JOBS,
-                            chunk_index=i, total_chunks=len(chunks), timeout_sec=chunk_timeout_sec
-                        )
-                        all_stems[i] = StemMixer.get_available_stems(stems_dir)
-                        success = True
-                    
-                    except TimeoutError as e:
-                        last_error = e
-                        print(f"[simple-queue] Chunk {i} timed out (retry {retry_count})")
-                        retry_count += 1
-                    
-                    except Exception as e:
-                        last_error = e
-                        print(f"[simple-queue] Chunk {i} failed: {e} (retry {retry_count})")
-                        retry_count += 1
-                
-                if not success:
-                    raise RuntimeError(f"Failed to extract stems from chunk {i}: {last_error}")
-            
-            # Generate variant files from merged stems
-            variants_generated = {}  # variant_name -> output_path
+            stem_dirs = _run_chunks_parallel(
+                lambda i, c: _demucs_chunk_with_retry(
+                    i, c, work / f"demucs_stems_{i:03d}", cfg, len(chunks), chunk_timeout_sec, full_stems=True
+                ),
+                chunks, workers,
+            )
+            # chunk_index -> {stem_name -> Path}, in chunk order
+            all_stems = {i: StemMixer.get_available_stems(d) for i, d in enumerate(stem_dirs)}
             
-            # 1. Generate instrumental (drums + bass + other)
-            instrumental_wav = work / "instrumental.wav"
-            instrumental_stems = {}
-            for chunk_idx, stems_dict in all_stems.items():
+            # Group per-chunk stem files by stem name, keeping chunk order
+            per_stem: Dict[str, List[Path]] = {}
+            for stems_dict in all_stems.values():
                 for stem_name, stem_path in stems_dict.items():
-                    if stem_name not in instrumental_stems:
-                        instrumental_stems[stem_name] = []
-                    instrumental_stems[stem_name].append(stem_path)
+                    per_stem.setdefault(stem_name, []).append(stem_path)
             
-            # Merge chunks for each stem, then mix for instrumental
-            if all(name in instrumental_stems for name in ["drums", "bass", "other"]):
-                print(f"[simple-queue] Generating instrumental variant")
-                instrumental_merged_stems = {}
-                for stem_name in ["drums", "bass", "other"]:
-                    merged_stem = work / f"{stem_name}_merged.wav"
-                    _concat_with_crossfades(
-                        instrumental_stems[stem_name], merged_stem,
-                        cfg.CROSSFADE_MS, cfg.FFMPEG_THREADS
-                    )
-                    instrumental_merged_stems[stem_name] = merged_stem
-                
-                VariantGenerator.generate_instrumental(
-                    instrumental_merged_stems, instrumental_wav, cfg.FFMPEG_THREADS
-                )
-                variants_generated["instrumental"] = instrumental_wav
-            else:
+            # variant_name -> (stems summed into it, output wav)
+            # 1. instrumental (drums + bass + other) is always produced
+            if not all(name in per_stem for name in ("drums", "bass", "other")):
                 raise RuntimeError("Cannot generate instrumental: missing required stems")
-            
-            # 2. Generate no_drums variant (if enabled)
+            wanted: Dict[str, Tuple[Tuple[str, ...], Path]] = {
+                "instrumental": (("drums", "bass", "other"), work / "instrumental.wav"),
+            }
+            # 2. no_drums variant (if enabled)
             if cfg.GENERATE_NO_DRUMS_VARIANT:
-                if all(name in instrumental_stems for name in ["vocals", "bass", "other"]):
-                    print(f"[simple-queue] Generating no_drums variant")
-                    no_drums_wav = work / "no_drums.wav"
-                    no_drums_merged_stems = {}
-                    for stem_name in ["vocals", "bass", "other"]:
-                        merged_stem = work / f"{stem_name}_merged_nodrum.wav"
-                        _concat_with_crossfades(
-                            instrumental_stems[stem_name], merged_stem,
-                            cfg.CROSSFADE_MS, cfg.FFMPEG_THREADS
-                        )
-                        no_drums_merged_stems[stem_name] = merged_stem
-                    
-                    if VariantGenerator.generate_no_drums(
-                        no_drums_merged_stems, no_drums_wav, cfg.FFMPEG_THREADS
-                    ):
-                        variants_generated["no_drums"] = no_drums_wav
+                if all(name in per_stem for name in ("vocals", "bass", "other")):
+                    wanted["no_drums"] = (("vocals", "bass", "other"), work / "no_drums.wav")
                 else:
                     print(f"[simple-queue] Cannot generate no_drums: missing vocals/bass/other stems")
+            # 3. drums_only variant (if enabled)
+            if cfg.GENERATE_DRUMS_ONLY_VARIANT and "drums" in per_stem:
+                wanted["drums_only"] = (("drums",), work / "drums_only.wav")
             
-            # 3. Generate drums_only variant (if enabled)
-            if cfg.GENERATE_DRUMS_ONLY_VARIANT:
-                if "drums" in instrumental_stems:
-                    print(f"[simple-queue] Generating drums_only variant")
-                    drums_wav = work / "drums_only.wav"
-                    _concat_with_crossfades(
-                        instrumental_stems["drums"], drums_wav,
-                        cfg.CROSSFADE_MS, cfg.FFMPEG_THREADS
-                    )
-                    variants_generated["drums_only"] = drums_wav
+            print(f"[simple-queue] Generating variants: {', '.join(wanted)}")
+            if _use_mixer(cfg) and mixer.render_variants(per_stem, wanted, cfg.CROSSFADE_MS / 1000.0):
+                print(f"[simple-queue] Mixed variants in memory")
+            else:
+                try:
+                    _render_stem_variants(per_stem, wanted, cfg.CROSSFADE_MS, cfg.FFMPEG_THREADS)
+                except (RuntimeError, OSError) as e:
+                    print(f"[simple-queue] Fused variant render failed ({e}); merging stems separately")
+                    _render_stem_variants_separately(per_stem, wanted, work, cfg)
+            variants_generated = {name: out for name, (_, out) in wanted.items()}
         
         else:
             # Fast path: just extract instrumental (no variants)
             print(f"[simple-queue] Using fast path (instrumental only, no variants)")
-            instrumental_stems: List[Path] = []
-            
-            for i, c in enumerate(chunks):
-                out_dir = work / f"demucs_{i:03d}"
-                retry_count = 0
-                success = False
-                last_error = None
-                
-                while retry_count <= max_retries and not success:
-                    try:
-                        if retry_count > 0:
-                            if out_dir.exists():
-                                try:
-                                    shutil.rmtree(out_dir)
-                                except Exception:
-                                    pass
-                        
-                        acc = _demucs_no_vocals(
-                            c, out_dir, cfg.MODEL, cfg.DEMUCS_DEVICE, cfg.DEMUCS_JOBS,
-                            chunk_index=i, total_chunks=len(chunks), timeout_sec=chunk_timeout_sec
-                        )
-                        instrumental_stems.append(acc)
-                        success = True
-                    
-                    except TimeoutError as e:
-                        last_error = e
-                        print(f"[simple-queue] Chunk {i} timed out (retry {retry_count})")
-                        retry_count += 1
-                    
-                    except Exception as e:
-                        last_error = e
-                        print(f"[simple-queue] Chunk {i} failed: {e} (retry {retry_count})")
-                        retry_count += 1
-                
-                if not success:
-                    raise RuntimeError(f"Failed to process chunk {i}: {last_error}")
+            instrumental_stems: List[Path] = _run_chunks_parallel(
+                lambda i, c: _demucs_chunk_with_retry(
+                    i, c, work / f"demucs_{i:03d}", cfg, len(chunks), chunk_timeout_sec
+                ),
+                chunks, workers,
+            )
             
             # Merge stems
             instrumental_wav = work / "instrumental.wav"
-            _concat_with_crossfades(instrumental_stems, instrumental_wav, cfg.CROSSFADE_MS, cfg.FFMPEG_THREADS)
+            merged = (mixer.merge_files(instrumental_stems, cfg.CROSSFADE_MS / 1000.0)
+                      if len(instrumental_stems) > 1 and _use_mixer(cfg) else None)
+            if merged is not None:
+                mixer.write_wav(instrumental_wav, *merged)
+            else:
+                _concat_with_crossfades(instrumental_stems, instrumental_wav, cfg.CROSSFADE_MS, cfg.FFMPEG_THREADS,
+                                        consume=True)
             variants_generated = {"instrumental": instrumental_wav}
         
         # Encode variants to audio files
         artifacts = []
+        base_name = f"{sanitize_filename(bundle.artist)} - {sanitize_filename(bundle.title)}"
         for variant_name, wav_path in variants_generated.items():
             if not wav_path.exists():
                 print(f"[simple-queue] Warning: {variant_name} file not found: {wav_path}")
                 continue
             
             # Build filename with variant suffix
-            if variant_name == "instrumental":
-                variant_label = "Instrumental"
-                filename = f"{sanitize_filename(bundle.artist)} - {sanitize_filename(bundle.title)}.m4a"
-            elif variant_name == "no_drums":
-                variant_label = "Instrumental (no drums)"
-                filename = f"{sanitize_filename(bundle.artist)} - {sanitize_filename(bundle.title)} (no drums).m4a"
-            elif variant_name == "drums_only":
-                variant_label = "Drums only"
-                filename = f"{sanitize_filename(bundle.artist)} - {sanitize_filename(bundle.title)} (drums only).m4a"
-            else:
-                variant_label = variant_name
-                filename = f"{sanitize_filename(bundle.artist)} - {sanitize_filename(bundle.title)} ({variant_name}).m4a"
+            variant_label, suffix = _VARIANT_NAMING.get(variant_name, (variant_name, f" ({variant_name})"))
+            filename = f"{base_name}{suffix}.m4a"
             
             output_audio = files_audio_dir / filename
             
@@ -1161,7 +2122,7 @@ def _process_queue_audio_job(bundle, working_job: Path, cfg: Config) -> bool:
                 wav_path, output_audio,
                 "[INST_QUEUE__model-htdemucs__sr-44100__bit-16]",
                 bundle.cover_path, cfg.FFMPEG_THREADS,
-                bundle.title, bundle.artist, bundle.album
+                bundle.title, bundle.artist, bundle.album, cfg
             )
             
             print(f"[simple-queue] Generated {variant_label}: {filename}")
@@ -1210,9 +2171,16 @@ def _process_queue_audio_job(bundle, working_job: Path, cfg: Config) -> bool:
     except Exception as e:
         print(f"[simple-queue] Processing failed: {e}")
         return False
+    finally:
+        # Scratch lives in RAM: never leave a job's intermediates behind there
+        if on_scratch and work is not None:
+            shutil.rmtree(work, ignore_errors=True)
 
 
 def _pid_is_running(pid: int) -> bool:
+    if sys.platform.startswith("linux"):
+        # One stat, no signal semantics (and no EPERM guesswork for other users' PIDs)
+        return os.path.exists(f"/proc/{pid}")
     try:
         os.kill(pid, 0)
     except ProcessLookupError:
@@ -1223,67 +2191,213 @@ def _pid_is_running(pid: int) -> bool:
     return True
 
 
-def _acquire_singleton_lock(lock_path: Path) -> Optional[int]:
-    """Create a PID lock file. If lock exists and process is alive, return None.
-    If stale, remove and acquire. Returns this process PID on success."""
+# Open fd on the singleton lock file; holding it keeps the flock for this process's lifetime.
+_singleton_lock_fd: Optional[int] = None
+
+
+def _parse_lock_owner(content: str) -> Tuple[str, int]:
+    """(host, pid) from a "hostname:pid" or legacy "pid" lock file; ("", 0) when unparseable."""
+    if ":" in content:
+        # New format hostname:pid
+        host, _, pid_str = content.partition(":")
+        try:
+            return host.strip(), int(pid_str.strip())
+        except ValueError:
+            return host.strip(), 0
+    # Legacy numeric-only format
+    try:
+        return "", int(content or "0")
+    except ValueError:
+        return "", 0
+
+
+def _acquire_singleton_lock(lock_path: Union[str, os.PathLike]) -> Optional[int]:
+    """Take the runner's PID lock. Returns this process PID on success, None if another instance holds it.
+
+    The lock file always exists; ownership is an flock held on it for the life of
+    the process, so two starters can never both win. The hostname:pid content
+    still guards instances on other hosts sharing the state dir, and processes
+    that predate the flock (a live PID recorded in the file).
+    """
+    global _singleton_lock_fd
+    lock_path = os.fspath(lock_path)
     pid = os.getpid()
     host = socket.gethostname()
+    fd = os.open(lock_path, os.O_CREAT | os.O_RDWR, 0o644)
     try:
-        # Attempt atomic create
-        fd = os.open(str(lock_path), os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
-        with os.fdopen(fd, "w") as f:
-            # Write hostname:pid to guard multi-container deployments
-            f.write(f"{host}:{pid}")
-        return pid
-    except FileExistsError:
-        try:
-            content = (lock_path.read_text().strip() or "")
-        except OSError:
-            content = ""
-        existing_pid = 0
-        existing_host = ""
-        if ":" in content:
-            # New format hostname:pid
-            parts = content.split(":", 1)
-            existing_host = parts[0].strip()
-            try:
-                existing_pid = int(parts[1].strip())
-            except (ValueError, IndexError):
-                existing_pid = 0
-        else:
-            # Legacy numeric-only format
+        if fcntl is not None:
             try:
-                existing_pid = int(content or "0")
-            except ValueError:
-                existing_pid = 0
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                # A live runner on this host holds it
+                os.close(fd)
+                return None
+        content = os.read(fd, 4096).decode(errors="replace").strip()
+        existing_host, existing_pid = _parse_lock_owner(content)
         # If the lock is on another host, assume another instance is active
         if existing_host and existing_host != host:
+            os.close(fd)
             return None
-        # If the existing PID matches our own (common with PID 1 reuse), treat as acquired
-        if existing_pid == pid:
-            return pid
-        if existing_pid > 0 and _pid_is_running(existing_pid):
-            return None
-        # Stale lock; try to remove and acquire again
-        try:
-            lock_path.unlink()
-        except OSError:
-            pass
-        try:
-            fd = os.open(str(lock_path), os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
-            with os.fdopen(fd, "w") as f:
-                f.write(f"{host}:{pid}")
-            return pid
-        except FileExistsError:
+        # If the existing PID matches our own (common with PID 1 reuse), treat as acquired;
+        # otherwise a recorded PID that is still alive wins
+        if existing_pid > 0 and existing_pid != pid and _pid_is_running(existing_pid):
+            os.close(fd)
             return None
+        # Free or stale: claim it in place (truncate + write; no unlink/recreate race)
+        os.ftruncate(fd, 0)
+        os.pwrite(fd, f"{host}:{pid}".encode(), 0)
+    except BaseException:
+        os.close(fd)
+        raise
+    if _singleton_lock_fd is not None:
+        os.close(_singleton_lock_fd)
+    _singleton_lock_fd = fd
+    return pid
+
+
+def _release_singleton_lock() -> None:
+    """Empty the lock file and drop the flock. The file is kept so the next starter locks the same inode."""
+    global _singleton_lock_fd
+    if _singleton_lock_fd is None:
+        return
+    try:
+        os.ftruncate(_singleton_lock_fd, 0)
+    except OSError:
+        pass
+    os.close(_singleton_lock_fd)
+    _singleton_lock_fd = None
 
 
 # Public test hook to allow unit tests to exercise lock parsing behavior
-def acquire_singleton_lock_for_tests(lock_path: Path) -> Optional[int]:
+def acquire_singleton_lock_for_tests(lock_path: Union[str, os.PathLike]) -> Optional[int]:
     return _acquire_singleton_lock(lock_path)
 
 
-def _cleanup_stale_working_dirs(working_dir: Path, max_age_seconds: int = 3600) -> int:
+# Directories holding more files than this get their unlinks fanned out to a pool;
+# below it the pool hand-off costs more than the syscalls it hides.
+_RMTREE_PARALLEL_THRESHOLD: Final[int] = 64
+_rmtree_pool: Optional[ThreadPoolExecutor] = None
+_rmtree_pool_lock = threading.Lock()
+
+
+def _rmtree_executor() -> Optional[ThreadPoolExecutor]:
+    """Return the process-wide unlink pool, creating it on first use.
+
+    Parallel unlink is disabled on macOS, where concurrent removal within one
+    directory is known to skip entries.
+    """
+    global _rmtree_pool
+    if platform.system() == "Darwin":
+        return None
+    with _rmtree_pool_lock:
+        if _rmtree_pool is None:
+            _rmtree_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="rmtree")
+    return _rmtree_pool
+
+
+def _unlink_quiet(path: str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def _fast_rmtree(path: Union[str, os.PathLike]) -> None:
+    """Remove a directory tree, ignoring errors like shutil.rmtree(ignore_errors=True).
+
+    Large directories have their files unlinked concurrently, which hides
+    per-unlink latency on network and overlay filesystems.
+    """
+    path = os.fspath(path)
+    files: List[str] = []
+    subdirs: List[str] = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                else:
+                    files.append(entry.path)
+    except OSError:
+        return
+    pool = _rmtree_executor() if len(files) > _RMTREE_PARALLEL_THRESHOLD else None
+    if pool is not None:
+        list(pool.map(_unlink_quiet, files))
+    else:
+        for f in files:
+            _unlink_quiet(f)
+    for sub in subdirs:
+        _fast_rmtree(sub)
+    try:
+        os.rmdir(path)
+    except OSError:
+        pass
+
+
+# Single background worker for trees moved aside by _discard_dir. Kept apart from
+# _rmtree_pool because _fast_rmtree itself maps unlinks onto that pool.
+_trash_pool: Optional[ThreadPoolExecutor] = None
+_TRASH_DIR = ".trash"
+
+
+def _discard_dir(path: Union[str, os.PathLike], job_dir: Union[str, os.PathLike]) -> None:
+    """Get a directory out of the way now and delete it in the background.
+
+    The tree is renamed into a .trash/ dir next to job_dir, the job work dir
+    holding it (a metadata-only rename on the same filesystem), so a retry can
+    reuse the name immediately while the unlinks overlap with whatever runs
+    next. The trash sits outside job_dir so the job's own final rmtree never
+    races the background delete. Falls back to deleting inline if the rename
+    fails.
+    """
+    global _trash_pool
+    path = os.fspath(path)
+    trash_root = os.path.join(os.path.dirname(os.fspath(job_dir)), _TRASH_DIR)
+    trash = os.path.join(trash_root, f"{os.path.basename(path)}-{os.getpid()}-{time.monotonic_ns()}")
+    try:
+        os.makedirs(trash_root, exist_ok=True)
+        os.rename(path, trash)
+    except FileNotFoundError:
+        return
+    except OSError:
+        _fast_rmtree(path)
+        return
+    with _rmtree_pool_lock:
+        if _trash_pool is None:
+            _trash_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="trash")
+    _trash_pool.submit(_fast_rmtree, trash)
+
+
+def _newest_mtime(root: str, cutoff: float) -> Optional[float]:
+    """
+    Newest mtime of anything under root (dirs count too), or None if root is empty.
+
+    Walks with os.scandir and stops at the first entry newer than cutoff, so a
+    live working dir costs a handful of stats instead of a full tree walk.
+    """
+    latest: Optional[float] = None
+    stack = [root]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for e in it:
+                try:
+                    m = e.stat(follow_symlinks=False).st_mtime
+                    if e.is_dir(follow_symlinks=False):
+                        stack.append(e.path)
+                except OSError:
+                    continue
+                if latest is None or m > latest:
+                    latest = m
+                    if m > cutoff:
+                        return m
+    return latest
+
+
+def _cleanup_stale_working_dirs(working_dir: Union[str, os.PathLike], max_age_seconds: int = 3600) -> int:
     """
     Clean up stale working directories on startup.
     
@@ -1293,48 +2407,75 @@ def _cleanup_stale_working_dirs(working_dir: Path, max_age_seconds: int = 3600)
     
     Returns the number of directories cleaned up.
     """
-    if not working_dir.exists():
+    working_dir = os.fspath(working_dir)
+    if not os.path.isdir(working_dir):
         return 0
     
     cleaned = 0
     now = time.time()
     
-    for d in working_dir.iterdir():
-        if not d.is_dir() or not d.name.startswith('simple_'):
-            continue
-        
+    with os.scandir(working_dir) as it:
+        # follow_symlinks=False: a symlinked simple_* entry must never send
+        # _fast_rmtree into its target (shutil.rmtree refused symlinks too)
+        entries = [e for e in it
+                   if e.name[:_SIMPLE_PREFIX_LEN] == _SIMPLE_PREFIX and e.is_dir(follow_symlinks=False)]
+    
+    for entry in entries:
+        d = Path(entry.path)
         try:
-            # Check the last modification time of any file in the directory
-            all_files = list(d.rglob('*'))
-            if not all_files:
+            latest_mtime = _newest_mtime(entry.path, now - max_age_seconds)
+            if latest_mtime is None:
                 # Empty directory, remove it
-                shutil.rmtree(d, ignore_errors=True)
+                _fast_rmtree(entry.path)
                 print(f"[simple] Cleaned up empty working dir: {d.name}")
                 cleaned += 1
                 continue
             
-            latest_mtime = max(f.stat().st_mtime for f in all_files if f.is_file())
             age = now - latest_mtime
             
             if age > max_age_seconds:
                 print(f"[simple] Cleaning up stale working dir (idle {int(age)}s): {d.name}")
-                shutil.rmtree(d, ignore_errors=True)
+                _fast_rmtree(entry.path)
                 cleaned += 1
-        except (OSError, ValueError) as e:
+        except OSError as e:
             print(f"[simple] Warning: could not check/clean {d.name}: {e}")
     
+    # Trees _discard_dir moved aside in an earlier process that exited before its
+    # background delete finished (entries are named <dir>-<pid>-<ns>)
+    pid = str(os.getpid())
+    try:
+        with os.scandir(os.path.join(working_dir, _TRASH_DIR)) as it:
+            leftovers = [e.path for e in it if e.name.rsplit("-", 2)[1:2] != [pid]]
+    except OSError:
+        leftovers = []
+    for path in leftovers:
+        _fast_rmtree(path)
+    
     return cleaned
 
 
+def _config_view(cfg: Config) -> SimpleNamespace:
+    """Snapshot the public settings of cfg into a flat namespace.
+
+    Config exposes some values as properties that re-read the environment; the
+    daemon loop only needs their value at startup, so materialize them once.
+    """
+    return SimpleNamespace(**{k: getattr(cfg, k) for k in dir(cfg) if k.isupper() and not k.startswith("_")})
+
+
 def main(argv: Optional[List[str]] = None):
+    global _incoming_watcher
     cfg = Config()
     # loop once by default; if --daemon, keep processing
     args = sys.argv[1:] if argv is None else argv
     daemon = "--daemon" in args
-    interval = 2
-    state_dir = Path(cfg.DB_PATH).parent
-    ensure_dir(state_dir)
-    singleton_lock = state_dir / "simple_runner.pid"
+    # Idle polling backs off exponentially and snaps back as soon as a job runs
+    min_interval = 2
+    max_interval = 30
+    interval = min_interval
+    state_dir = os.path.dirname(cfg.DB_PATH) or "."
+    os.makedirs(state_dir, exist_ok=True)
+    singleton_lock = os.path.join(state_dir, "simple_runner.pid")
     acquired_pid: Optional[int] = None
     
     # Determine mode: queue or legacy
@@ -1351,29 +2492,46 @@ def main(argv: Optional[List[str]] = None):
                 print("[simple] another instance appears to be running; exiting")
                 return
             # Clean up any stale working directories from previous runs
-            working_dir = Path(os.environ.get("WORKING", cfg.WORKING))
+            working_dir = os.environ.get("WORKING", cfg.WORKING)
             stale_cleaned = _cleanup_stale_working_dirs(working_dir)
             if stale_cleaned > 0:
                 print(f"[simple] Cleaned up {stale_cleaned} stale working director{'y' if stale_cleaned == 1 else 'ies'}")
         
+        if daemon and not use_queue and cfg.INCOMING_WATCH and Observer is not None:
+            ensure_dir(Path(cfg.INCOMING))
+            try:
+                _incoming_watcher = _IncomingWatcher(Path(cfg.INCOMING), cfg.INCOMING_CLOSE_WRITE)
+                print("[simple] Watching incoming for filesystem events")
+            except OSError as e:
+                print(f"[simple] Warning: incoming watcher unavailable ({e}); polling")
+        
+        cfg_view = cast(Config, _config_view(cfg))
+        if daemon and use_queue and cfg.QUEUE_PARALLELISM > 1:
+            _run_queue_daemon(cfg_view, cfg.QUEUE_PARALLELISM, min_interval, max_interval)
+            return
         while True:
             # Use queue-based or legacy processor
             if use_queue:
-                progressed = process_one_queue(cfg)
+                progressed = process_one_queue(cfg_view)
             else:
-                progressed = process_one(cfg)
+                progressed = process_one(cfg_view)
             
             if not daemon:
                 break
-            if not progressed:
+            if progressed:
+                interval = min_interval
+                continue
+            if _incoming_watcher is not None:
+                _incoming_watcher.wait(interval)
+            else:
                 time.sleep(interval)
+            interval = min(interval * 2, max_interval)
     finally:
+        if _incoming_watcher is not None:
+            _incoming_watcher.stop()
+            _incoming_watcher = None
         if acquired_pid is not None:
-            try:
-                if singleton_lock.exists():
-                    singleton_lock.unlink()
-            except OSError:
-                pass
+            _release_singleton_lock()
 
 
 
@@ -1,19 +1,46 @@
-import hashlib, json, os, shutil, subprocess, time
+import errno, hashlib, json, os, shutil, subprocess, threading, time
 from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from .config import Config
 import sys
+try:
+    import fcntl  # POSIX only: reflink ioctl in copy_file_fast
+except ImportError:
+    fcntl = None
 
-def sha256_file(path: Path, bufsize: int = 1024*1024) -> str:
-    h = hashlib.sha256()
+# Linux FICLONE ioctl: share the source's extents (btrfs, xfs, bcachefs) instead of copying bytes
+_FICLONE = 0x40049409
+
+# (path, mtime_ns, size) -> hex digest; artifacts are rehashed only when they change
+_sha256_cache: Dict[Tuple[str, int, int], str] = {}
+_SHA256_CACHE_MAX = 4096
+
+def sha256_file(path: Path, bufsize: int = 4*1024*1024) -> str:
+    st = os.stat(path)
+    key = (os.fspath(path), st.st_mtime_ns, st.st_size)
+    digest = _sha256_cache.get(key)
+    if digest is not None:
+        return digest
     with open(path, "rb") as f:
-        while True:
-            b = f.read(bufsize)
-            if not b: break
-            h.update(b)
-    return h.hexdigest()
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+: hashed in C
+            digest = hashlib.file_digest(f, "sha256").hexdigest()
+        else:
+            # One reusable buffer: readinto + memoryview avoids a bytes object per read
+            h = hashlib.sha256()
+            buf = bytearray(bufsize)
+            mv = memoryview(buf)
+            while True:
+                n = f.readinto(buf)
+                if not n: break
+                h.update(mv[:n])
+            digest = h.hexdigest()
+    if len(_sha256_cache) >= _SHA256_CACHE_MAX:
+        _sha256_cache.pop(next(iter(_sha256_cache)), None)
+    _sha256_cache[key] = digest
+    return digest
 
 @contextmanager
 def advisory_lock(lock_dir: Path, target: Path):
@@ -28,32 +55,84 @@ def advisory_lock(lock_dir: Path, target: Path):
         try: lp.unlink(missing_ok=True)
         except: pass
 
+def _close_write_watch(path: Path):
+    """
+    Start watching path for its writer closing it (inotify IN_CLOSE_WRITE / IN_MOVED_TO).
+
+    Returns (observer, threading.Event) or None when watchdog or inotify is unavailable.
+    """
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+    except ImportError:
+        return None
+    target = os.fspath(path)
+    done = threading.Event()
+
+    class _Handler(FileSystemEventHandler):
+        def on_closed(self, event):
+            if event.src_path == target:
+                done.set()
+
+        def on_moved(self, event):
+            if event.dest_path == target:
+                done.set()
+
+    try:
+        observer = Observer()
+        observer.schedule(_Handler(), os.fspath(path.parent), recursive=False)
+        observer.start()
+    except Exception:
+        return None
+    return observer, done
+
 def wait_until_stable(path: Path, passes: int, delay: int) -> bool:
-    prev = -1
-    for _ in range(passes):
-        size = path.stat().st_size
-        if size == prev:  # stable across consecutive checks
-            return True
-        prev = size
-        time.sleep(delay)
-    # One more final check
-    size = path.stat().st_size
-    return size == prev
+    # On Linux return as soon as the writer closes the file; otherwise (and for
+    # files already complete, which emit no event) fall back to size polling.
+    watch = _close_write_watch(path) if delay > 0 else None
+    try:
+        # Size and mtime together: an appender that pauses on a block boundary
+        # keeps the size but still moves the mtime
+        prev: Optional[Tuple[int, int]] = None
+        for _ in range(passes):
+            st = path.stat()
+            key = (st.st_size, st.st_mtime_ns)
+            if key == prev:  # stable across consecutive checks
+                return True
+            prev = key
+            if watch is not None:
+                if watch[1].wait(delay):
+                    return True
+            else:
+                time.sleep(delay)
+        # One more final check (after the last pass's wait)
+        st = path.stat()
+        return (st.st_size, st.st_mtime_ns) == prev
+    finally:
+        if watch is not None:
+            watch[0].stop()
+            watch[0].join(timeout=1)
 
-def _with_cpu_env(cfg: Optional[Config], extra_env: Optional[Dict[str,str]]=None) -> Dict[str,str]:
+@lru_cache(maxsize=8)
+def _base_env(max_threads: int) -> Dict[str,str]:
+    # Built once per thread cap: the runner never changes its own environment
+    # after startup, and every subprocess spawn would otherwise copy os.environ.
     env = os.environ.copy()
-    if cfg is None:
-        if extra_env:
-            env.update(extra_env)
-        return env
     # Limit thread-hungry libs
-    if cfg.CPU_MAX_THREADS and cfg.CPU_MAX_THREADS > 0:
+    if max_threads > 0:
         for k in ("OMP_NUM_THREADS","OPENBLAS_NUM_THREADS","MKL_NUM_THREADS","NUMEXPR_NUM_THREADS","BLIS_NUM_THREADS"):
-            env[k] = str(cfg.CPU_MAX_THREADS)
+            env[k] = str(max_threads)
+    return env
+
+def _with_cpu_env(cfg: Optional[Config], extra_env: Optional[Dict[str,str]]=None) -> Dict[str,str]:
+    """Environment for a child process. The returned dict may be shared; do not mutate it."""
+    base = _base_env(cfg.CPU_MAX_THREADS if cfg is not None and cfg.CPU_MAX_THREADS else 0)
     # FFmpeg threads handled via -threads flag, but also set env for libraries
     if extra_env:
-        env.update(extra_env)
-    return env
+        return {**base, **extra_env}
+    return base
 
 def _maybe_prefix_with_nice_and_taskset(cmd: List[str], cfg: Optional[Config]) -> List[str]:
     if cfg is None:
@@ -86,30 +165,89 @@ def write_json(p: Path, data):
     p.parent.mkdir(parents=True, exist_ok=True)
     p.write_text(json.dumps(data, indent=2))
 
+_WIN_FORBIDDEN_TABLE = str.maketrans("", "", '\\/:*?"<>|')
+
+@lru_cache(maxsize=4096)
 def sanitize_filename(s: str) -> str:
     # Preserve original names on POSIX; only strip path separators and NULs
     if os.name == "posix":
-        cleaned = s.replace("/", "").replace("\x00", "").strip()
+        if "/" not in s and "\x00" not in s:
+            # Common case: nothing to remove, so skip building new strings
+            cleaned = s.strip()
+        else:
+            cleaned = s.replace("/", "").replace("\x00", "").strip()
         return cleaned or "untitled"
     # On Windows, keep conservative removal list
-    cleaned = "".join(c for c in s if c not in '\\/:*?"<>|').strip()
+    cleaned = s.translate(_WIN_FORBIDDEN_TABLE).strip()
     return cleaned or "untitled"
 
 def safe_move_file(src: Path, dest: Path):
     """Rename with cross-device fallback copy+unlink for files."""
     dest.parent.mkdir(parents=True, exist_ok=True)
     try:
-        src.rename(dest)
+        os.replace(src, dest)
         return
     except OSError as e:
-        if getattr(e, "errno", None) == 18 or "Invalid cross-device link" in str(e):
-            shutil.copy2(src, dest)
+        if e.errno != errno.EXDEV:
+            raise
+    # Cross-device: copyfile uses copy_file_range/sendfile on Linux, so the
+    # bytes never pass through a Python read/write loop
+    shutil.copyfile(src, dest, follow_symlinks=False)
+    try:
+        shutil.copystat(src, dest, follow_symlinks=False)
+    except OSError:
+        pass
+    try:
+        src.unlink()
+    except Exception:
+        pass
+
+def copy_file_fast(src: Path, dst: Path):
+    """
+    shutil.copy2 that keeps the bytes in the kernel.
+
+    Tries a reflink clone (O(1) on copy-on-write filesystems), then
+    os.copy_file_range, and only falls back to shutil.copyfile when neither
+    applies (other OS, old kernel, unsupported filesystem pair).
+    """
+    done = False
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        if fcntl is not None and sys.platform.startswith("linux"):
             try:
-                src.unlink()
-            except Exception:
+                fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+                done = True
+            except OSError:
                 pass
-            return
-        raise
+        if not done and hasattr(os, "copy_file_range"):
+            remaining = os.fstat(fsrc.fileno()).st_size
+            try:
+                while remaining > 0:
+                    n = os.copy_file_range(fsrc.fileno(), fdst.fileno(), min(remaining, 1 << 30))
+                    if n == 0:
+                        break
+                    remaining -= n
+                done = remaining == 0
+            except OSError:
+                done = False
+    if not done:
+        shutil.copyfile(src, dst)
+    shutil.copystat(src, dst)
+
+def link_or_copy(src: Path, dst: Path):
+    """
+    Make dst hold src's bytes: a hardlink when both sit on one filesystem, else a fast copy.
+
+    The two names then share one inode, so neither may be modified in place
+    afterwards (replacing either by rename or unlink is fine).
+    """
+    try:
+        os.unlink(dst)
+    except FileNotFoundError:
+        pass
+    try:
+        os.link(src, dst)
+    except OSError:  # EXDEV, filesystem without hardlinks, ...
+        copy_file_fast(src, dst)
 
 def copytree(src: Path, dst: Path):
     if dst.exists():
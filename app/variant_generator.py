@@ -5,11 +5,72 @@ Generates multiple audio variants (instrumental, no drums, drums only)
 from a single demucs separation job.
 """
 
+import os
+from collections import deque
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional
-import shutil
 
-from .utils import ensure_dir
+from .utils import ensure_dir, link_or_copy
+
+_STEM_NAMES = frozenset(("vocals", "drums", "bass", "other"))
+# Quiet, non-interactive ffmpeg: only errors reach stderr
+_FFMPEG = ("ffmpeg", "-nostdin", "-hide_banner", "-loglevel", "error", "-y")
+
+
+def _run_ffmpeg(cmd: List[str]) -> Optional[str]:
+    """Run ffmpeg; return None on success, else its stderr (decoded only on failure)."""
+    import subprocess
+    
+    result = subprocess.run(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                            stderr=subprocess.PIPE, check=False)
+    if result.returncode == 0:
+        return None
+    return (result.stderr or b"").decode("utf-8", "replace")
+
+
+def _clear_outputs(paths) -> None:
+    """
+    Remove existing output files before ffmpeg writes them.
+    
+    ffmpeg -y truncates an existing output in place; if that output is a hardlink
+    to one of the stems (see link_or_copy), the stem would be truncated with it.
+    """
+    for path in paths:
+        ensure_dir(path.parent)
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+
+def _scan_stems(root: Path) -> Dict[str, Path]:
+    """Breadth-first scandir walk for the four Demucs stems; stops once all are found."""
+    stems: Dict[str, Path] = {}
+    pending = deque([os.fspath(root)])
+    while pending:
+        try:
+            it = os.scandir(pending.popleft())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                        continue
+                    if not entry.is_file(follow_symlinks=False):
+                        continue
+                except OSError:
+                    continue
+                lower = entry.name.lower()
+                if not lower.endswith(".wav"):
+                    continue
+                name = lower.rsplit(".", 1)[0]
+                if name in _STEM_NAMES and name not in stems:
+                    stems[name] = Path(entry.path)
+                    if len(stems) == len(_STEM_NAMES):
+                        return stems
+    return stems
 
 
 class StemMixer:
@@ -24,88 +85,75 @@ class StemMixer:
             Dict mapping stem name -> file path
             Expected stems: vocals, drums, bass, other
         """
-        stems = {}
-        
-        # Look for stem files
-        for candidate_path in demucs_output_dir.rglob("*.wav"):
-            name = candidate_path.stem.lower()
-            # Map common demucs output names
-            if name in ("vocals", "drums", "bass", "other"):
-                stems[name] = candidate_path
-        
-        return stems
+        return _scan_stems(demucs_output_dir)
     
     @staticmethod
-    def mix_stems(stem_paths: Dict[str, Path], output_path: Path, ffmpeg_threads: int = 1):
+    def mix_stems(stem_paths: Dict[str, Path], output_path: Path, ffmpeg_threads: int = 1,
+                  sample_rate: Optional[int] = None):
         """
-        Mix specified stems together using ffmpeg with volume normalization.
+        Mix specified stems together using ffmpeg (straight sum, no 1/N scaling).
         
         Args:
             stem_paths: Dict mapping stem names to file paths
                        e.g. {"drums": path1, "bass": path2}
             output_path: Output WAV file path
             ffmpeg_threads: FFmpeg thread count
+            sample_rate: Output sample rate (default: keep the stems' rate)
         """
-        import subprocess
-        
         if not stem_paths:
             raise ValueError("No stems provided")
         
         if len(stem_paths) == 1:
-            # Single stem - just copy it
+            # Single stem - hardlink (or copy) it; nothing to mix
             source_path = list(stem_paths.values())[0]
-            shutil.copy2(source_path, output_path)
+            link_or_copy(source_path, output_path)
             return
         
-        # Build ffmpeg filter: mix multiple audio streams with amix filter
-        # amix=inputs=N:duration=first:dropout_transition=2
         stems_list = list(stem_paths.values())
         
-        cmd = ["ffmpeg", "-y"]
+        cmd = list(_FFMPEG)
         
         # Add input files
         for stem_path in stems_list:
             cmd.extend(["-i", str(stem_path)])
         
-        # Build filter graph
-        # For 2 stems: [0:a][1:a]amix=inputs=2:duration=first[out]
-        # For 3+ stems: multiple amixes chained
+        # One amix over every input; normalize=0 keeps the stems at their own
+        # level so the mix adds back up to the source instead of 1/N of it
         n_stems = len(stems_list)
-        
-        if n_stems == 2:
-            filter_str = f"[0:a][1:a]amix=inputs=2:duration=first[out]"
-        else:
-            # Chain amix operations
-            filters = []
-            for i in range(n_stems - 1):
-                if i == 0:
-                    filters.append(f"[0:a][1:a]amix=inputs=2:duration=first[mix{i}]")
-                else:
-                    filters.append(f"[mix{i-1}][{i+1}:a]amix=inputs=2:duration=first[mix{i}]")
-            filter_str = ";".join(filters) + f";[mix{n_stems-2}]anequalizer=f=1k:t=h:w=1:g=-10[out]"
-            # Simplified: just use the last mix
-            filter_str = ";".join(filters)
-            # Just mix all with a simple filter
-            filter_str = f"{''.join(f'[{i}:a]' for i in range(n_stems))}amix=inputs={n_stems}:duration=first[out]"
+        inputs = "".join(f"[{i}:a]" for i in range(n_stems))
+        filter_str = f"{inputs}amix=inputs={n_stems}:duration=first:normalize=0[out]"
         
         cmd.extend([
             "-filter_complex", filter_str,
             "-map", "[out]",
             "-c:a", "pcm_s16le",
+            "-ac", "2",
+        ])
+        if sample_rate:
+            cmd.extend(["-ar", str(sample_rate)])
+        cmd.extend([
             "-threads", str(ffmpeg_threads),
             str(output_path),
         ])
         
-        result = subprocess.run(cmd, capture_output=True, text=True, check=False)
-        if result.returncode != 0:
+        _clear_outputs([output_path])
+        err = _run_ffmpeg(cmd)
+        if err is not None:
             raise RuntimeError(
-                f"ffmpeg stem mixing failed: {result.stderr}"
+                f"ffmpeg stem mixing failed: {err}"
             )
 
 
 class VariantGenerator:
     """Generate audio variants from demucs stems."""
     
+    # variant name -> stems summed into it
+    VARIANT_STEMS: Dict[str, Tuple[str, ...]] = {
+        "instrumental": ("drums", "bass", "other"),
+        "no_drums": ("vocals", "bass", "other"),
+        "drums_only": ("drums",),
+    }
+    
     @staticmethod
     def should_generate_instrumental(stems: Dict[str, Path]) -> bool:
         """Check if we can generate instrumental (vocals removed)."""
@@ -210,9 +258,92 @@ class VariantGenerator:
             return False
         
         try:
-            # Drums only = just the drums stem
-            shutil.copy2(stems["drums"], output_path)
+            # Drums only = just the drums stem, hardlinked when possible
+            link_or_copy(stems["drums"], output_path)
             return True
         except Exception as e:
             print(f"Failed to generate drums_only: {e}")
             return False
+    
+    @staticmethod
+    def generate_all(
+        stems: Dict[str, Path],
+        outputs: Dict[str, Path],
+        ffmpeg_threads: int = 1,
+    ) -> Dict[str, bool]:
+        """
+        Generate several variants with a single ffmpeg run.
+        
+        Each needed stem is decoded once and split between the amix branches
+        that use it; single-stem variants (drums_only) are stream-copied.
+        
+        Args:
+            stems: Available stems dict
+            outputs: Dict mapping variant name (see VARIANT_STEMS) -> output WAV path
+            ffmpeg_threads: FFmpeg thread count
+        
+        Returns:
+            Dict mapping variant name -> True if generated
+        """
+        results = {name: False for name in outputs}
+        plan = {
+            name: VariantGenerator.VARIANT_STEMS[name]
+            for name in outputs
+            if name in VariantGenerator.VARIANT_STEMS
+            and all(stem in stems for stem in VariantGenerator.VARIANT_STEMS[name])
+        }
+        if not plan:
+            return results
+        
+        # Input index per stem, in first-use order
+        inputs: Dict[str, int] = {}
+        for stem_names in plan.values():
+            for stem in stem_names:
+                inputs.setdefault(stem, len(inputs))
+        # How many mix branches read each stem (stream-copied variants don't count)
+        uses: Dict[str, int] = {stem: 0 for stem in inputs}
+        for stem_names in plan.values():
+            if len(stem_names) > 1:
+                for stem in stem_names:
+                    uses[stem] += 1
+        
+        cmd = list(_FFMPEG)
+        for stem in inputs:
+            cmd.extend(["-i", str(stems[stem])])
+        
+        filters = []
+        taken: Dict[str, int] = {stem: 0 for stem in inputs}
+        for stem, count in uses.items():
+            if count > 1:
+                labels = "".join(f"[{stem}{k}]" for k in range(count))
+                filters.append(f"[{inputs[stem]}:a]asplit={count}{labels}")
+        
+        def _pad(stem: str) -> str:
+            if uses[stem] > 1:
+                label = f"[{stem}{taken[stem]}]"
+                taken[stem] += 1
+                return label
+            return f"[{inputs[stem]}:a]"
+        
+        outs = []
+        for name, stem_names in plan.items():
+            if len(stem_names) == 1:
+                outs.extend(["-map", f"{inputs[stem_names[0]]}:a", "-c:a", "copy", str(outputs[name])])
+                continue
+            pads = "".join(_pad(stem) for stem in stem_names)
+            filters.append(f"{pads}amix=inputs={len(stem_names)}:duration=first:normalize=0[{name}]")
+            outs.extend(["-map", f"[{name}]", "-c:a", "pcm_s16le", "-ac", "2", str(outputs[name])])
+        
+        _clear_outputs([outputs[name] for name in plan])
+        if filters:
+            cmd.extend(["-filter_complex", ";".join(filters)])
+        cmd.extend(["-threads", str(ffmpeg_threads)])
+        cmd.extend(outs)
+        
+        err = _run_ffmpeg(cmd)
+        if err is not None:
+            print(f"Failed to generate variants: {err}")
+            return results
+        for name in plan:
+            results[name] = True
+        return results
@@ -2,165 +2,79 @@
 import os
 import json
 from pathlib import Path
-from datetime import datetime, timezone
 from flask import Flask, render_template, jsonify, request, send_file, Response
 from werkzeug.utils import secure_filename
 import mimetypes
+from typing import Any, Dict, Tuple
 
 # Import routes
 from app.webui.routes import dashboard, files, processing, logs, storage, nas, youtube, api, settings, nas_monitor
+from app.webui.routes import health_response
 from app.webui.models import ConfigDB
 
-# Try to import youtube_auth (requires google-auth-oauthlib)
-try:
-    from app.webui.routes import youtube_auth
-    HAS_OAUTH = True
-except ImportError:
-    HAS_OAUTH = False
+# Web UI configuration variables: key -> (data type, default when the env var is unset, description)
+CONFIG_SPEC = {
+    # Variant generation settings
+    'GENERATE_NO_DRUMS_VARIANT': ('bool', 'False', 'Generate no drums variant during audio processing'),
+    'GENERATE_DRUMS_ONLY_VARIANT': ('bool', 'False', 'Generate drums only variant during audio processing'),
+    'PRESERVE_STEMS': ('bool', 'False', 'Keep individual stem files in output'),
 
-def _env_bool(key: str, default: bool = False) -> bool:
-    """Parse environment variable as boolean."""
-    value = os.environ.get(key, str(default)).lower()
-    return value in ('true', '1', 'yes', 'on')
+    # Demucs settings
+    'DEMUCS_DEVICE': ('str', 'cpu', 'Device for demucs processing (cpu or cuda)'),
+    'DEMUCS_JOBS': ('int', '1', 'Number of parallel demucs jobs'),
+    'DEMUCS_CHUNK_TIMEOUT_SEC': ('int', '3600', 'Timeout in seconds for demucs chunk processing'),
+    'DEMUCS_MAX_RETRIES': ('int', '2', 'Maximum retries for failed demucs jobs'),
+    'MODEL': ('str', 'htdemucs', 'Demucs model to use for source separation'),
+
+    # Audio processing settings
+    'SAMPLE_RATE': ('int', '44100', 'Output sample rate in Hz'),
+    'CHUNK_OVERLAP_SEC': ('int', '10', 'Overlap duration between audio chunks in seconds'),
+    'CROSSFADE_MS': ('int', '1000', 'Crossfade duration in milliseconds'),
+    'MP3_ENCODING': ('str', 'cbr320', 'MP3 encoding (cbr320, cbr256, vbr9, etc)'),
+
+    # YouTube settings
+    'YTDL_MODE': ('str', 'audio', 'YouTube download mode (audio, video, or both)'),
+    'YTDL_AUDIO_FORMAT': ('str', 'm4a', 'Preferred audio format (m4a, flac, mp3, wav)'),
+    'YTDL_DURATION_TOL_SEC': ('float', '2.0', 'Duration tolerance in seconds'),
+    'YTDL_DURATION_TOL_PCT': ('float', '0.01', 'Duration tolerance as percentage'),
+    'YTDL_FAIL_ON_DURATION_MISMATCH': ('bool', 'True', 'Fail job if duration mismatch detected'),
+
+    # NAS Sync settings
+    'NAS_SYNC_METHOD': ('str', 'rsync', 'NAS sync method (rsync, s3, scp, local)'),
+    'NAS_DRY_RUN': ('bool', 'False', 'Perform dry run without actually syncing'),
+    'NAS_SKIP_ON_MISSING_REMOTE': ('bool', 'True', 'Skip sync if remote destination is not available'),
+    'NAS_POLL_INTERVAL_SEC': ('int', '5', 'Poll interval in seconds for manifest watching'),
+
+    # Queue settings
+    'QUEUE_ENABLED': ('bool', 'False', 'Enable queue-based job processing'),
+}
+
+_PARSERS = {
+    'bool': lambda raw: raw.lower() in ('true', '1', 'yes', 'on'),
+    'int': int,
+    'float': float,
+    'str': str,
+}
+
+def _compute_env_defaults() -> Dict[str, Tuple[Any, str, str]]:
+    """Parse CONFIG_SPEC against the environment: key -> (value, data type, description)."""
+    return {
+        key: (_PARSERS[data_type](os.environ.get(key, default)), data_type, description)
+        for key, (data_type, default, description) in CONFIG_SPEC.items()
+    }
 
 def _init_config_db(db_path: Path) -> ConfigDB:
     """Initialize configuration database with defaults from environment."""
     db = ConfigDB(db_path)
     
-    # Define all configuration variables with their types and descriptions
-    config_vars = {
-        # Variant generation settings
-        'GENERATE_NO_DRUMS_VARIANT': {
-            'value': _env_bool('GENERATE_NO_DRUMS_VARIANT', False),
-            'type': 'bool',
-            'description': 'Generate no drums variant during audio processing'
-        },
-        'GENERATE_DRUMS_ONLY_VARIANT': {
-            'value': _env_bool('GENERATE_DRUMS_ONLY_VARIANT', False),
-            'type': 'bool',
-            'description': 'Generate drums only variant during audio processing'
-        },
-        'PRESERVE_STEMS': {
-            'value': _env_bool('PRESERVE_STEMS', False),
-            'type': 'bool',
-            'description': 'Keep individual stem files in output'
-        },
-        
-        # Demucs settings
-        'DEMUCS_DEVICE': {
-            'value': os.environ.get('DEMUCS_DEVICE', 'cpu'),
-            'type': 'str',
-            'description': 'Device for demucs processing (cpu or cuda)'
-        },
-        'DEMUCS_JOBS': {
-            'value': int(os.environ.get('DEMUCS_JOBS', '1')),
-            'type': 'int',
-            'description': 'Number of parallel demucs jobs'
-        },
-        'DEMUCS_CHUNK_TIMEOUT_SEC': {
-            'value': int(os.environ.get('DEMUCS_CHUNK_TIMEOUT_SEC', '3600')),
-            'type': 'int',
-            'description': 'Timeout in seconds for demucs chunk processing'
-        },
-        'DEMUCS_MAX_RETRIES': {
-            'value': int(os.environ.get('DEMUCS_MAX_RETRIES', '2')),
-            'type': 'int',
-            'description': 'Maximum retries for failed demucs jobs'
-        },
-        'MODEL': {
-            'value': os.environ.get('MODEL', 'htdemucs'),
-            'type': 'str',
-            'description': 'Demucs model to use for source separation'
-        },
-        
-        # Audio processing settings
-        'SAMPLE_RATE': {
-            'value': int(os.environ.get('SAMPLE_RATE', '44100')),
-            'type': 'int',
-            'description': 'Output sample rate in Hz'
-        },
-        'CHUNK_OVERLAP_SEC': {
-            'value': int(os.environ.get('CHUNK_OVERLAP_SEC', '10')),
-            'type': 'int',
-            'description': 'Overlap duration between audio chunks in seconds'
-        },
-        'CROSSFADE_MS': {
-            'value': int(os.environ.get('CROSSFADE_MS', '1000')),
-            'type': 'int',
-            'description': 'Crossfade duration in milliseconds'
-        },
-        'MP3_ENCODING': {
-            'value': os.environ.get('MP3_ENCODING', 'cbr320'),
-            'type': 'str',
-            'description': 'MP3 encoding (cbr320, cbr256, vbr9, etc)'
-        },
-        
-        # YouTube settings
-        'YTDL_MODE': {
-            'value': os.environ.get('YTDL_MODE', 'audio'),
-            'type': 'str',
-            'description': 'YouTube download mode (audio, video, or both)'
-        },
-        'YTDL_AUDIO_FORMAT': {
-            'value': os.environ.get('YTDL_AUDIO_FORMAT', 'm4a'),
-            'type': 'str',
-            'description': 'Preferred audio format (m4a, flac, mp3, wav)'
-        },
-        'YTDL_DURATION_TOL_SEC': {
-            'value': float(os.environ.get('YTDL_DURATION_TOL_SEC', '2.0')),
-            'type': 'float',
-            'description': 'Duration tolerance in seconds'
-        },
-        'YTDL_DURATION_TOL_PCT': {
-            'value': float(os.environ.get('YTDL_DURATION_TOL_PCT', '0.01')),
-            'type': 'float',
-            'description': 'Duration tolerance as percentage'
-        },
-        'YTDL_FAIL_ON_DURATION_MISMATCH': {
-            'value': _env_bool('YTDL_FAIL_ON_DURATION_MISMATCH', True),
-            'type': 'bool',
-            'description': 'Fail job if duration mismatch detected'
-        },
-        
-        # NAS Sync settings
-        'NAS_SYNC_METHOD': {
-            'value': os.environ.get('NAS_SYNC_METHOD', 'rsync'),
-            'type': 'str',
-            'description': 'NAS sync method (rsync, s3, scp, local)'
-        },
-        'NAS_DRY_RUN': {
-            'value': _env_bool('NAS_DRY_RUN', False),
-            'type': 'bool',
-            'description': 'Perform dry run without actually syncing'
-        },
-        'NAS_SKIP_ON_MISSING_REMOTE': {
-            'value': _env_bool('NAS_SKIP_ON_MISSING_REMOTE', True),
-            'type': 'bool',
-            'description': 'Skip sync if remote destination is not available'
-        },
-        'NAS_POLL_INTERVAL_SEC': {
-            'value': int(os.environ.get('NAS_POLL_INTERVAL_SEC', '5')),
-            'type': 'int',
-            'description': 'Poll interval in seconds for manifest watching'
-        },
-        
-        # Queue settings
-        'QUEUE_ENABLED': {
-            'value': _env_bool('QUEUE_ENABLED', False),
-            'type': 'bool',
-            'description': 'Enable queue-based job processing'
-        },
-    }
+    # Parsed once here; reset_to_default reuses them instead of re-reading the environment
+    db.env_defaults = _compute_env_defaults()
     
-    # Set all config values as defaults
-    for key, config in config_vars.items():
-        db.set_config(
-            key=key,
-            value=config['value'],
-            data_type=config['type'],
-            description=config['description'],
-            is_default=True
-        )
+    # Set all config values as defaults (one transaction)
+    db.set_configs_bulk(
+        (key, value, data_type, description, True)
+        for key, (value, data_type, description) in db.env_defaults.items()
+    )
     
     return db
 
@@ -179,6 +93,17 @@ def create_app():
     app.config['QUARANTINE_DIR'] = Path(os.environ.get('QUARANTINE_DIR', '/data/quarantine'))
     app.config['DB_PATH'] = Path(os.environ.get('DB_PATH', '/data/db'))
     app.config['NAS_SYNC_LOG'] = Path(os.environ.get('NAS_SYNC_LOG', '/data/logs/nas_sync.jsonl'))
+    # Job output bundles (manifest.json per job) and queue folders for the status API,
+    # resolved once here rather than from the environment on every request
+    app.config['OUTPUTS_DIR'] = Path(os.environ.get('OUTPUTS_DIR', '/data/outputs'))
+    app.config['QUEUE_ENABLED'] = os.environ.get('QUEUE_ENABLED', 'false').lower() == 'true'
+    app.config['QUEUE_DIRS'] = {
+        'youtube_audio': os.environ.get('QUEUE_YOUTUBE_AUDIO', '/queues/youtube_audio'),
+        'youtube_video': os.environ.get('QUEUE_YOUTUBE_VIDEO', '/queues/youtube_video'),
+        'other': os.environ.get('QUEUE_OTHER', '/queues/other'),
+    }
+    # Seconds /api/status reuses its last result for (0 = read the disk on every poll)
+    app.config['STATUS_CACHE_SEC'] = float(os.environ.get('STATUS_CACHE_SEC', '2'))
     
     # Initialize configuration database
     db_path = app.config['DB_PATH'] / 'webui_config.db'
@@ -196,8 +121,13 @@ def create_app():
     app.register_blueprint(settings.bp)
     app.register_blueprint(nas_monitor.bp)
     
-    # Register OAuth blueprint if available
-    if HAS_OAUTH:
+    # Register OAuth blueprint if available. Imported here rather than at module
+    # level: google-auth-oauthlib is slow to import and optional.
+    try:
+        from app.webui.routes import youtube_auth
+    except ImportError:  # google-auth-oauthlib not installed
+        youtube_auth = None
+    if youtube_auth is not None:
         app.register_blueprint(youtube_auth.bp)
     
     @app.route('/')
@@ -208,7 +138,7 @@ def create_app():
     @app.route('/health')
     def health():
         """Health check endpoint."""
-        return jsonify({'status': 'healthy', 'timestamp': datetime.now(timezone.utc).isoformat()})
+        return health_response()
     
     return app
 
@@ -1,9 +1,18 @@
 """Database models for WebUI configuration and state persistence."""
+import functools
 import json
 import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from app.webui.timeutil import now_iso
+
+# Stored values are only ever read back with json.loads, so skip the padding and \u escapes
+_dumps = functools.partial(json.dumps, ensure_ascii=False, separators=(',', ':'))
+
 
 class ConfigDB:
     """SQLite database for storing user configuration changes."""
@@ -35,28 +44,90 @@ class ConfigDB:
         completed_at TEXT NOT NULL,
         manifest_path TEXT
     );
+    
+    -- get_recent_jobs: ORDER BY completed_at DESC LIMIT n walks this instead of sorting the table
+    CREATE INDEX IF NOT EXISTS idx_completed_jobs_completed_at ON completed_jobs(completed_at DESC);
     """
     
+    # Insert a config row, or update it in place keeping its created_at
+    _UPSERT_CONFIG = """
+    INSERT INTO config (key, value, data_type, description, is_default, created_at, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(key) DO UPDATE SET value = excluded.value, data_type = excluded.data_type,
+        description = excluded.description, is_default = excluded.is_default,
+        updated_at = excluded.updated_at
+    """
+    # Statement texts are fixed constants so each one is parsed once and then served
+    # from the connection's prepared-statement cache (sqlite3 caches by SQL text)
+    _SELECT_CONFIG = "SELECT * FROM config ORDER BY key"
+    _RESET_CONFIG = "UPDATE config SET value = ?, updated_at = ? WHERE key = ?"
+    _UPSERT_QUEUE_STATUS = """
+    INSERT INTO queue_status (queue_name, job_count, last_checked, updated_at)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT(queue_name) DO UPDATE SET job_count = excluded.job_count,
+        last_checked = excluded.last_checked, updated_at = excluded.updated_at
+    """
+    _SELECT_QUEUE_STATUS = "SELECT * FROM queue_status ORDER BY queue_name"
+    _INSERT_COMPLETED_JOB = """
+    INSERT OR REPLACE INTO completed_jobs
+        (job_id, source, job_type, status, created_at, completed_at, manifest_path)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    """
+    _SELECT_RECENT_JOBS = "SELECT * FROM completed_jobs ORDER BY completed_at DESC LIMIT ?"
+    
     def __init__(self, db_path: Path):
         """Initialize database connection and create schema."""
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # key -> (default value, data type, description), parsed from the environment
+        # once; filled by the web app at startup or lazily by reset_to_default
+        self.env_defaults: Dict[str, Tuple[Any, str, str]] = {}
+        # One connection for the life of the object instead of a connect() per call.
+        # Reentrant so a method holding it can call another public method.
+        self._lock = threading.RLock()
+        self._conn = self._get_connection()
+        # Decoded config table, dropped on every config write. Assumes this object is
+        # the only writer of the config table (true for the web UI process).
+        self._config_cache: Optional[Dict[str, Dict[str, Any]]] = None
         self._init_schema()
     
     def _get_connection(self) -> sqlite3.Connection:
-        """Get database connection with row factory."""
-        conn = sqlite3.connect(str(self.db_path))
+        """Open a database connection with row factory and WAL journaling."""
+        conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
         conn.row_factory = sqlite3.Row
+        # WAL: readers don't block the writer; NORMAL sync is durable enough for UI settings
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-8000")
         return conn
     
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Use the shared connection, one caller at a time.
+        
+        Flask serves requests on several threads; the lock keeps their statements
+        and commits from interleaving on the one connection. A failed operation
+        rolls back so it cannot leave a transaction open for the next caller.
+        """
+        with self._lock:
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.rollback()
+                raise
+    
+    def close(self) -> None:
+        """Close the shared connection."""
+        with self._lock:
+            self._conn.close()
+    
     def _init_schema(self):
         """Initialize database schema."""
-        conn = self._get_connection()
-        try:
+        with self._connection() as conn:
             conn.executescript(self.SCHEMA)
             conn.commit()
-        finally:
-            conn.close()
     
     def set_config(
         self,
@@ -76,60 +147,41 @@ class ConfigDB:
             description: Human-readable description
             is_default: Whether this is a default value from .env
         """
-        conn = self._get_connection()
-        try:
-            now = datetime.now(timezone.utc).isoformat()
+        with self._connection() as conn:
+            now = now_iso()
             # Always JSON serialize for consistency, handles all types
-            json_value = json.dumps(value)
-            
-            # Check if key exists
-            cursor = conn.execute("SELECT key FROM config WHERE key = ?", (key,))
-            exists = cursor.fetchone() is not None
+            json_value = _dumps(value)
+            self._config_cache = None
             
-            if exists:
-                conn.execute(
-                    """UPDATE config SET value = ?, data_type = ?, description = ?, 
-                       is_default = ?, updated_at = ? WHERE key = ?""",
-                    (json_value, data_type, description, int(is_default), now, key)
-                )
-            else:
-                conn.execute(
-                    """INSERT INTO config (key, value, data_type, description, is_default, created_at, updated_at)
-                       VALUES (?, ?, ?, ?, ?, ?, ?)""",
-                    (key, json_value, data_type, description, int(is_default), now, now)
-                )
+            conn.execute(
+                self._UPSERT_CONFIG,
+                (key, json_value, data_type, description, int(is_default), now, now)
+            )
             
             conn.commit()
-        finally:
-            conn.close()
     
-    def get_config(self, key: str) -> Optional[Dict[str, Any]]:
-        """Get a configuration value by key."""
-        conn = self._get_connection()
-        try:
-            cursor = conn.execute("SELECT * FROM config WHERE key = ?", (key,))
-            row = cursor.fetchone()
-            
-            if row is None:
-                return None
-            
-            return {
-                'key': row['key'],
-                'value': json.loads(row['value']),
-                'data_type': row['data_type'],
-                'description': row['description'],
-                'is_default': bool(row['is_default']),
-                'created_at': row['created_at'],
-                'updated_at': row['updated_at']
-            }
-        finally:
-            conn.close()
+    def set_configs_bulk(self, rows: Iterable[Tuple[str, Any, str, str, bool]]) -> None:
+        """
+        Set or update many configuration values in one transaction.
+        
+        Args:
+            rows: (key, value, data_type, description, is_default) tuples,
+                  with the same meaning as the set_config arguments
+        """
+        with self._connection() as conn:
+            now = now_iso()
+            params = [
+                (key, _dumps(value), data_type, description, int(is_default), now, now)
+                for key, value, data_type, description, is_default in rows
+            ]
+            self._config_cache = None
+            with conn:
+                conn.executemany(self._UPSERT_CONFIG, params)
     
-    def get_all_config(self) -> Dict[str, Dict[str, Any]]:
-        """Get all configuration values."""
-        conn = self._get_connection()
-        try:
-            cursor = conn.execute("SELECT * FROM config ORDER BY key")
+    def _load_config(self, conn: sqlite3.Connection) -> Dict[str, Dict[str, Any]]:
+        """All config rows keyed by key, from the cache or (on a miss) the table; call under the lock."""
+        if self._config_cache is None:
+            cursor = conn.execute(self._SELECT_CONFIG)
             result = {}
             
             for row in cursor.fetchall():
@@ -142,102 +194,54 @@ class ConfigDB:
                     'updated_at': row['updated_at']
                 }
             
-            return result
-        finally:
-            conn.close()
+            self._config_cache = result
+        return self._config_cache
+    
+    def get_config(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a configuration value by key."""
+        with self._connection() as conn:
+            entry = self._load_config(conn).get(key)
+            if entry is None:
+                return None
+            return {'key': key, **entry}
+    
+    def get_all_config(self) -> Dict[str, Dict[str, Any]]:
+        """Get all configuration values."""
+        with self._connection() as conn:
+            # Copies, so callers can't modify the cached rows
+            return {key: dict(entry) for key, entry in self._load_config(conn).items()}
     
     def reset_to_default(self, key: str) -> bool:
         """Reset a configuration to its default value."""
-        conn = self._get_connection()
-        try:
-            # Get the original default value (where is_default should be 1 initially)
-            # Since we don't track the original default separately, we need a different approach
-            # For now, we'll restore from environment variables if possible
-            cursor = conn.execute("SELECT * FROM config WHERE key = ?", (key,))
-            current_row = cursor.fetchone()
-            
-            if current_row is None:
-                return False
-            
-            # Re-initialize from environment
-            import os
-            from app.webui.app import _env_bool
-            
-            # Map environment variable names to default values
-            env_defaults = {
-                'GENERATE_NO_DRUMS_VARIANT': (lambda: _env_bool('GENERATE_NO_DRUMS_VARIANT', False), 'bool'),
-                'GENERATE_DRUMS_ONLY_VARIANT': (lambda: _env_bool('GENERATE_DRUMS_ONLY_VARIANT', False), 'bool'),
-                'PRESERVE_STEMS': (lambda: _env_bool('PRESERVE_STEMS', False), 'bool'),
-                'DEMUCS_DEVICE': (lambda: os.environ.get('DEMUCS_DEVICE', 'cpu'), 'str'),
-                'DEMUCS_JOBS': (lambda: int(os.environ.get('DEMUCS_JOBS', '1')), 'int'),
-                'DEMUCS_CHUNK_TIMEOUT_SEC': (lambda: int(os.environ.get('DEMUCS_CHUNK_TIMEOUT_SEC', '3600')), 'int'),
-                'DEMUCS_MAX_RETRIES': (lambda: int(os.environ.get('DEMUCS_MAX_RETRIES', '2')), 'int'),
-                'MODEL': (lambda: os.environ.get('MODEL', 'htdemucs'), 'str'),
-                'SAMPLE_RATE': (lambda: int(os.environ.get('SAMPLE_RATE', '44100')), 'int'),
-                'CHUNK_OVERLAP_SEC': (lambda: int(os.environ.get('CHUNK_OVERLAP_SEC', '10')), 'int'),
-                'CROSSFADE_MS': (lambda: int(os.environ.get('CROSSFADE_MS', '1000')), 'int'),
-                'MP3_ENCODING': (lambda: os.environ.get('MP3_ENCODING', 'cbr320'), 'str'),
-                'YTDL_MODE': (lambda: os.environ.get('YTDL_MODE', 'audio'), 'str'),
-                'YTDL_AUDIO_FORMAT': (lambda: os.environ.get('YTDL_AUDIO_FORMAT', 'm4a'), 'str'),
-                'YTDL_DURATION_TOL_SEC': (lambda: float(os.environ.get('YTDL_DURATION_TOL_SEC', '2.0')), 'float'),
-                'YTDL_DURATION_TOL_PCT': (lambda: float(os.environ.get('YTDL_DURATION_TOL_PCT', '0.01')), 'float'),
-                'YTDL_FAIL_ON_DURATION_MISMATCH': (lambda: _env_bool('YTDL_FAIL_ON_DURATION_MISMATCH', True), 'bool'),
-                'NAS_SYNC_METHOD': (lambda: os.environ.get('NAS_SYNC_METHOD', 'rsync'), 'str'),
-                'NAS_DRY_RUN': (lambda: _env_bool('NAS_DRY_RUN', False), 'bool'),
-                'NAS_SKIP_ON_MISSING_REMOTE': (lambda: _env_bool('NAS_SKIP_ON_MISSING_REMOTE', True), 'bool'),
-                'NAS_POLL_INTERVAL_SEC': (lambda: int(os.environ.get('NAS_POLL_INTERVAL_SEC', '5')), 'int'),
-                'QUEUE_ENABLED': (lambda: _env_bool('QUEUE_ENABLED', False), 'bool'),
-            }
-            
-            if key not in env_defaults:
-                return False
-            
-            default_getter, data_type = env_defaults[key]
-            default_value = default_getter()
-            
-            now = datetime.now(timezone.utc).isoformat()
-            json_value = json.dumps(default_value)
-            
-            conn.execute(
-                "UPDATE config SET value = ?, updated_at = ? WHERE key = ?",
-                (json_value, now, key)
-            )
+        # Defaults come from the environment, parsed once rather than per request
+        if not self.env_defaults:
+            from app.webui.app import _compute_env_defaults
+            self.env_defaults = _compute_env_defaults()
+        
+        default = self.env_defaults.get(key)
+        if default is None:
+            return False
+        
+        with self._connection() as conn:
+            self._config_cache = None
+            # No row for the key (never initialised) leaves rowcount at 0
+            cursor = conn.execute(self._RESET_CONFIG, (_dumps(default[0]), now_iso(), key))
             conn.commit()
-            return True
-        finally:
-            conn.close()
+            return cursor.rowcount > 0
     
     def update_queue_status(self, queue_name: str, job_count: int) -> None:
         """Update queue status information."""
-        conn = self._get_connection()
-        try:
-            now = datetime.now(timezone.utc).isoformat()
-            
-            cursor = conn.execute("SELECT queue_name FROM queue_status WHERE queue_name = ?", (queue_name,))
-            exists = cursor.fetchone() is not None
+        with self._connection() as conn:
+            now = now_iso()
             
-            if exists:
-                conn.execute(
-                    """UPDATE queue_status SET job_count = ?, last_checked = ?, updated_at = ?
-                       WHERE queue_name = ?""",
-                    (job_count, now, now, queue_name)
-                )
-            else:
-                conn.execute(
-                    """INSERT INTO queue_status (queue_name, job_count, last_checked, updated_at)
-                       VALUES (?, ?, ?, ?)""",
-                    (queue_name, job_count, now, now)
-                )
+            conn.execute(self._UPSERT_QUEUE_STATUS, (queue_name, job_count, now, now))
             
             conn.commit()
-        finally:
-            conn.close()
     
     def get_queue_status(self) -> Dict[str, Dict[str, Any]]:
         """Get status for all queues."""
-        conn = self._get_connection()
-        try:
-            cursor = conn.execute("SELECT * FROM queue_status ORDER BY queue_name")
+        with self._connection() as conn:
+            cursor = conn.execute(self._SELECT_QUEUE_STATUS)
             result = {}
             
             for row in cursor.fetchall():
@@ -248,8 +252,6 @@ class ConfigDB:
                 }
             
             return result
-        finally:
-            conn.close()
     
     def add_completed_job(
         self,
@@ -269,30 +271,20 @@ class ConfigDB:
             status: Final status (success, failed, skipped)
             manifest_path: Path to manifest.json file
         """
-        conn = self._get_connection()
-        try:
+        with self._connection() as conn:
             now = datetime.now(timezone.utc).isoformat()
             
             conn.execute(
-                """INSERT OR REPLACE INTO completed_jobs 
-                   (job_id, source, job_type, status, created_at, completed_at, manifest_path)
-                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                self._INSERT_COMPLETED_JOB,
                 (job_id, source, job_type, status, now, now, manifest_path)
             )
             
             conn.commit()
-        finally:
-            conn.close()
     
     def get_recent_jobs(self, limit: int = 20) -> list[Dict[str, Any]]:
         """Get recently completed jobs."""
-        conn = self._get_connection()
-        try:
-            cursor = conn.execute(
-                """SELECT * FROM completed_jobs 
-                   ORDER BY completed_at DESC LIMIT ?""",
-                (limit,)
-            )
+        with self._connection() as conn:
+            cursor = conn.execute(self._SELECT_RECENT_JOBS, (limit,))
             result = []
             
             for row in cursor.fetchall():
@@ -307,5 +299,3 @@ class ConfigDB:
                 })
             
             return result
-        finally:
-            conn.close()
@@ -1 +1,33 @@
 """Routes package initialization."""
+from flask import current_app, jsonify
+
+from app.webui.timeutil import utc_now_iso
+
+try:
+    import orjson  # faster, optional
+except ImportError:
+    orjson = None
+
+# Sorted keys like Flask's default JSON provider, so responses are identical either way
+_ORJSON_OPTS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+
+
+_HEALTH_PREFIX = b'{"status":"healthy","timestamp":"'
+_HEALTH_SUFFIX = b'"}\n'
+
+
+def health_response():
+    """{"status": "healthy", "timestamp": ...} for container probes; only the timestamp is built per call."""
+    body = _HEALTH_PREFIX + utc_now_iso().encode('ascii') + _HEALTH_SUFFIX
+    return current_app.response_class(body, mimetype='application/json')
+
+
+def json_response(obj):
+    """jsonify(obj), serialized with orjson when it is installed and can encode obj."""
+    if orjson is not None:
+        try:
+            body = orjson.dumps(obj, option=_ORJSON_OPTS)
+        except TypeError:  # orjson.JSONEncodeError: a type only Flask's provider handles
+            return jsonify(obj)
+        return current_app.response_class(body, mimetype='application/json')
+    return jsonify(obj)
@@ -1,96 +1,222 @@
 """API routes for status and configuration endpoints."""
-from flask import Blueprint, jsonify, request, current_app
+from flask import Blueprint, request, current_app
 from pathlib import Path
-from datetime import datetime, timezone
+import heapq
 import os
 import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from app.webui.routes import health_response, json_response
+from app.webui.timeutil import now_iso
 
 bp = Blueprint('api', __name__, url_prefix='/api')
 
 def _count_queue_items(queue_path: str) -> int:
     """Count items in a queue directory."""
-    path = Path(queue_path)
-    if not path.exists():
+    # Name test first; DirEntry.is_file() answers from the readdir d_type, not a stat
+    try:
+        with os.scandir(queue_path) as it:
+            return sum(1 for e in it if e.name.endswith('.json') and e.is_file())
+    except OSError:
         return 0
-    return len([f for f in path.iterdir() if f.is_file() and f.name.endswith('.json')])
 
-def _get_outputs_info() -> dict:
+def _pid_alive(pid: int) -> bool:
+    """Whether a process with this pid exists (signal 0: one syscall, no /proc lookup)."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:  # exists, owned by another user
+        return True
+    except (OSError, OverflowError):
+        return False
+    return True
+
+# manifest path -> ((mtime_ns, size), parsed manifest or None if not valid JSON); a
+# manifest is parsed again only when it changes. Shared by the status, manifest
+# and artifacts endpoints across request threads, hence the lock. Entries are
+# handed out as-is, so callers must not modify them.
+_manifest_cache: Dict[str, Tuple[Tuple[int, int], Optional[dict]]] = {}
+_manifest_cache_lock = threading.Lock()
+_MANIFEST_CACHE_MAX = 1024
+_MISS = object()
+
+def _parse_manifest(path: str) -> Optional[dict]:
+    """Contents of one manifest.json, or None if it isn't valid JSON; OSError if it can't be read."""
+    with open(path) as f:
+        try:
+            return json.load(f)
+        except json.JSONDecodeError:
+            return None
+
+def _cached_manifest(path: str, key: Tuple[int, int]):
+    """The cached parse of path if it was made at this (mtime_ns, size), else _MISS."""
+    with _manifest_cache_lock:
+        entry = _manifest_cache.get(path)
+    if entry is not None and entry[0] == key:
+        return entry[1]
+    return _MISS
+
+def _store_manifest(path: str, key: Tuple[int, int], manifest: Optional[dict]) -> None:
+    with _manifest_cache_lock:
+        if path not in _manifest_cache and len(_manifest_cache) >= _MANIFEST_CACHE_MAX:
+            _manifest_cache.pop(next(iter(_manifest_cache)), None)
+        _manifest_cache[path] = (key, manifest)
+
+def _load_manifest_cached(path: str, st: Optional[os.stat_result] = None) -> Optional[dict]:
+    """
+    Parsed manifest.json, reusing the last parse while the file's mtime and size
+    are unchanged; None if it is not valid JSON.
+    
+    A missing or unreadable file raises OSError (FileNotFoundError if it is gone)
+    and is not cached, so callers can tell it apart from a bad manifest.
+    """
+    if st is None:
+        st = os.stat(path)
+    key = (st.st_mtime_ns, st.st_size)
+    manifest = _cached_manifest(path, key)
+    if manifest is _MISS:
+        manifest = _parse_manifest(path)
+        _store_manifest(path, key, manifest)
+    return manifest
+
+def _manifest_summary(manifest: dict) -> dict:
+    """The fields of a manifest shown in /api/status."""
+    return {
+        'job_id': manifest.get('job_id'),
+        'source': manifest.get('source'),
+        'job_type': manifest.get('job_type'),
+        'completed_at': manifest.get('timestamp'),
+        'artifacts_count': len(manifest.get('artifacts', []))
+    }
+
+_manifest_pool: Optional[ThreadPoolExecutor] = None
+_manifest_pool_lock = threading.Lock()
+
+def _manifest_executor() -> ThreadPoolExecutor:
+    """Return the pool used to read uncached manifests in parallel, creating it on first use."""
+    global _manifest_pool
+    with _manifest_pool_lock:
+        if _manifest_pool is None:
+            _manifest_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="manifest")
+    return _manifest_pool
+
+def _get_outputs_info(outputs_dir: Path) -> dict:
     """Get information about completed outputs."""
-    outputs_dir = Path(os.environ.get('OUTPUTS_DIR', '/data/outputs'))
-    if not outputs_dir.exists():
+    
+    # <job>/manifest.json for each (non-hidden) job dir, newest first. The stat per
+    # manifest is kept: a job dir's manifest can appear or change without the
+    # outputs dir's own mtime moving, so that alone can't validate a cached listing.
+    manifests = []
+    try:
+        with os.scandir(outputs_dir) as it:
+            for entry in it:
+                if entry.name.startswith('.') or not entry.is_dir():
+                    continue
+                path = os.path.join(entry.path, 'manifest.json')
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                manifests.append((st.st_mtime, path, st))
+    except OSError:
         return {'total': 0, 'recent': []}
     
-    manifests = sorted(outputs_dir.glob('*/manifest.json'), key=lambda p: p.stat().st_mtime, reverse=True)
-    recent = []
+    # Only the newest 20 are listed: a bounded heap instead of sorting every job
+    newest = heapq.nlargest(20, manifests, key=lambda t: t[0])
     
-    for manifest_file in manifests[:20]:
+    # Manifests new or changed since the last poll are read concurrently (on a cold
+    # start over NAS storage that is up to 20 round trips); the cache itself is
+    # only touched from this thread
+    misses = [
+        (path, (st.st_mtime_ns, st.st_size)) for _, path, st in newest
+        if _cached_manifest(path, (st.st_mtime_ns, st.st_size)) is _MISS
+    ]
+    if len(misses) > 1:
+        pool = _manifest_executor()
+        futures = [(path, key, pool.submit(_parse_manifest, path)) for path, key in misses]
+        for path, key, future in futures:
+            try:
+                _store_manifest(path, key, future.result())
+            except OSError:
+                pass  # unreadable: not cached, skipped below
+    
+    recent = []
+    for _, path, st in newest:
         try:
-            with open(manifest_file) as f:
-                manifest = json.load(f)
-                recent.append({
-                    'job_id': manifest.get('job_id'),
-                    'source': manifest.get('source'),
-                    'job_type': manifest.get('job_type'),
-                    'completed_at': manifest.get('timestamp'),
-                    'artifacts_count': len(manifest.get('artifacts', []))
-                })
-        except (json.JSONDecodeError, IOError):
-            pass
+            manifest = _load_manifest_cached(path, st)
+        except OSError:
+            continue
+        if manifest is not None:
+            recent.append(_manifest_summary(manifest))
     
     return {
         'total': len(manifests),
         'recent': recent
     }
 
+def _build_status() -> dict:
+    """Queue counts, recent outputs and runner state, read from disk."""
+    queue_enabled = current_app.config['QUEUE_ENABLED']
+    
+    status = {
+        'timestamp': now_iso(),
+        'queue_enabled': queue_enabled,
+        'queues': {}
+    }
+    
+    if queue_enabled:
+        status['queues'] = {
+            name: _count_queue_items(queue_path)
+            for name, queue_path in current_app.config['QUEUE_DIRS'].items()
+        }
+        status['queues']['total'] = sum(status['queues'].values())
+    
+    # Get outputs info
+    outputs_info = _get_outputs_info(current_app.config['OUTPUTS_DIR'])
+    status['outputs'] = outputs_info
+    
+    # Get processing state (from simple_runner if available)
+    pid_file = Path('/data/db/simple_runner.pid')
+    if pid_file.exists():
+        try:
+            pid = int(pid_file.read_text().strip())
+            status['processing'] = {
+                'pid': pid,
+                'running': _pid_alive(pid)
+            }
+        except (ValueError, IOError):
+            status['processing'] = {'pid': None, 'running': False}
+    else:
+        status['processing'] = {'pid': None, 'running': False}
+    
+    return status
+
 @bp.route('/status', methods=['GET'])
 def get_status():
     """Get current pipeline status including queue counts and recent jobs."""
     try:
-        queue_enabled = os.environ.get('QUEUE_ENABLED', 'false').lower() == 'true'
-        
-        status = {
-            'timestamp': datetime.now(timezone.utc).isoformat(),
-            'queue_enabled': queue_enabled,
-            'queues': {}
-        }
-        
-        if queue_enabled:
-            # Get queue paths
-            youtube_audio_queue = os.environ.get('QUEUE_YOUTUBE_AUDIO', '/queues/youtube_audio')
-            youtube_video_queue = os.environ.get('QUEUE_YOUTUBE_VIDEO', '/queues/youtube_video')
-            other_queue = os.environ.get('QUEUE_OTHER', '/queues/other')
-            
-            status['queues'] = {
-                'youtube_audio': _count_queue_items(youtube_audio_queue),
-                'youtube_video': _count_queue_items(youtube_video_queue),
-                'other': _count_queue_items(other_queue)
-            }
-            status['queues']['total'] = sum(status['queues'].values())
-        
-        # Get outputs info
-        outputs_info = _get_outputs_info()
-        status['outputs'] = outputs_info
-        
-        # Get processing state (from simple_runner if available)
-        pid_file = Path('/data/db/simple_runner.pid')
-        if pid_file.exists():
-            try:
-                pid = int(pid_file.read_text().strip())
-                status['processing'] = {
-                    'pid': pid,
-                    'running': os.path.exists(f'/proc/{pid}')
-                }
-            except (ValueError, IOError):
-                status['processing'] = {'pid': None, 'running': False}
+        # The dashboard polls this; polls within STATUS_CACHE_SEC of the last
+        # disk read reuse its result (per app, so each test app starts cold)
+        ttl = current_app.config['STATUS_CACHE_SEC']
+        cached = current_app.extensions.get('api_status')
+        now = time.monotonic()
+        if cached is not None and now < cached[0]:
+            status = cached[1]
         else:
-            status['processing'] = {'pid': None, 'running': False}
+            status = _build_status()
+            if ttl > 0:
+                current_app.extensions['api_status'] = (now + ttl, status)
         
-        return jsonify(status), 200
+        return json_response(status), 200
     
     except Exception as e:
-        return jsonify({
+        return json_response({
             'error': str(e),
-            'timestamp': datetime.now(timezone.utc).isoformat()
+            'timestamp': now_iso()
         }), 500
 
 @bp.route('/config', methods=['GET'])
@@ -99,13 +225,13 @@ def get_config():
     try:
         db = current_app.config.get('CONFIG_DB')
         if db is None:
-            return jsonify({'error': 'Database not initialized'}), 500
+            return json_response({'error': 'Database not initialized'}), 500
         
         config = db.get_all_config()
-        return jsonify(config), 200
+        return json_response(config), 200
     
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}), 500
 
 @bp.route('/config/<key>', methods=['GET'])
 def get_config_item(key: str):
@@ -113,16 +239,16 @@ def get_config_item(key: str):
     try:
         db = current_app.config.get('CONFIG_DB')
         if db is None:
-            return jsonify({'error': 'Database not initialized'}), 500
+            return json_response({'error': 'Database not initialized'}), 500
         
         config = db.get_config(key)
         if config is None:
-            return jsonify({'error': f'Configuration key not found: {key}'}), 404
+            return json_response({'error': f'Configuration key not found: {key}'}), 404
         
-        return jsonify(config), 200
+        return json_response(config), 200
     
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}), 500
 
 @bp.route('/config/<key>', methods=['PUT'])
 def set_config_item(key: str):
@@ -130,19 +256,19 @@ def set_config_item(key: str):
     try:
         db = current_app.config.get('CONFIG_DB')
         if db is None:
-            return jsonify({'error': 'Database not initialized'}), 500
+            return json_response({'error': 'Database not initialized'}), 500
         
         data = request.get_json()
         if data is None:
-            return jsonify({'error': 'Request body must be JSON'}), 400
+            return json_response({'error': 'Request body must be JSON'}), 400
         
         if 'value' not in data:
-            return jsonify({'error': 'Missing required field: value'}), 400
+            return json_response({'error': 'Missing required field: value'}), 400
         
         # Get current config to preserve metadata
         current = db.get_config(key)
         if current is None:
-            return jsonify({'error': f'Configuration key not found: {key}'}), 404
+            return json_response({'error': f'Configuration key not found: {key}'}), 404
         
         # Update the value
         db.set_config(
@@ -154,14 +280,14 @@ def set_config_item(key: str):
         )
         
         updated = db.get_config(key)
-        return jsonify({
+        return json_response({
             'success': True,
             'config': updated,
             'message': f'Configuration updated: {key}'
         }), 200
     
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}), 500
 
 @bp.route('/config/<key>/reset', methods=['POST'])
 def reset_config_item(key: str):
@@ -169,21 +295,21 @@ def reset_config_item(key: str):
     try:
         db = current_app.config.get('CONFIG_DB')
         if db is None:
-            return jsonify({'error': 'Database not initialized'}), 500
+            return json_response({'error': 'Database not initialized'}), 500
         
         success = db.reset_to_default(key)
         if not success:
-            return jsonify({'error': f'Could not reset {key} to default'}), 400
+            return json_response({'error': f'Could not reset {key} to default'}), 400
         
         config = db.get_config(key)
-        return jsonify({
+        return json_response({
             'success': True,
             'config': config,
             'message': f'Configuration reset to default: {key}'
         }), 200
     
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}), 500
 
 @bp.route('/jobs/recent', methods=['GET'])
 def get_recent_jobs():
@@ -191,64 +317,59 @@ def get_recent_jobs():
     try:
         db = current_app.config.get('CONFIG_DB')
         if db is None:
-            return jsonify({'error': 'Database not initialized'}), 500
+            return json_response({'error': 'Database not initialized'}), 500
         
         limit = request.args.get('limit', 20, type=int)
         if limit > 100:
             limit = 100
         
         jobs = db.get_recent_jobs(limit)
-        return jsonify({'jobs': jobs}), 200
+        return json_response({'jobs': jobs}), 200
     
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}), 500
 
 @bp.route('/health', methods=['GET'])
 def health():
     """Health check endpoint."""
-    return jsonify({
-        'status': 'healthy',
-        'timestamp': datetime.now(timezone.utc).isoformat()
-    }), 200
+    return health_response(), 200
 @bp.route('/jobs/<job_id>/manifest', methods=['GET'])
 def get_job_manifest(job_id):
     """Get manifest for a specific job."""
     try:
-        outputs_dir = Path(os.environ.get('OUTPUTS_DIR', '/data/outputs'))
+        outputs_dir = current_app.config['OUTPUTS_DIR']
         manifest_path = outputs_dir / job_id / 'manifest.json'
         
         if not manifest_path.exists():
-            return jsonify({'error': f'Job {job_id} not found'}), 404
+            return json_response({'error': f'Job {job_id} not found'}), 404
         
         try:
-            with open(manifest_path) as f:
-                manifest = json.load(f)
-            return jsonify(manifest), 200
-        except json.JSONDecodeError:
-            return jsonify({'error': 'Invalid manifest JSON'}), 500
+            manifest = _load_manifest_cached(str(manifest_path))
+        except FileNotFoundError:  # removed since the exists() check
+            return json_response({'error': f'Job {job_id} not found'}), 404
+        if manifest is None:
+            return json_response({'error': 'Invalid manifest JSON'}), 500
+        return json_response(manifest), 200
     
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}), 500
 
 @bp.route('/jobs/<job_id>/artifacts', methods=['GET'])
 def get_job_artifacts(job_id):
     """Get list of artifacts for a job with metadata."""
     try:
-        outputs_dir = Path(os.environ.get('OUTPUTS_DIR', '/data/outputs'))
+        outputs_dir = current_app.config['OUTPUTS_DIR']
         job_dir = outputs_dir / job_id
         
         if not job_dir.exists():
-            return jsonify({'error': f'Job {job_id} not found'}), 404
+            return json_response({'error': f'Job {job_id} not found'}), 404
         
         # Get manifest
         manifest_path = job_dir / 'manifest.json'
-        manifest = {}
-        if manifest_path.exists():
-            try:
-                with open(manifest_path) as f:
-                    manifest = json.load(f)
-            except json.JSONDecodeError:
-                pass
+        try:
+            manifest = _load_manifest_cached(str(manifest_path)) or {}
+        except FileNotFoundError:
+            manifest = {}
         
         # Collect artifact information
         artifacts = []
@@ -287,13 +408,13 @@ def get_job_artifacts(job_id):
         # Sort by type, then name
         artifacts.sort(key=lambda a: (a['type'], a['name']))
         
-        return jsonify({
+        return json_response({
             'job_id': job_id,
-            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'timestamp': now_iso(),
             'total_artifacts': len(artifacts),
             'manifest': manifest,
             'artifacts': artifacts
         }), 200
     
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
\ No newline at end of file
+        return json_response({'error': str(e)}), 500
\ No newline at end of file
@@ -9,14 +9,40 @@ from collections import defaultdict
 bp = Blueprint('dashboard', __name__, url_prefix='/api/dashboard')
 
 
+_AUDIO_EXTS = frozenset({'.mp3', '.flac', '.wav', '.m4a', '.ogg', '.opus', '.aac'})
+_ALBUM_TRACK_EXTS = frozenset({'.mp3', '.flac', '.wav', '.m4a', '.ogg'})
+
+
+def _iter_files_with_ext(directory, exts):
+    """
+    Yield paths (str) of files under directory whose extension is in exts.
+    
+    Like Path.rglob('*') filtered on is_file()/suffix, but each entry's type
+    comes from os.scandir's DirEntry rather than a stat per path. Symlinked
+    dirs are not descended and unreadable dirs are skipped, as with rglob.
+    """
+    stack = [os.fspath(directory)]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif os.path.splitext(entry.name)[1].lower() in exts and entry.is_file():
+                        yield entry.path
+                except OSError:
+                    continue
+
+
 def get_audio_files(directory):
     """Get list of audio files in a directory."""
-    audio_extensions = {'.mp3', '.flac', '.wav', '.m4a', '.ogg', '.opus', '.aac'}
     files = []
     try:
-        for item in Path(directory).rglob('*'):
-            if item.is_file() and item.suffix.lower() in audio_extensions:
-                files.append(item)
+        files = [Path(p) for p in _iter_files_with_ext(directory, _AUDIO_EXTS)]
     except Exception as e:
         current_app.logger.error(f"Error scanning directory {directory}: {e}")
     return files
@@ -64,15 +90,16 @@ def get_stats():
     # Get album folders in incoming
     album_folders = []
     try:
-        for item in incoming_dir.iterdir():
-            if item.is_dir():
-                audio_in_folder = [f for f in item.rglob('*') if f.is_file() and f.suffix.lower() in {'.mp3', '.flac', '.wav', '.m4a', '.ogg'}]
-                if audio_in_folder:
-                    album_folders.append({
-                        'name': item.name,
-                        'tracks': len(audio_in_folder),
-                        'path': str(item)
-                    })
+        with os.scandir(incoming_dir) as it:
+            for item in it:
+                if item.is_dir():
+                    tracks = sum(1 for _ in _iter_files_with_ext(item.path, _ALBUM_TRACK_EXTS))
+                    if tracks:
+                        album_folders.append({
+                            'name': item.name,
+                            'tracks': tracks,
+                            'path': item.path
+                        })
     except Exception as e:
         current_app.logger.error(f"Error scanning albums: {e}")
     
@@ -86,7 +113,11 @@ def get_stats():
     
     # Check if processor is running
     pid_file = current_app.config['DB_PATH'] / 'simple_runner.pid'
-    processor_running = pid_file.exists()
+    # The runner empties (rather than deletes) the lock file on exit
+    try:
+        processor_running = pid_file.stat().st_size > 0
+    except OSError:
+        processor_running = False
     
     stats = {
         'queue': {
@@ -202,7 +202,7 @@ def test_connectivity():
         
         elif method == 'local':
             # Test local path accessibility
-            output_dir = Path(os.environ.get('OUTPUTS_DIR', '/data/outputs'))
+            output_dir = current_app.config['OUTPUTS_DIR']
             is_available = output_dir.exists()
             message = f'Local output directory {"exists" if is_available else "not found"}: {output_dir}'
         
@@ -23,13 +23,20 @@ def get_processor_status():
     try:
         with open(pid_file, 'r') as f:
             pid_info = f.read().strip()
-            # Format is "hostname:pid"
-            if ':' in pid_info:
-                hostname, pid = pid_info.split(':', 1)
-                pid = int(pid)
-            else:
-                pid = int(pid_info)
-                hostname = 'unknown'
+        if not pid_info:
+            # The runner empties (rather than deletes) the lock file on exit
+            return {
+                'running': False,
+                'status': 'stopped',
+                'pid': None
+            }
+        # Format is "hostname:pid"
+        if ':' in pid_info:
+            hostname, pid = pid_info.split(':', 1)
+            pid = int(pid)
+        else:
+            pid = int(pid_info)
+            hostname = 'unknown'
         
         # Check if process is actually running
         try:
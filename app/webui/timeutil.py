@@ -0,0 +1,25 @@
+"""UTC timestamp helpers shared by the web UI routes and models."""
+import time
+from datetime import datetime, timezone
+
+
+def utc_now_iso() -> str:
+    """Current UTC time like datetime.now(timezone.utc).isoformat(), without building a datetime."""
+    now = time.time()
+    return time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(now)) + '.%06d+00:00' % int(now % 1 * 1_000_000)
+
+
+# (epoch second, its isoformat); rebound as one tuple so readers on other
+# threads never see the second of one pair with the text of another
+_now_cache = (0, '')
+
+
+def now_iso() -> str:
+    """Current UTC time to the second (isoformat, +00:00), formatted at most once per second."""
+    global _now_cache
+    t = int(time.time())
+    cached_t, text = _now_cache
+    if cached_t != t:
+        text = datetime.fromtimestamp(t, timezone.utc).isoformat()
+        _now_cache = (t, text)
+    return text
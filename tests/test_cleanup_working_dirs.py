@@ -0,0 +1,130 @@
+import os
+import time
+from pathlib import Path
+
+import app.simple_runner as sr
+
+
+def _age(p: Path, seconds: float):
+    t = time.time() - seconds
+    os.utime(p, (t, t))
+
+
+def test_cleanup_removes_only_stale_simple_dirs(tmp_path: Path):
+    stale = tmp_path / "simple_100"
+    stale.mkdir()
+    (stale / "chunk_000.wav").write_bytes(b"x")
+    _age(stale / "chunk_000.wav", 7200)
+
+    fresh = tmp_path / "simple_200"
+    fresh.mkdir()
+    (fresh / "chunk_000.wav").write_bytes(b"x")
+
+    other = tmp_path / "queue_abc"
+    other.mkdir()
+    (other / "chunk_000.wav").write_bytes(b"x")
+    _age(other / "chunk_000.wav", 7200)
+
+    # A plain file with the prefix must never be touched
+    (tmp_path / "simple_file").write_text("keep")
+
+    cleaned = sr._cleanup_stale_working_dirs(tmp_path, max_age_seconds=3600)
+
+    assert cleaned == 1
+    assert not stale.exists()
+    assert fresh.exists()
+    assert other.exists()
+    assert (tmp_path / "simple_file").exists()
+
+
+def test_cleanup_removes_empty_simple_dir(tmp_path: Path):
+    empty = tmp_path / "simple_300"
+    empty.mkdir()
+    assert sr._cleanup_stale_working_dirs(tmp_path) == 1
+    assert not empty.exists()
+
+
+def test_cleanup_ignores_symlinked_simple_dir(tmp_path: Path):
+    working = tmp_path / "working"
+    working.mkdir()
+    target = tmp_path / "elsewhere"
+    target.mkdir()
+    (target / "keep.wav").write_bytes(b"x")
+    _age(target / "keep.wav", 7200)
+    os.symlink(target, working / "simple_400")
+
+    assert sr._cleanup_stale_working_dirs(working, max_age_seconds=3600) == 0
+    assert (target / "keep.wav").exists()
+    assert (working / "simple_400").is_symlink()
+
+
+def test_cleanup_missing_working_dir(tmp_path: Path):
+    assert sr._cleanup_stale_working_dirs(tmp_path / "nope") == 0
+
+
+def test_fast_rmtree_removes_large_nested_tree(tmp_path: Path):
+    root = tmp_path / "simple_500"
+    big = root / "demucs_000" / "htdemucs" / "chunk_000"
+    big.mkdir(parents=True)
+    for i in range(sr._RMTREE_PARALLEL_THRESHOLD + 10):
+        (big / f"part_{i}.wav").write_bytes(b"x")
+    (root / "chunk_000.wav").write_bytes(b"x")
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    (outside / "keep.txt").write_text("keep")
+    (root / "link").symlink_to(outside)
+
+    sr._fast_rmtree(root)
+
+    assert not root.exists()
+    # Symlinked dirs are unlinked, never followed
+    assert (outside / "keep.txt").exists()
+
+
+def test_newest_mtime_stops_at_first_fresh_entry(tmp_path: Path, monkeypatch):
+    empty = tmp_path / "empty"
+    empty.mkdir()
+    assert sr._newest_mtime(str(empty), 0) is None
+
+    d = tmp_path / "simple_600"
+    (d / "sub").mkdir(parents=True)
+    (d / "sub" / "old.wav").write_bytes(b"x")
+    _age(d / "sub" / "old.wav", 7200)
+    _age(d / "sub", 7200)
+    cutoff = time.time() - 3600
+    assert sr._newest_mtime(str(d), cutoff) < cutoff
+
+    (d / "fresh.wav").write_bytes(b"x")
+    _age(d / "sub", 7200)
+    opened = []
+    real_scandir = os.scandir
+    monkeypatch.setattr(sr.os, "scandir", lambda p: opened.append(p) or real_scandir(p))
+    assert sr._newest_mtime(str(d), cutoff) > cutoff
+    # The fresh file sits at the top level, so "sub" is never opened
+    assert opened == [str(d)]
+
+
+def test_discard_dir_frees_name_and_deletes_in_background(tmp_path: Path):
+    work = tmp_path / "simple_1"
+    d = work / "demucs_000"
+    (d / "htdemucs" / "chunk_000").mkdir(parents=True)
+    (d / "htdemucs" / "chunk_000" / "no_vocals.wav").write_bytes(b"x")
+    sr._discard_dir(d, work)
+    assert not d.exists()
+    # The trash sits beside the job dir, so removing the job dir can't race it
+    assert list(work.iterdir()) == []
+    sr._trash_pool.submit(lambda: None).result()  # drain the single worker
+    assert list((tmp_path / ".trash").iterdir()) == []
+    sr._discard_dir(work / "missing", work)  # no-op
+
+
+def test_cleanup_removes_trash_left_by_other_processes(tmp_path: Path):
+    trash = tmp_path / ".trash"
+    old = trash / "demucs_000-1-123"
+    mine = trash / f"demucs_001-{os.getpid()}-456"
+    for d in (old, mine):
+        d.mkdir(parents=True)
+        (d / "no_vocals.wav").write_bytes(b"x")
+    sr._cleanup_stale_working_dirs(tmp_path)
+    assert not old.exists()
+    assert mine.exists()
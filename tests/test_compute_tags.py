@@ -52,3 +52,65 @@ def test_compute_tags_album_only_folder(tmp_path: Path):
     assert title == "Track"
     assert artist == "Unknown"
     assert album == "LonelyAlbum"
+
+
+def test_probe_cache_keyed_on_size_and_mtime(tmp_path: Path, monkeypatch):
+    import app.simple_runner as sr
+    calls = []
+
+    def fake_probe(p: Path):
+        calls.append(p)
+        return {"artist": "A"}
+
+    monkeypatch.setattr(sr, "_ffprobe_tags_uncached", fake_probe)
+    sr._ffprobe_tags_cached.cache_clear()
+    track = tmp_path / "t.mp3"
+    track.write_bytes(b"x")
+    assert sr._ffprobe_tags(track) == {"artist": "A"}
+    assert sr._ffprobe_tags(track) == {"artist": "A"}
+    assert len(calls) == 1
+    # Rewriting the file changes the key and forces a fresh probe
+    track.write_bytes(b"xy")
+    sr._ffprobe_tags(track)
+    assert len(calls) == 2
+    sr._ffprobe_tags_cached.cache_clear()
+
+
+def test_ffprobe_tags_parses_key_value_output(tmp_path: Path, monkeypatch):
+    import subprocess
+    import app.simple_runner as sr
+    out = "TAG:ARTIST=Some Artist\nTAG:title= A = B \nTAG:album=\nTAG:genre=Rock\n"
+    monkeypatch.setattr(sr, "_run", lambda cmd: subprocess.CompletedProcess(cmd, 0, out, ""))
+    assert sr._ffprobe_tags_uncached(tmp_path / "x.mp3") == {"artist": "Some Artist", "title": "A = B"}
+
+
+def test_prefetch_album_tags_seeds_probe_cache(tmp_path: Path, monkeypatch):
+    import app.simple_runner as sr
+    tracks = [tmp_path / f"{i:02d}.mp3" for i in range(3)]
+    for t in tracks:
+        t.write_bytes(b"x")
+    monkeypatch.setattr(sr, "_read_tags", lambda p: {})
+    monkeypatch.setattr(sr, "_ffprobe_tags_cmd", lambda p: ["echo", f"TAG:title={p.stem}"])
+
+    def no_sync_probe(p):
+        raise AssertionError("should have been prefetched")
+
+    monkeypatch.setattr(sr, "_ffprobe_tags_uncached", no_sync_probe)
+    sr._ffprobe_tags_cached.cache_clear()
+    sr._prefetch_album_tags(tracks)
+    assert [sr._ffprobe_tags(t) for t in tracks] == [{"title": t.stem} for t in tracks]
+    assert not sr._probe_prefetch
+    sr._ffprobe_tags_cached.cache_clear()
+
+
+def test_compute_tags_folder_heuristic_avoids_ffprobe(tmp_path: Path, monkeypatch):
+    import app.simple_runner as sr
+
+    def no_probe(p):
+        raise AssertionError("ffprobe should not run")
+
+    monkeypatch.setattr(sr, "_ffprobe_tags", no_probe)
+    album_root = tmp_path / "incoming" / "Artist - Album"
+    track = album_root / "03 - Song.mp3"
+    touch(track)
+    assert sr._compute_tags(track, album_root) == ("Song", "Artist", "Album")
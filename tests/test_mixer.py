@@ -0,0 +1,42 @@
+import wave
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app import mixer
+
+
+def _write(p: Path, value: int, frames: int, sr: int = 100):
+    with wave.open(str(p), "wb") as w:
+        w.setnchannels(2)
+        w.setsampwidth(2)
+        w.setframerate(sr)
+        w.writeframes(np.full((frames, 2), value, dtype=np.int16).tobytes())
+
+
+def test_render_variants_sums_merged_stems(tmp_path: Path):
+    per_stem = {}
+    for stem, value in (("drums", 100), ("bass", 200), ("other", 300)):
+        per_stem[stem] = [tmp_path / f"{stem}_{i}.wav" for i in range(2)]
+        for p in per_stem[stem]:
+            _write(p, value, 50)
+    wanted = {
+        "instrumental": (("drums", "bass", "other"), tmp_path / "instrumental.wav"),
+        "drums_only": (("drums",), tmp_path / "drums_only.wav"),
+    }
+    assert mixer.render_variants(per_stem, wanted, 0.1) is True
+    data, sr = mixer.read_pcm(tmp_path / "instrumental.wav")
+    # 2 x 50 frames crossfaded over 10 frames; stems summed without 1/N scaling
+    assert sr == 100 and len(data) == 90
+    assert np.all(np.abs(data - 600) <= 1)
+    drums, _ = mixer.read_pcm(tmp_path / "drums_only.wav")
+    assert np.all(np.abs(drums - 100) <= 1)
+
+
+def test_merge_files_rejects_mismatched_rates(tmp_path: Path):
+    a, b = tmp_path / "a.wav", tmp_path / "b.wav"
+    _write(a, 1, 10, sr=100)
+    _write(b, 1, 10, sr=200)
+    assert mixer.merge_files([a, b], 0.01) is None
@@ -56,6 +56,19 @@ def test_config_db():
         assert updated['value'] == 100, f"Expected 100, got {updated['value']}"
         print(f"  ✓ Updated TEST_INT to {updated['value']}")
         
+        # Test bulk upsert (one transaction; keeps created_at of existing keys)
+        print("Testing set_configs_bulk...")
+        created = db.get_config('TEST_STR')['created_at']
+        db.set_configs_bulk([
+            ('TEST_STR', 'bulk', 'str', 'Test string', True),
+            ('TEST_FLOAT', 0.5, 'float', 'Test float', True),
+        ])
+        bulk_str = db.get_config('TEST_STR')
+        assert bulk_str['value'] == 'bulk' and bulk_str['is_default'] is True
+        assert bulk_str['created_at'] == created
+        assert db.get_config('TEST_FLOAT')['value'] == 0.5
+        print("  ✓ Bulk upsert works")
+        
         # Test queue status
         print("Testing queue_status...")
         db.update_queue_status('youtube_audio', 5)
@@ -85,6 +98,226 @@ def test_config_db():
         
     print("✓ All ConfigDB tests passed!\n")
 
+def test_config_db_shared_connection_across_threads(tmp_path):
+    """ConfigDB keeps one WAL connection that request threads can share."""
+    from concurrent.futures import ThreadPoolExecutor
+    
+    db = ConfigDB(tmp_path / 'threads.db')
+    try:
+        mode = db._conn.execute('PRAGMA journal_mode').fetchone()[0]
+        assert mode == 'wal'
+        
+        def work(i):
+            db.set_config(f'KEY_{i}', i, 'int')
+            return db.get_config(f'KEY_{i}')['value']
+        
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            assert list(pool.map(work, range(40))) == list(range(40))
+        assert len(db.get_all_config()) == 40
+        # The lock is reentrant: a holder can still call the public methods
+        with db._connection():
+            assert db.get_config('KEY_0')['value'] == 0
+    finally:
+        db.close()
+
+def test_config_db_cache_invalidated_on_write(tmp_path):
+    """Config reads are served from memory until the next write."""
+    db = ConfigDB(tmp_path / 'cache.db')
+    try:
+        db.set_config('A', 1, 'int')
+        assert db.get_all_config()['A']['value'] == 1
+        assert db._config_cache is not None
+        # Callers get copies; mutating them leaves the cache intact
+        db.get_all_config()['A']['value'] = 99
+        db.get_config('A')['value'] = 99
+        assert db.get_config('A')['value'] == 1
+        db.set_config('A', 2, 'int')
+        assert db._config_cache is None
+        assert db.get_config('A')['value'] == 2
+        db.set_configs_bulk([('B', 'x', 'str', '', True)])
+        assert set(db.get_all_config()) == {'A', 'B'}
+        assert db.get_config('missing') is None
+    finally:
+        db.close()
+
+def test_config_db_reset_to_default(tmp_path):
+    """Resets restore the parsed env default; unknown or missing keys are refused."""
+    db = ConfigDB(tmp_path / 'reset.db')
+    try:
+        db.env_defaults = {'A': (1, 'int', ''), 'NOT_STORED': ('x', 'str', '')}
+        db.set_config('A', 5, 'int')
+        assert db.reset_to_default('A') is True
+        assert db.get_config('A')['value'] == 1
+        assert db.reset_to_default('UNKNOWN') is False
+        assert db.reset_to_default('NOT_STORED') is False
+        assert db.get_config('NOT_STORED') is None
+    finally:
+        db.close()
+
+def test_config_values_stored_compact(tmp_path):
+    """Values are stored as compact, unescaped JSON and read back unchanged."""
+    db = ConfigDB(tmp_path / 'compact.db')
+    try:
+        value = {'names': ['Beyoncé', 'Sigur Rós'], 'n': 1}
+        db.set_config('J', value, 'json')
+        raw = db._conn.execute("SELECT value FROM config WHERE key = 'J'").fetchone()[0]
+        assert raw == '{"names":["Beyoncé","Sigur Rós"],"n":1}'
+        assert db.get_config('J')['value'] == value
+    finally:
+        db.close()
+
+def test_recent_jobs_use_completed_at_index(tmp_path):
+    """get_recent_jobs reads newest-first from the completed_at index."""
+    db = ConfigDB(tmp_path / 'jobs.db')
+    try:
+        for i in range(3):
+            db.add_completed_job(f'job-{i}', 'youtube', 'audio', 'success')
+        plan = db._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM completed_jobs ORDER BY completed_at DESC LIMIT 2"
+        ).fetchall()
+        assert any('idx_completed_jobs_completed_at' in row[-1] for row in plan)
+        assert not any('TEMP B-TREE' in row[-1] for row in plan)
+        assert len(db.get_recent_jobs(2)) == 2
+    finally:
+        db.close()
+
+def test_outputs_info_parses_each_manifest_once(tmp_path, monkeypatch):
+    """/api/status reuses parsed manifests until they change."""
+    from app.webui.routes import api
+    monkeypatch.setattr(api, '_manifest_cache', {})
+    for i in range(3):
+        job = tmp_path / f'job-{i}'
+        job.mkdir()
+        (job / 'manifest.json').write_text(json.dumps({'job_id': f'job-{i}', 'artifacts': [1, 2]}))
+        os.utime(job / 'manifest.json', (1000 + i, 1000 + i))
+    (tmp_path / 'no-manifest').mkdir()
+    
+    loads = []
+    real_load = api.json.load
+    monkeypatch.setattr(api.json, 'load', lambda f: loads.append(f.name) or real_load(f))
+    info = api._get_outputs_info(tmp_path)
+    assert info['total'] == 3
+    assert [r['job_id'] for r in info['recent']] == ['job-2', 'job-1', 'job-0']
+    assert info['recent'][0]['artifacts_count'] == 2
+    assert len(loads) == 3
+    
+    api._get_outputs_info(tmp_path)
+    assert len(loads) == 3
+    (tmp_path / 'job-0' / 'manifest.json').write_text(json.dumps({'job_id': 'job-0b'}))
+    info = api._get_outputs_info(tmp_path)
+    assert len(loads) == 4
+    assert info['recent'][0]['job_id'] == 'job-0b'
+
+def test_outputs_info_reads_uncached_manifests_in_pool(tmp_path, monkeypatch):
+    """Cold manifests are parsed on the manifest pool; results keep newest-first order."""
+    import threading
+    from app.webui.routes import api
+    monkeypatch.setattr(api, '_manifest_cache', {})
+    for i in range(5):
+        job = tmp_path / f'job-{i}'
+        job.mkdir()
+        (job / 'manifest.json').write_text(json.dumps({'job_id': f'job-{i}'}))
+        os.utime(job / 'manifest.json', (1000 + i, 1000 + i))
+    
+    threads = []
+    real_parse = api._parse_manifest
+    monkeypatch.setattr(api, '_parse_manifest',
+                        lambda p: threads.append(threading.current_thread().name) or real_parse(p))
+    info = api._get_outputs_info(tmp_path)
+    assert [r['job_id'] for r in info['recent']] == [f'job-{i}' for i in range(4, -1, -1)]
+    assert len(threads) == 5
+    assert all(name.startswith('manifest') for name in threads)
+
+def test_status_reused_within_cache_window(tmp_path, monkeypatch):
+    """Polls inside STATUS_CACHE_SEC reuse the last status; 0 disables the reuse."""
+    monkeypatch.setenv('DB_PATH', str(tmp_path / 'db'))
+    monkeypatch.setenv('OUTPUTS_DIR', str(tmp_path / 'outputs'))
+    (tmp_path / 'outputs').mkdir()
+    
+    def add_job(name):
+        (tmp_path / 'outputs' / name).mkdir()
+        (tmp_path / 'outputs' / name / 'manifest.json').write_text(json.dumps({'job_id': name}))
+    
+    monkeypatch.setenv('STATUS_CACHE_SEC', '60')
+    client = create_app().test_client()
+    add_job('a')
+    assert client.get('/api/status').get_json()['outputs']['total'] == 1
+    add_job('b')
+    assert client.get('/api/status').get_json()['outputs']['total'] == 1
+    
+    monkeypatch.setenv('STATUS_CACHE_SEC', '0')
+    client = create_app().test_client()
+    assert client.get('/api/status').get_json()['outputs']['total'] == 2
+    add_job('c')
+    assert client.get('/api/status').get_json()['outputs']['total'] == 3
+
+def test_job_manifest_endpoints_share_manifest_cache(tmp_path, monkeypatch):
+    """/api/jobs/<id>/manifest and /artifacts parse manifest.json once per change."""
+    from app.webui.routes import api
+    monkeypatch.setattr(api, '_manifest_cache', {})
+    monkeypatch.setenv('DB_PATH', str(tmp_path / 'db'))
+    monkeypatch.setenv('OUTPUTS_DIR', str(tmp_path / 'outputs'))
+    manifest_file = tmp_path / 'outputs' / 'job-1' / 'manifest.json'
+    manifest_file.parent.mkdir(parents=True)
+    manifest_file.write_text(json.dumps({'job_id': 'job-1'}))
+    client = create_app().test_client()
+    
+    loads = []
+    real_load = api.json.load
+    monkeypatch.setattr(api.json, 'load', lambda f: loads.append(f.name) or real_load(f))
+    assert client.get('/api/jobs/job-1/manifest').get_json() == {'job_id': 'job-1'}
+    assert client.get('/api/jobs/job-1/artifacts').get_json()['manifest'] == {'job_id': 'job-1'}
+    assert len(loads) == 1
+    
+    manifest_file.write_text(json.dumps({'job_id': 'job-1', 'artifacts': []}))
+    assert client.get('/api/jobs/job-1/manifest').get_json()['artifacts'] == []
+    assert len(loads) == 2
+    
+    manifest_file.write_text('{not json')
+    assert client.get('/api/jobs/job-1/manifest').status_code == 500
+    assert client.get('/api/jobs/job-1/artifacts').get_json()['manifest'] == {}
+    assert client.get('/api/jobs/missing/manifest').status_code == 404
+    
+    # Read errors are reported as such (and never cached), not as invalid JSON
+    (tmp_path / 'outputs' / 'job-2' / 'manifest.json').mkdir(parents=True)
+    response = client.get('/api/jobs/job-2/manifest')
+    assert response.status_code == 500
+    assert response.get_json()['error'] != 'Invalid manifest JSON'
+    # Deleted between the endpoint's exists() check and the loader's stat
+    from types import SimpleNamespace
+    def vanished(path):
+        raise FileNotFoundError(path)
+    monkeypatch.setattr(api, 'os', SimpleNamespace(stat=vanished))
+    assert client.get('/api/jobs/job-1/manifest').status_code == 404
+
+def test_json_response_matches_jsonify():
+    """API responses decode to the same JSON whichever encoder is used."""
+    from flask import Flask, jsonify
+    from app.webui.routes import json_response
+    
+    app = Flask(__name__)
+    payload = {'b': [1, 2.5, None], 'a': {'nested': True}, 'text': 'é'}
+    with app.app_context():
+        fast = json_response(payload)
+        assert fast.mimetype == 'application/json'
+        assert json.loads(fast.get_data()) == json.loads(jsonify(payload).get_data())
+
+def test_pid_alive():
+    """Status liveness check uses signal 0 instead of /proc."""
+    from app.webui.routes.api import _pid_alive
+    assert _pid_alive(os.getpid()) is True
+    assert _pid_alive(2 ** 22 + 12345) is False
+
+def test_count_queue_items(tmp_path):
+    """Queue counts include only *.json files."""
+    from app.webui.routes.api import _count_queue_items
+    (tmp_path / 'a.json').write_text('{}')
+    (tmp_path / 'b.json').write_text('{}')
+    (tmp_path / 'c.txt').write_text('')
+    (tmp_path / 'd.json').mkdir()
+    assert _count_queue_items(str(tmp_path)) == 2
+    assert _count_queue_items(str(tmp_path / 'missing')) == 0
+
 def test_flask_app_initialization():
     """Test Flask app initialization with database using actual pipeline directories."""
     print("\n=== Testing Flask App Initialization ===")
@@ -146,6 +379,9 @@ def test_api_endpoints():
     assert response.status_code == 200, f"Expected 200, got {response.status_code}"
     data = json.loads(response.data)
     assert data['status'] == 'healthy', "Health check failed"
+    assert datetime.fromisoformat(data['timestamp']).utcoffset().total_seconds() == 0
+    assert response.mimetype == 'application/json'
+    assert json.loads(client.get('/health').data)['status'] == 'healthy'
     print(f"  ✓ Health check: {data['status']}")
     
     # Test /api/status
@@ -204,6 +440,61 @@ def test_api_endpoints():
     
     print("✓ All API endpoint tests passed!\n")
 
+def test_now_iso_second_granularity_and_cached(monkeypatch):
+    from app.webui import timeutil
+    monkeypatch.setattr(timeutil.time, 'time', lambda: 1700000000.75)
+    first = timeutil.now_iso()
+    assert first == '2023-11-14T22:13:20+00:00'
+    assert timeutil.now_iso() is first
+
+def test_app_module_does_not_import_oauth():
+    """google-auth-oauthlib is only imported by create_app, not by importing the module."""
+    import subprocess
+    code = "import sys, app.webui.app; print('app.webui.routes.youtube_auth' in sys.modules)"
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                         cwd=Path(__file__).resolve().parent.parent, check=True)
+    assert out.stdout.strip() == 'False'
+
+def test_dashboard_audio_scan_matches_rglob(tmp_path, monkeypatch):
+    """The scandir walk finds the same audio files as rglob, and feeds /stats album counts."""
+    from app.webui.routes import dashboard
+    incoming = tmp_path / 'incoming'
+    (incoming / 'Album' / 'CD2').mkdir(parents=True)
+    (incoming / 'Empty').mkdir()
+    (incoming / 'single.MP3').write_bytes(b'x')
+    (incoming / 'notes.txt').write_bytes(b'x')
+    (incoming / 'Album' / '01.flac').write_bytes(b'x')
+    (incoming / 'Album' / 'CD2' / '02.opus').write_bytes(b'x')
+    (incoming / 'Album' / 'CD2' / '03.wav').write_bytes(b'x')
+    (incoming / 'Album' / 'dir.mp3').mkdir()
+    
+    expected = sorted(p for p in incoming.rglob('*')
+                      if p.is_file() and p.suffix.lower() in dashboard._AUDIO_EXTS)
+    from flask import Flask
+    with Flask(__name__).app_context():
+        assert sorted(dashboard.get_audio_files(incoming)) == expected
+        assert dashboard.get_audio_files(tmp_path / 'missing') == []
+    
+    monkeypatch.setenv('DB_PATH', str(tmp_path / 'db'))
+    monkeypatch.setenv('INCOMING_DIR', str(incoming))
+    stats = create_app().test_client().get('/api/dashboard/stats').get_json()
+    assert stats['queue'] == {'singles': 1, 'albums': 1, 'total_tracks': 4}
+    assert stats['album_folders'] == [{'name': 'Album', 'tracks': 2, 'path': str(incoming / 'Album')}]
+
+def test_processing_status_reads_runner_lock(tmp_path, monkeypatch):
+    """A "host:pid" lock for a live process reports running; an emptied lock reports stopped."""
+    monkeypatch.setenv('DB_PATH', str(tmp_path))
+    monkeypatch.setenv('WORKING_DIR', str(tmp_path))
+    client = create_app().test_client()
+    lock = tmp_path / 'simple_runner.pid'
+    lock.write_text(f'host:{os.getpid()}')
+    response = client.get('/api/processing/status')
+    assert response.status_code == 200
+    data = response.get_json()['processor']
+    assert data['running'] is True and data['pid'] == os.getpid() and data['hostname'] == 'host'
+    lock.write_text('')
+    assert client.get('/api/processing/status').get_json()['processor']['running'] is False
+
 if __name__ == '__main__':
     print("╔════════════════════════════════════════════════════════════════╗")
     print("║     Phase 1 Dashboard - Integration Tests                      ║")
@@ -138,6 +138,7 @@ def test_manifest_generation():
         # Save manifest
         manifest_path = manifest.save(output_dir)
         assert manifest_path.exists()
+        assert not (output_dir / "manifest.json.tmp").exists()
         print("  ✓ JobManifest.save() works")
         
         # Load manifest
@@ -239,6 +240,58 @@ def test_full_queue_workflow():
         print("\n✓ FULL WORKFLOW SUCCESS")
 
 
+def test_claim_next_queue_job_priority_and_bad_bundles(tmp_path, monkeypatch):
+    """Highest-priority queue wins; unloadable bundles are archived and skipped."""
+    import app.simple_runner as sr
+    from app.config import Config
+
+    class Cfg(Config):
+        QUEUE_YOUTUBE_AUDIO = str(tmp_path / "q" / "youtube_audio")
+        QUEUE_YOUTUBE_VIDEO = str(tmp_path / "q" / "youtube_video")
+        QUEUE_OTHER = str(tmp_path / "q" / "other")
+        WORKING = str(tmp_path / "working")
+        ARCHIVE_DIR = str(tmp_path / "archive")
+
+    def make_job(queue, job_id, valid=True):
+        folder = Path(getattr(Cfg, queue)) / f"job_{job_id}"
+        folder.mkdir(parents=True)
+        (folder / "job.json").write_text(json.dumps({"job_id": job_id, "title": "t"}) if valid else "{bad")
+        return folder
+
+    make_job("QUEUE_YOUTUBE_VIDEO", "v1")
+    make_job("QUEUE_OTHER", "o1")
+    make_job("QUEUE_YOUTUBE_AUDIO", "a1", valid=False)
+    Path(Cfg.WORKING).mkdir()
+    cfg = Cfg()
+    consumer = sr._queue_consumer(cfg)
+
+    job = sr._claim_next_queue_job(cfg, consumer)
+    assert job.queue_type == "other" and job.bundle.job_id == "o1"
+    assert job.working_job == Path(cfg.WORKING) / "job_o1"
+    assert (Path(cfg.ARCHIVE_DIR) / "fail" / "job_a1").exists()
+    assert sr._claim_next_queue_job(cfg, consumer).queue_type == "youtube_video"
+    assert sr._claim_next_queue_job(cfg, consumer) is None
+
+
+def test_discover_jobs_skips_job_removed_mid_scan(tmp_path, monkeypatch):
+    """A job dir that vanishes during the scan drops only itself, not its whole queue."""
+    queue_dir = tmp_path / "youtube_audio"
+    for job_id in ("a", "b", "c"):
+        (queue_dir / f"job_{job_id}").mkdir(parents=True)
+        (queue_dir / f"job_{job_id}" / "job.json").write_text("{}")
+    consumer = QueueConsumer({"youtube_audio": queue_dir})
+
+    real_ready = consumer._is_job_ready
+    def ready(folder):
+        if folder.name == "job_b":
+            raise FileNotFoundError(folder)
+        return real_ready(folder)
+    monkeypatch.setattr(consumer, "_is_job_ready", ready)
+
+    found = consumer.discover_jobs()["youtube_audio"]
+    assert sorted(p.name for p in found) == ["job_a", "job_c"]
+
+
 if __name__ == "__main__":
     print("=" * 60)
     print("Queue-Based Pipeline Integration Tests")
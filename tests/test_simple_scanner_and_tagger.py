@@ -1,5 +1,11 @@
+import os
+import sys
+import time
 from typing import Any, cast
 from pathlib import Path
+
+import pytest
+
 from app.simple_runner import scan_incoming_candidates
 from app.config import Config
 
@@ -14,15 +20,474 @@ def test_scan_candidates_lone_and_album(tmp_path: Any):
     album = incoming / "Artist - Album"
     album.mkdir()
     (album / "song01.flac").write_bytes(b"y")
+    # Files must have settled before they are picked up
+    old = time.time() - 60
+    for p in (incoming / "track1.mp3", album / "song01.flac"):
+        os.utime(p, (old, old))
 
     lone, albums = scan_incoming_candidates(incoming)
     assert any(p.name == "track1.mp3" for p in lone)
     assert any(p.name == "Artist - Album" for p in albums)
 
 
+def test_scan_candidates_checks_several_albums(tmp_path: Path, monkeypatch):
+    import app.simple_runner as sr
+    monkeypatch.setattr(sr, "_stability_cache", {})
+    incoming = tmp_path / "incoming"
+    old = time.time() - 60
+    for name in ("A", "B", "C"):
+        (incoming / name / "disc1").mkdir(parents=True)
+        track = incoming / name / "disc1" / "01.mp3"
+        track.write_bytes(b"x")
+        os.utime(track, (old, old))
+    (incoming / "Empty").mkdir()
+    # One album still being written
+    (incoming / "C" / "02.mp3").write_bytes(b"x")
+
+    lone, albums = scan_incoming_candidates(incoming)
+    assert lone == []
+    assert sorted(p.name for p in albums) == ["A", "B"]
+    assert sr._scan_pending is True
+
+
+def test_fresh_file_not_stable_until_unchanged_across_scans(tmp_path: Path, monkeypatch):
+    import app.simple_runner as sr
+    monkeypatch.setattr(sr, "_stability_cache", {})
+    f = tmp_path / "track.mp3"
+    f.write_bytes(b"x")
+    # mtime slightly ahead of the clock (e.g. network share skew) so only the
+    # observed-unchanged window can declare it stable
+    now = time.time()
+    os.utime(f, (now + 30, now + 30))
+    monkeypatch.setattr(sr.time, "time", lambda: now)
+    assert sr._is_file_stable(f, stability_seconds=2.0) is False
+    monkeypatch.setattr(sr.time, "time", lambda: now + 1.0)
+    assert sr._is_file_stable(f, stability_seconds=2.0) is False
+    # Unchanged on a later scan past the window: stable, without ever sleeping
+    monkeypatch.setattr(sr.time, "time", lambda: now + 2.5)
+    assert sr._is_file_stable(f, stability_seconds=2.0) is True
+    assert str(f) not in sr._stability_cache
+
+
 def test_mp3_encoding_toggle(monkeypatch: Any):
     # Ensure MP3_ENCODING env toggles normalize in Config
     monkeypatch.setenv("MP3_ENCODING", "v0")
     assert Config().MP3_ENCODING == "v0"
     monkeypatch.setenv("MP3_ENCODING", "cbr320")
     assert Config().MP3_ENCODING == "cbr320"
+
+
+def test_config_view_snapshots_public_settings(monkeypatch: Any):
+    from app.simple_runner import _config_view
+
+    class Cfg(Config):
+        WORKING = "/tmp/work-override"
+
+    monkeypatch.setenv("MP3_ENCODING", "cbr320")
+    view = _config_view(Cfg())
+    assert view.WORKING == "/tmp/work-override"
+    assert view.MP3_ENCODING == "cbr320"
+    assert not hasattr(view, "_MP3_ENCODING_DEFAULT")
+
+
+def test_concat_with_crossfades_single_graph(tmp_path: Path, monkeypatch):
+    import subprocess
+    import app.simple_runner as sr
+    cmds = []
+
+    def fake_run(cmd):
+        cmds.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, "", "")
+
+    monkeypatch.setattr(sr, "_run", fake_run)
+    parts = [tmp_path / f"p{i}.wav" for i in range(3)]
+    sr._concat_with_crossfades(parts, tmp_path / "out.wav", 200, 0)
+    assert len(cmds) == 1
+    cmd = cmds[0]
+    graph = cmd[cmd.index("-filter_complex") + 1]
+    assert graph == "[0][1]acrossfade=d=0.200[a1];[a1][2]acrossfade=d=0.200[a2]"
+    assert cmd[cmd.index("-map") + 1] == "[a2]"
+
+
+def test_pcm_chunk_materialize_writes_wav(tmp_path: Path):
+    import wave
+    import app.simple_runner as sr
+    chunk = sr._PcmChunk(tmp_path / "w" / "chunk_000.wav", b"\x00\x00" * 2 * 100, 44100)
+    assert chunk.name == "chunk_000.wav" and chunk.stem == "chunk_000"
+    out = chunk.materialize()
+    with wave.open(str(out)) as w:
+        assert (w.getnchannels(), w.getframerate(), w.getnframes()) == (2, 44100, 100)
+
+
+def test_pick_next_skips_scan_until_watcher_reports_change(tmp_path: Path, monkeypatch):
+    import app.simple_runner as sr
+    incoming = tmp_path / "incoming"
+    incoming.mkdir()
+    scans = []
+    real_scan = sr._scan_candidates
+
+    def counting_scan(p):
+        scans.append(p)
+        return real_scan(p)
+
+    class FakeWatcher:
+        dirty = True
+        def consume(self):
+            was, self.dirty = self.dirty, False
+            return was
+        def mark_dirty(self):
+            self.dirty = True
+
+    watcher = FakeWatcher()
+    monkeypatch.setattr(sr, "_scan_candidates", counting_scan)
+    monkeypatch.setattr(sr, "_incoming_watcher", watcher)
+    lock = tmp_path / "album_active.txt"
+    assert sr._pick_next(incoming, lock) is None
+    assert sr._pick_next(incoming, lock) is None
+    assert len(scans) == 1
+    watcher.mark_dirty()
+    assert sr._pick_next(incoming, lock) is None
+    assert len(scans) == 2
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="needs inotify")
+def test_closed_file_is_stable_without_settle_window(tmp_path: Path, monkeypatch):
+    import app.simple_runner as sr
+    if sr.Observer is None:
+        pytest.skip("watchdog not installed")
+    monkeypatch.setattr(sr, "_stability_cache", {})
+    watcher = sr._IncomingWatcher(tmp_path, close_write=True)
+    monkeypatch.setattr(sr, "_incoming_watcher", watcher)
+    try:
+        f = tmp_path / "upload.mp3"
+        f.write_bytes(b"x" * 100)
+        deadline = time.time() + 5
+        while not watcher.closed_unchanged(str(f), f.stat()) and time.time() < deadline:
+            time.sleep(0.02)
+        assert sr._is_file_stable(f, stability_seconds=60.0) is True
+        # Written again since the close we saw: back to the settle window
+        with open(f, "ab") as fh:
+            fh.write(b"y")
+            fh.flush()
+            os.utime(f, (time.time() + 5, time.time() + 5))
+            assert sr._is_file_stable(f, stability_seconds=60.0) is False
+    finally:
+        watcher.stop()
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="needs inotify")
+def test_settling_file_does_not_spin_the_scan_loop(tmp_path: Path, monkeypatch):
+    """A file being written is rescanned once per wait interval, not on every write event."""
+    import threading
+    import app.simple_runner as sr
+    if sr.Observer is None:
+        pytest.skip("watchdog not installed")
+    incoming = tmp_path / "incoming"
+    incoming.mkdir()
+    monkeypatch.setattr(sr, "_stability_cache", {})
+    scans = []
+    real_scan = sr._scan_candidates
+    monkeypatch.setattr(sr, "_scan_candidates", lambda p: scans.append(p) or real_scan(p))
+    watcher = sr._IncomingWatcher(incoming)
+    monkeypatch.setattr(sr, "_incoming_watcher", watcher)
+    stop = threading.Event()
+
+    def writer():
+        with open(incoming / "upload.mp3", "ab") as fh:
+            while not stop.is_set():
+                fh.write(b"x" * 64)
+                fh.flush()
+                time.sleep(0.005)
+
+    t = threading.Thread(target=writer)
+    t.start()
+    try:
+        time.sleep(0.1)
+        lock = tmp_path / "album_active.txt"
+        deadline = time.time() + 1.2
+        while time.time() < deadline:
+            assert sr._pick_next(incoming, lock) is None
+            watcher.wait(0.5)
+    finally:
+        stop.set()
+        t.join()
+        watcher.stop()
+    # one scan per 0.5 s wait (plus the cold-start scan), not one per write
+    assert 2 <= len(scans) <= 5
+
+
+def test_iter_audio_recurses_and_filters_by_extension(tmp_path: Path):
+    from app.simple_runner import _iter_audio
+    (tmp_path / "a" / "b").mkdir(parents=True)
+    (tmp_path / "one.MP3").write_bytes(b"x")
+    (tmp_path / "a" / "b" / "two.flac").write_bytes(b"x")
+    (tmp_path / "a" / "cover.jpg").write_bytes(b"x")
+    (tmp_path / "a" / "dir.wav").mkdir()
+    names = sorted(p.name for p in _iter_audio(tmp_path))
+    assert names == ["one.MP3", "two.flac"]
+
+
+def test_overlap_add_stems_blends_shared_region(tmp_path: Path):
+    import wave
+    np = pytest.importorskip("numpy")
+    import app.simple_runner as sr
+
+    def write(p: Path, value: int, frames: int):
+        with wave.open(str(p), "wb") as w:
+            w.setnchannels(2)
+            w.setsampwidth(2)
+            w.setframerate(100)
+            w.writeframes(np.full((frames, 2), value, dtype=np.int16).tobytes())
+
+    a, b = tmp_path / "a.wav", tmp_path / "b.wav"
+    write(a, 1000, 50)
+    write(b, 1000, 50)
+    merged = sr._overlap_add_stems([a, b], 0.1, tmp_path / "out.wav")
+    assert merged is not None
+    out = np.frombuffer(merged.data, dtype=np.int16).reshape(-1, 2)
+    # 2 * 0.1s * 100Hz = 20 shared frames; complementary windows keep level flat
+    assert len(out) == 80
+    assert np.all(np.abs(out - 1000) <= 1)
+
+
+def test_concat_single_part_moves_only_when_consumed(tmp_path: Path):
+    import app.simple_runner as sr
+    part = tmp_path / "p0.wav"
+    part.write_bytes(b"pcm")
+    sr._concat_with_crossfades([part], tmp_path / "copy.wav", 200, 0)
+    assert part.exists() and (tmp_path / "copy.wav").read_bytes() == b"pcm"
+    sr._concat_with_crossfades([part], tmp_path / "moved.wav", 200, 0, consume=True)
+    assert not part.exists() and (tmp_path / "moved.wav").read_bytes() == b"pcm"
+
+
+def test_log_event_reuses_handle_per_log_dir(tmp_path: Path, monkeypatch):
+    import json
+    import app.simple_runner as sr
+    monkeypatch.setattr(sr, "_event_log", None)
+
+    class Cfg(Config):
+        LOG_DIR = str(tmp_path / "logs")
+
+    sr._log_event(Cfg(), {"event": "a"})
+    handle = sr._event_log[1]
+    sr._log_event(Cfg(), {"event": "b"})
+    assert sr._event_log[1] is handle
+    lines = (tmp_path / "logs" / "simple_runner.jsonl").read_text().splitlines()
+    assert [json.loads(line)["event"] for line in lines] == ["a", "b"]
+
+    class Other(Config):
+        LOG_DIR = str(tmp_path / "other")
+
+    sr._log_event(Other(), {"event": "c"})
+    assert handle.closed
+    sr._event_log[1].close()
+
+
+def test_active_album_walked_once_per_lock(tmp_path: Path, monkeypatch):
+    import app.simple_runner as sr
+    monkeypatch.setattr(sr, "_active_album_cache", {})
+    album = tmp_path / "incoming" / "Artist - Album"
+    album.mkdir(parents=True)
+    (album / "cover.jpg").write_bytes(b"img")
+    tracks = [album / f"{i:02d}.mp3" for i in range(3)]
+    for n, t in enumerate(tracks):
+        t.write_bytes(b"x")
+        os.utime(t, (1000 + n, 1000 + n))
+    lock = tmp_path / "album_active.txt"
+    lock.write_text(str(album))
+    walks = []
+    real_iter = sr._iter_audio
+    monkeypatch.setattr(sr, "_iter_audio", lambda root: walks.append(root) or real_iter(root))
+
+    picked = []
+    for _ in range(3):
+        job = sr._pick_next(tmp_path / "incoming", lock)
+        picked.append(job.src)
+        job.src.unlink()
+    assert picked == tracks
+    assert len(walks) == 1
+
+
+def test_run_chunks_parallel_keeps_chunk_order(tmp_path: Path):
+    import threading
+    import app.simple_runner as sr
+    chunks = [tmp_path / f"chunk_{i:03d}.wav" for i in range(6)]
+    threads = set()
+
+    def fn(i, c):
+        threads.add(threading.current_thread().name)
+        time.sleep(0.01 * (6 - i))  # later chunks finish first
+        return (i, c.name)
+
+    assert sr._run_chunks_parallel(fn, chunks, 3) == [(i, c.name) for i, c in enumerate(chunks)]
+    assert len(threads) > 1
+
+    class Cfg(Config):
+        DEMUCS_PARALLEL_JOBS = 0
+        DEMUCS_DEVICE = "cuda"
+
+    assert sr._demucs_parallel_workers(Cfg()) == 1
+
+
+def test_render_stem_variants_one_ffmpeg_run(tmp_path: Path, monkeypatch):
+    import subprocess
+    import app.simple_runner as sr
+    cmds = []
+
+    def fake_run(cmd):
+        cmds.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, "", "")
+
+    monkeypatch.setattr(sr, "_run", fake_run)
+    per_stem = {s: [tmp_path / f"{s}_{i}.wav" for i in range(2)] for s in ("drums", "bass", "other", "vocals")}
+    wanted = {
+        "instrumental": (("drums", "bass", "other"), tmp_path / "instrumental.wav"),
+        "drums_only": (("drums",), tmp_path / "drums_only.wav"),
+    }
+    sr._render_stem_variants(per_stem, wanted, 200, 0)
+    assert len(cmds) == 1
+    cmd = cmds[0]
+    # Each chunk file is decoded once; vocals are not needed by any variant
+    assert cmd.count("-i") == 6
+    graph = cmd[cmd.index("-filter_complex") + 1]
+    assert "[0:a][1:a]acrossfade=d=0.200[drums1]" in graph
+    assert "[drums1]asplit=2[drums_s0][drums_s1]" in graph
+    assert "amix=inputs=3:duration=longest:normalize=0[v_instrumental]" in graph
+    assert cmd[-1] == str(tmp_path / "drums_only.wav")
+    assert not list(tmp_path.glob("*_merged*.wav"))
+
+
+def test_extract_all_segments_without_overlap_else_extracts_each(tmp_path: Path, monkeypatch):
+    import app.simple_runner as sr
+    calls = []
+    monkeypatch.setattr(sr, "_ffmpeg_segment", lambda src, work, *a: calls.append("segment") or [work / "chunk_000.wav"])
+    monkeypatch.setattr(sr, "_ffmpeg_extract", lambda src, dst, start, dur, *a: calls.append(start))
+    src = tmp_path / "song.mp3"
+
+    sr._ffmpeg_extract_all(src, tmp_path / "w0", sr._chunk_plan_seconds(300, overlap_sec=0), 44100, 0)
+    assert calls == ["segment"]
+
+    calls.clear()
+    out = sr._ffmpeg_extract_all(src, tmp_path / "w1", sr._chunk_plan_seconds(300, overlap_sec=0.5), 44100, 0, workers=3)
+    assert sorted(calls) == [0.0, 119.5, 239.5]
+    assert [p.name for p in out] == ["chunk_000.wav", "chunk_001.wav", "chunk_002.wav"]
+
+
+def test_render_stem_variants_single_chunk_stem_is_copied(tmp_path: Path, monkeypatch):
+    import app.simple_runner as sr
+    monkeypatch.setattr(sr, "_run", lambda cmd: pytest.fail("ffmpeg should not run"))
+    drums = tmp_path / "drums.wav"
+    drums.write_bytes(b"pcm")
+    out = tmp_path / "v" / "drums_only.wav"
+    sr._render_stem_variants({"drums": [drums]}, {"drums_only": (("drums",), out)}, 200, 0)
+    assert out.read_bytes() == b"pcm" and drums.exists()
+
+
+def test_separate_render_after_fused_failure_keeps_linked_stem(tmp_path: Path, monkeypatch):
+    """The fused pre-pass hardlinks drums_only to the stem; the fallback must not truncate it."""
+    import subprocess
+    import app.simple_runner as sr
+    import app.variant_generator as vg
+    monkeypatch.setattr(sr, "_run", lambda cmd: subprocess.CompletedProcess(cmd, 1, "", "graph error"))
+
+    def fake_ffmpeg(cmd):
+        # Like ffmpeg -y: every output is opened with O_TRUNC and written
+        for i, arg in enumerate(cmd):
+            if arg.endswith(".wav") and cmd[i - 1] != "-i":
+                with open(arg, "wb") as fh:
+                    fh.write(b"mixed")
+        return None
+
+    monkeypatch.setattr(vg, "_run_ffmpeg", fake_ffmpeg)
+    per_stem = {}
+    for stem in ("drums", "bass", "other"):
+        (tmp_path / f"{stem}.wav").write_bytes(stem.encode())
+        per_stem[stem] = [tmp_path / f"{stem}.wav"]
+    wanted = {
+        "instrumental": (("drums", "bass", "other"), tmp_path / "out" / "instrumental.wav"),
+        "drums_only": (("drums",), tmp_path / "out" / "drums_only.wav"),
+    }
+    with pytest.raises(RuntimeError):
+        sr._render_stem_variants(per_stem, wanted, 200, 0)
+    assert (tmp_path / "out" / "drums_only.wav").read_bytes() == b"drums"
+
+    sr._render_stem_variants_separately(per_stem, wanted, tmp_path, Config())
+    assert (tmp_path / "drums.wav").read_bytes() == b"drums"
+    assert (tmp_path / "out" / "instrumental.wav").read_bytes() == b"mixed"
+
+
+def test_separate_render_mixes_each_variant_when_shared_run_fails(tmp_path: Path, monkeypatch):
+    import app.simple_runner as sr
+    import app.variant_generator as vg
+    cmds = []
+
+    def fake_ffmpeg(cmd):
+        cmds.append(cmd)
+        if len(cmds) == 1:
+            return "shared graph failed"
+        with open(cmd[-1], "wb") as fh:
+            fh.write(b"mixed")
+        return None
+
+    monkeypatch.setattr(vg, "_run_ffmpeg", fake_ffmpeg)
+    per_stem = {}
+    for stem in ("vocals", "drums", "bass", "other"):
+        (tmp_path / f"{stem}.wav").write_bytes(stem.encode())
+        per_stem[stem] = [tmp_path / f"{stem}.wav"]
+    wanted = {
+        "instrumental": (("drums", "bass", "other"), tmp_path / "out" / "instrumental.wav"),
+        "no_drums": (("vocals", "bass", "other"), tmp_path / "out" / "no_drums.wav"),
+        "drums_only": (("drums",), tmp_path / "out" / "drums_only.wav"),
+    }
+    sr._render_stem_variants_separately(per_stem, wanted, tmp_path, Config())
+    # one shared run, then one mix per multi-stem variant; drums_only is linked
+    assert len(cmds) == 3
+    assert (tmp_path / "out" / "instrumental.wav").read_bytes() == b"mixed"
+    assert (tmp_path / "out" / "no_drums.wav").read_bytes() == b"mixed"
+    assert (tmp_path / "out" / "drums_only.wav").read_bytes() == b"drums"
+
+
+def test_queue_work_dir_prefers_scratch_with_room(tmp_path: Path, monkeypatch):
+    import shutil
+    import app.simple_runner as sr
+    scratch = tmp_path / "shm"
+    scratch.mkdir()
+
+    class Cfg(Config):
+        WORKING = str(tmp_path / "working")
+        SCRATCH_DIR = str(scratch)
+
+    monkeypatch.setattr(sr.shutil, "disk_usage", lambda p: shutil._ntuple_diskusage(100, 0, 100))
+    assert sr._queue_work_dir(Cfg(), "j1", 50) == (scratch / "queue_j1", True)
+    assert sr._queue_work_dir(Cfg(), "j1", 51) == (tmp_path / "working" / "queue_j1", False)
+    Cfg.SCRATCH_DIR = ""
+    assert sr._queue_work_dir(Cfg(), "j1", 1)[1] is False
+
+
+def test_close_event_log_releases_handle(tmp_path: Path, monkeypatch):
+    import app.simple_runner as sr
+    monkeypatch.setattr(sr, "_event_log", None)
+
+    class Cfg(Config):
+        LOG_DIR = str(tmp_path)
+
+    sr._log_event(Cfg(), {"event": "a"})
+    handle = sr._event_log[1]
+    sr._close_event_log()
+    assert handle.closed and sr._event_log is None
+    sr._close_event_log()  # idempotent
+
+
+def test_full_stems_uses_inprocess_model_and_skips_cli(tmp_path: Path, monkeypatch):
+    import app.simple_runner as sr
+    stems_dir = tmp_path / "out" / "htdemucs" / "chunk_000"
+    monkeypatch.setattr(sr, "_demucs_full_stems_inprocess", lambda *a: stems_dir)
+    monkeypatch.setattr(sr, "_run_with_timeout", lambda *a, **k: pytest.fail("CLI should not run"))
+
+    class Cfg(Config):
+        DEMUCS_INPROCESS = True
+        DEMUCS_MAX_RETRIES = 0
+
+    got = sr._demucs_chunk_with_retry(0, tmp_path / "chunk_000.wav", tmp_path / "out", Cfg(), 1, 60,
+                                      full_stems=True)
+    assert got == stems_dir
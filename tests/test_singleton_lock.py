@@ -54,3 +54,22 @@ def test_singleton_lock_legacy_numeric_running(tmp_path: Path, monkeypatch: Any)
     got = sr.acquire_singleton_lock_for_tests(lock)
     assert got is None
     assert lock.read_text().strip() == "123"
+
+
+def test_singleton_lock_flock_excludes_second_starter(tmp_path: Path, monkeypatch: Any):
+    import pytest
+    if sr.fcntl is None:
+        pytest.skip("flock unavailable")
+    lock = tmp_path / "simple_runner.pid"
+    monkeypatch.setattr(sr, "_singleton_lock_fd", None)
+    assert sr._acquire_singleton_lock(lock) == sr.os.getpid()
+    held = sr._singleton_lock_fd
+    # A second open file description cannot take the flock while it is held
+    monkeypatch.setattr(sr, "_singleton_lock_fd", None)
+    monkeypatch.setattr(sr, "_pid_is_running", _dead)
+    assert sr._acquire_singleton_lock(lock) is None
+    monkeypatch.setattr(sr, "_singleton_lock_fd", held)
+    sr._release_singleton_lock()
+    assert lock.exists() and lock.read_text() == ""
+    assert sr._acquire_singleton_lock(lock) == sr.os.getpid()
+    sr._release_singleton_lock()
@@ -0,0 +1,136 @@
+import hashlib
+import os
+from pathlib import Path
+
+import app.utils as utils
+
+
+def test_sha256_file_cached_until_file_changes(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(utils, "_sha256_cache", {})
+    f = tmp_path / "a.bin"
+    f.write_bytes(b"abc")
+    assert utils.sha256_file(f) == hashlib.sha256(b"abc").hexdigest()
+    assert len(utils._sha256_cache) == 1
+    # Same stat identity: served from the cache without reading
+    monkeypatch.setattr(utils, "open", lambda *a, **k: (_ for _ in ()).throw(AssertionError), raising=False)
+    assert utils.sha256_file(f) == hashlib.sha256(b"abc").hexdigest()
+    monkeypatch.delattr(utils, "open", raising=False)
+    f.write_bytes(b"abcd")
+    os.utime(f, ns=(1, 1))
+    assert utils.sha256_file(f) == hashlib.sha256(b"abcd").hexdigest()
+
+
+def test_sha256_file_fallback_loop_matches(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(utils, "_sha256_cache", {})
+    monkeypatch.delattr(utils.hashlib, "file_digest", raising=False)
+    data = os.urandom(10_000)
+    f = tmp_path / "b.bin"
+    f.write_bytes(data)
+    # Small buffer so the digest spans several partial reads
+    assert utils.sha256_file(f, bufsize=4096) == hashlib.sha256(data).hexdigest()
+
+
+def test_cpu_env_built_once_and_extra_env_not_leaked(monkeypatch):
+    from app.config import Config
+    utils._base_env.cache_clear()
+
+    class Cfg(Config):
+        CPU_MAX_THREADS = 3
+
+    env = utils._with_cpu_env(Cfg())
+    assert env["OMP_NUM_THREADS"] == "3"
+    assert utils._with_cpu_env(Cfg()) is env
+    extra = utils._with_cpu_env(Cfg(), {"FOO": "1"})
+    assert extra["FOO"] == "1" and "FOO" not in utils._with_cpu_env(Cfg())
+    assert utils._with_cpu_env(None).get("OMP_NUM_THREADS") == os.environ.get("OMP_NUM_THREADS")
+    utils._base_env.cache_clear()
+
+
+def test_safe_move_file_falls_back_on_exdev(tmp_path: Path, monkeypatch):
+    import errno
+    src = tmp_path / "a.wav"
+    src.write_bytes(b"pcm")
+    os.utime(src, (1000, 1000))
+    dest = tmp_path / "out" / "b.wav"
+
+    def exdev(a, b):
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+    monkeypatch.setattr(utils.os, "replace", exdev)
+    utils.safe_move_file(src, dest)
+    assert not src.exists()
+    assert dest.read_bytes() == b"pcm"
+    assert dest.stat().st_mtime == 1000
+
+
+def test_wait_until_stable_returns_when_writer_closes(tmp_path: Path):
+    import threading
+    import time
+    import pytest
+    f = tmp_path / "upload.mp3"
+    f.write_bytes(b"x")
+    probe = utils._close_write_watch(f)
+    if probe is None:
+        pytest.skip("inotify/watchdog unavailable")
+    probe[0].stop()
+
+    def writer():
+        time.sleep(0.3)
+        with open(f, "ab") as fh:
+            fh.write(b"more")
+
+    threading.Thread(target=writer).start()
+    t0 = time.monotonic()
+    assert utils.wait_until_stable(f, passes=3, delay=10) is True
+    assert time.monotonic() - t0 < 5
+
+
+def test_copy_file_fast_copies_bytes_and_times(tmp_path: Path, monkeypatch):
+    src = tmp_path / "video.mp4"
+    src.write_bytes(os.urandom(3 * 1024 * 1024 + 17))
+    os.utime(src, (1000, 1000))
+    utils.copy_file_fast(src, tmp_path / "a.mp4")
+    assert (tmp_path / "a.mp4").read_bytes() == src.read_bytes()
+    assert (tmp_path / "a.mp4").stat().st_mtime == 1000
+
+    # Neither reflink nor copy_file_range: plain copyfile fallback
+    monkeypatch.setattr(utils, "fcntl", None)
+    monkeypatch.delattr(utils.os, "copy_file_range", raising=False)
+    utils.copy_file_fast(src, tmp_path / "b.mp4")
+    assert (tmp_path / "b.mp4").read_bytes() == src.read_bytes()
+
+
+def test_sanitize_filename_posix_fast_path_and_windows_table():
+    utils.sanitize_filename.cache_clear()
+    assert utils.sanitize_filename("AC/DC: Live ") == "ACDC: Live"
+    assert utils.sanitize_filename("  Clean Title") == "Clean Title"
+    assert utils.sanitize_filename("/\x00") == "untitled"
+    assert 'What? "Why" <A|B>: C\\D'.translate(utils._WIN_FORBIDDEN_TABLE) == "What Why AB CD"
+
+
+def test_wait_until_stable_sees_mtime_change_at_same_size(tmp_path: Path, monkeypatch):
+    f = tmp_path / "upload.mp3"
+    f.write_bytes(b"abcd")
+    ticks = iter(range(10))
+    # Rewritten in place between checks: same size, new mtime
+    monkeypatch.setattr(utils.time, "sleep", lambda d: os.utime(f, ns=(next(ticks), next(ticks))))
+    monkeypatch.setattr(utils, "_close_write_watch", lambda p: None)
+    assert utils.wait_until_stable(f, passes=2, delay=1) is False
+    monkeypatch.setattr(utils.time, "sleep", lambda d: None)
+    assert utils.wait_until_stable(f, passes=2, delay=1) is True
+
+
+def test_link_or_copy_hardlinks_and_replaces(tmp_path: Path, monkeypatch):
+    src = tmp_path / "drums.wav"
+    src.write_bytes(b"pcm")
+    dst = tmp_path / "drums_only.wav"
+    dst.write_bytes(b"stale")
+    utils.link_or_copy(src, dst)
+    assert dst.read_bytes() == b"pcm"
+    assert os.path.samefile(src, dst)
+    # Cross-device (or no hardlink support): falls back to a real copy
+    dst.unlink()
+    monkeypatch.setattr(utils.os, "link", lambda a, b: (_ for _ in ()).throw(OSError(18, "EXDEV")))
+    utils.link_or_copy(src, dst)
+    assert dst.read_bytes() == b"pcm"
+    assert not os.path.samefile(src, dst)
@@ -82,6 +82,17 @@ class TestStemMixer:
         assert len(found_stems) == 2
         assert "vocals" in found_stems
         assert "drums" in found_stems
+    
+    def test_get_available_stems_ignores_non_wav_and_case(self, temp_work_dir):
+        """Test matching is case-insensitive and limited to .wav files."""
+        (temp_work_dir / "Vocals.WAV").write_bytes(b"RIFF")
+        (temp_work_dir / "drums.mp3").write_bytes(b"ID3")
+        (temp_work_dir / "bass.wav").mkdir()
+        
+        found_stems = StemMixer.get_available_stems(temp_work_dir)
+        
+        assert set(found_stems) == {"vocals"}
+        assert found_stems["vocals"] == temp_work_dir / "Vocals.WAV"
 
 
 class TestVariantAvailability:
@@ -212,6 +223,60 @@ class TestStemMixing:
         assert call_args[0] == "ffmpeg"
         # Should have filter_complex
         assert "-filter_complex" in call_args
+        graph = call_args[call_args.index("-filter_complex") + 1]
+        assert graph == "[0:a][1:a]amix=inputs=2:duration=first:normalize=0[out]"
+        assert call_args[call_args.index("-ac") + 1] == "2"
+    
+    @patch("subprocess.run")
+    def test_mix_failure_reports_stderr(self, mock_run, sample_stems, temp_work_dir):
+        """Test that ffmpeg's binary stderr is decoded into the error on failure."""
+        mock_run.return_value = MagicMock(returncode=1, stderr=b"Invalid data \xff")
+        two_stems = {"vocals": sample_stems["vocals"], "drums": sample_stems["drums"]}
+        
+        with pytest.raises(RuntimeError, match="Invalid data"):
+            StemMixer.mix_stems(two_stems, temp_work_dir / "output.wav")
+        cmd = mock_run.call_args[0][0]
+        assert cmd[:5] == ["ffmpeg", "-nostdin", "-hide_banner", "-loglevel", "error"]
+        assert "text" not in mock_run.call_args[1]
+    
+    @patch("subprocess.run")
+    def test_generate_all_single_ffmpeg_run(self, mock_run, sample_stems, temp_work_dir):
+        """Test that all variants come from one ffmpeg call with shared inputs."""
+        mock_run.return_value = MagicMock(returncode=0)
+        outputs = {
+            "instrumental": temp_work_dir / "instrumental.wav",
+            "no_drums": temp_work_dir / "no_drums.wav",
+            "drums_only": temp_work_dir / "drums_only.wav",
+        }
+        
+        results = VariantGenerator.generate_all(sample_stems, outputs, ffmpeg_threads=2)
+        
+        assert results == {"instrumental": True, "no_drums": True, "drums_only": True}
+        mock_run.assert_called_once()
+        cmd = mock_run.call_args[0][0]
+        # Four stems, each decoded once
+        assert cmd.count("-i") == 4
+        graph = cmd[cmd.index("-filter_complex") + 1]
+        assert graph.count("amix=inputs=3") == 2
+        assert "normalize=0" in graph
+        # drums_only is stream-copied from the drums input
+        idx = cmd.index(str(outputs["drums_only"]))
+        assert cmd[idx - 2:idx] == ["-c:a", "copy"]
+    
+    @patch("subprocess.run")
+    def test_generate_all_skips_missing_stems(self, mock_run, temp_work_dir, sample_stems):
+        """Test that variants without their stems are reported, not attempted."""
+        mock_run.return_value = MagicMock(returncode=0)
+        stems = {"drums": sample_stems["drums"]}
+        outputs = {
+            "instrumental": temp_work_dir / "instrumental.wav",
+            "drums_only": temp_work_dir / "drums_only.wav",
+        }
+        
+        results = VariantGenerator.generate_all(stems, outputs)
+        
+        assert results == {"instrumental": False, "drums_only": True}
+        assert "-filter_complex" not in mock_run.call_args[0][0]
 
 
 class TestVariantMetadata: